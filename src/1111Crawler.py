@@ -1,27 +1,261 @@
 import requests
-import pandas as pd
-from bs4 import BeautifulSoup
 import re
 import time
 import random
-from collections import Counter
 import urllib3
+import logging
+from requests.adapters import HTTPAdapter
 import warnings
-from datetime import datetime
+import os
+import sys
+import argparse
+import contextlib
+import queue
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from urllib.parse import urlencode, urlparse
+
+import embedded_json
+import html_backends
+import job_analysis
+import job_store
+import near_duplicates
+import parse_worker
+import parquet_store
+import relevance
+from job_index import LOCATIONS, JobIndex
+from job_record import JobRecord
+from job_store import JobStore
+from http_cache import ResponseCache
+from job_writers import COLUMN_ORDER, CsvJobWriter, JsonlJobWriter, build_output_path
+from keyword_matcher import KeywordMatcher
+from metrics import Metrics
+from page_archive import PageArchive
+from rate_limiter import HostRateLimiter
+from throttle import (RETRY_STATUSES, THROTTLE_STATUSES, AimdController, CircuitBreaker,
+                      RetryPolicy, parse_retry_after)
+from trend_rollups import TrendStore
 
 # 忽略 SSL 警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger('job1111.crawler')
+
+# 命令列可選的逐頁輸出格式（格式名稱同時是副檔名）；parquet 在爬取結束後一次寫入
+OUTPUT_FORMATS = {
+    'csv': CsvJobWriter,
+    'jsonl': JsonlJobWriter,
+}
+PARQUET_FORMAT = 'parquet'
+
+# 職缺卡片解析用的正規表示式，模組載入時編譯一次，所有卡片共用
+JOB_LINK_RE = html_backends.JOB_LINK_RE
+COMPANY_CLASS_RE = re.compile(r'company', re.I)
+INDUSTRY_CLASS_RE = re.compile(r'industry|category|type', re.I)
+TAG_CLASS_RE = re.compile(r'tag|label|badge', re.I)
+SALARY_CLASS_RE = re.compile(r'salary|wage|pay', re.I)
+COMPANY_NAME_RE = re.compile(r'([^｜\n\r\t]+(?:股份有限公司|有限公司|公司))')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# 常見產業關鍵字模式
+INDUSTRY_PATTERNS = [
+    re.compile(r'產業[：:]\s*([^\n\|]+)'),
+    re.compile(r'產業類別[：:]\s*([^\n\|]+)'),
+    re.compile(r'(軟體.*?業|資訊.*?業|電子.*?業|製造.*?業|金融.*?業|服務.*?業|零售.*?業|醫療.*?業|教育.*?業|建築.*?業|運輸.*?業|餐飲.*?業|旅遊.*?業|媒體.*?業|通訊.*?業)'),
+    re.compile(r'(網路相關業|電腦.*?相關業|半導體業|光電業|通信.*?業|顧問.*?業|人力.*?業|廣告.*?業|出版.*?業|娛樂.*?業)'),
+]
+
+# 各產業模式必須出現的字詞，卡片中一個都沒有時可以略過該模式
+INDUSTRY_PATTERN_ANCHORS = [
+    ['產業'],
+    ['產業類別'],
+    ['軟體', '資訊', '電子', '製造', '金融', '服務', '零售', '醫療', '教育', '建築', '運輸', '餐飲', '旅遊', '媒體', '通訊'],
+    ['網路相關業', '電腦', '半導體業', '光電業', '通信', '顧問', '人力', '廣告', '出版', '娛樂'],
+]
+
+# 含「業」字但不是產業類別的詞
+INDUSTRY_EXCLUDE_KEYWORDS = ['職業', '專業', '畢業', '作業', '營業', '就業', '創業']
+
+EDUCATION_PATTERNS = [
+    re.compile(r'學歷要求[：:]\s*([^\n]+)'),
+    re.compile(r'學歷[：:]\s*([^\n\|]+)'),
+    re.compile(r'(大學|碩士|博士|專科|高中職|國中|不拘)(?:以上)?'),
+]
+
+DEPARTMENT_PATTERNS = [
+    re.compile(r'科系要求[：:]\s*([^\n]+)'),
+    re.compile(r'科系[：:]\s*([^\n\|]+)'),
+    re.compile(r'(?:相關)?科系[：:]?\s*([^\n\|]{2,30})'),
+]
+
+EXPERIENCE_PATTERNS = [
+    re.compile(r'工作經驗[：:]\s*([^\n]+)'),
+    re.compile(r'經驗[：:]\s*([^\n\|]+)'),
+    re.compile(r'(\d+年以上|\d+年|\d+\s*[-~至]\s*\d+年|不拘|無經驗可|應屆畢業生)'),
+]
+
+LANGUAGE_PATTERNS = [
+    re.compile(r'外語能力[：:]\s*([^\n]+)'),
+    re.compile(r'語言[：:]\s*([^\n\|]+)'),
+    re.compile(r'(英文|日文|韓文|法文|德文|西班牙文)[：:]?\s*([^\n\|]{2,30})'),
+    re.compile(r'(TOEIC|多益|托福|雅思)\s*(\d+)(?:分)?(?:以上)?'),
+]
+
+SKILLS_PATTERNS = [
+    re.compile(r'工作技能[：:]\s*([^\n]+)'),
+    re.compile(r'技能[：:]\s*([^\n\|]+)'),
+    re.compile(r'擅長工具[：:]\s*([^\n]+)'),
+]
+
+# 常見技能關鍵字
+SKILL_KEYWORDS = [
+    'Python', 'Java', 'SQL', 'JavaScript', 'C\+\+', 'C#', 'PHP', 'Ruby',
+    'Spark', 'Hadoop', 'Kafka', 'Airflow', 'Docker', 'Kubernetes',
+    'AWS', 'Azure', 'GCP', 'Linux', 'Git', 'ETL',
+    'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Elasticsearch',
+    'Tableau', 'Power BI', 'Excel', 'R語言'
+]
+# 技能關鍵字對應的純文字（去掉正規表示式跳脫字元，例如 C\\+\\+ -> C++）
+SKILL_KEYWORD_LITERALS = [(skill, re.sub(r'\\(.)', r'\1', skill)) for skill in SKILL_KEYWORDS]
+
+ADDITIONAL_PATTERNS = [
+    re.compile(r'附加條件[：:]\s*([^\n]+)'),
+    re.compile(r'其他條件[：:]\s*([^\n]+)'),
+    re.compile(r'(需.*?證照|具.*?證照|持有.*?證照)'),
+    re.compile(r'(可配合.*?|願意.*?|需.*?)'),
+]
+
+# 工作地點（縣市）
+LOCATION_KEYWORDS = list(LOCATIONS)
+
+# 從文字中尋找薪資模式
+SALARY_PATTERNS = [
+    re.compile(r'月薪\s*(\d+[,\d]*\s*[-~至]\s*\d+[,\d]*|\d+[,\d]*)\s*元'),
+    re.compile(r'年薪\s*(\d+[,\d]*\s*[-~至]\s*\d+[,\d]*|\d+[,\d]*)\s*元'),
+    re.compile(r'(\d+[,\d]*\s*[-~至]\s*\d+[,\d]*)\s*元'),
+    re.compile(r'薪資\s*(\d+[,\d]*\s*[-~至]\s*\d+[,\d]*)'),
+    re.compile(r'面議.*經常性薪資達(\d+[,\d]*)萬?元')
+]
+
+# 發布時間
+TIME_PATTERNS = [
+    re.compile(r'\d+/\d+'),
+    re.compile(r'\d+天前'),
+    re.compile(r'昨天'),
+    re.compile(r'今天'),
+    re.compile(r'\d+小時前'),
+]
+
+# 資料工程相關關鍵字（相關度評分用）
+DATA_KEYWORDS = [
+    '資料', 'data', '數據', '分析', 'analytics', 
+    'etl', 'sql', 'python', 'spark', 'hadoop',
+    'big data', '大數據', 'warehouse', '倉儲',
+    'pipeline', '管道', 'kafka', 'airflow',
+    'mongodb', 'mysql', 'postgresql', 'redis',
+    'aws', 'azure', 'gcp', 'cloud', '雲端'
+]
+
+# 技能、相關度、縣市與產業關鍵字共用一個比對器，每張卡片只需走訪文字一次
+CARD_KEYWORD_MATCHER = KeywordMatcher(
+    [literal for _, literal in SKILL_KEYWORD_LITERALS]
+    + DATA_KEYWORDS
+    + LOCATION_KEYWORDS
+    + [anchor for anchors in INDUSTRY_PATTERN_ANCHORS for anchor in anchors],
+    ignore_case=True
+)
+
+# 詳細頁的條件標籤與對應欄位（標籤與內容通常分在不同元素中）
+DETAIL_LABELS = {
+    '學歷': 'education',
+    '學歷要求': 'education',
+    '學歷限制': 'education',
+    '科系要求': 'department',
+    '科系限制': 'department',
+    '工作經驗': 'experience',
+    '經驗要求': 'experience',
+    '語文條件': 'language',
+    '外語能力': 'language',
+    '語言能力': 'language',
+    '工作技能': 'skills',
+    '電腦專長': 'skills',
+    '擅長工具': 'skills',
+    '附加條件': 'additional',
+    '其他條件': 'additional',
+}
+DETAIL_FIELDS = list(job_store.DETAIL_COLUMNS)
+
+# 詳細頁中與職缺內容無關、解析前先移除的元素
+DETAIL_NOISE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside']
+
+
+class CardContext:
+    """單一職缺卡片的解析上下文，卡片文字只計算一次供所有擷取步驟共用"""
+    
+    __slots__ = ('card', 'text', '_keywords')
+    
+    def __init__(self, card, text=None):
+        """
+        建立卡片上下文
+        
+        Args:
+            card: BeautifulSoup 職缺卡片元素
+            text (str): 卡片文字，None 表示使用 card.get_text()
+        """
+        self.card = card
+        self.text = card.get_text() if text is None else text
+        self._keywords = None
+    
+    @property
+    def keywords(self):
+        """卡片文字中出現的關鍵字（不分大小寫，第一次使用時才比對）"""
+        if self._keywords is None:
+            self._keywords = CARD_KEYWORD_MATCHER.find_all(self.text)
+        return self._keywords
+
 
 class Job1111Crawler:
     """1111 人力銀行職缺爬蟲類別"""
     
-    def __init__(self):
-        """初始化爬蟲"""
+    def __init__(self, requests_per_second=1.0, burst=2, cache=None, parser='html.parser',
+                 pool_size=10, max_retries=3, max_requests_per_second=None, metrics=None,
+                 embedded_json=True, archive=None):
+        """
+        初始化爬蟲
+        
+        Args:
+            requests_per_second (float): 並行爬取時對 1111 每秒最多發出的請求數
+            burst (int): 限速器允許的突發請求數
+            cache (ResponseCache): 搜尋結果的磁碟快取，None 表示不使用快取
+            parser (str): HTML 解析後端（html.parser / lxml / selectolax）
+            pool_size (int): 連線池大小（保留的 keep-alive 連線數），並行數超過時自動放大
+            max_retries (int): 逾時、連線錯誤、429 / 5xx 時最多重試次數
+            max_requests_per_second (float): 自動調速的速率上限，None 表示以
+                requests_per_second 為上限（只會在被限流後降速再恢復）
+            metrics (Metrics): 各階段的耗時與計數，None 表示建立新的 Metrics
+            embedded_json (bool): 搜尋結果頁內嵌職缺 JSON 時直接解析 JSON，
+                False 表示一律從 HTML 卡片擷取
+            archive (PageArchive): 原始頁面封存，每個從網路取得的頁面都寫入，None 表示不封存
+        """
         self.base_url = "https://www.1111.com.tw"
+        self.host = urlparse(self.base_url).netloc
+        # 同一主機共用一個 token bucket，所有執行緒都從這裡取得請求配額
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst)
+        # 依回應狀況自動調整 1111 的請求速率，並在連續失敗時暫停請求
+        self.throttle = AimdController(self.rate_limiter.bucket_for(self.host),
+                                       max_rate=max_requests_per_second or requests_per_second)
+        self.retry_policy = RetryPolicy(max_retries)
+        self.circuit_breaker = CircuitBreaker()
+        self.cache = cache
+        self.archive = archive
+        self.parser = html_backends.resolve_backend(parser)
+        self.embedded_json = embedded_json
+        self.pool_size = pool_size
+        self.metrics = metrics or Metrics()
         self.setup_session()
-        print("1111 人力銀行爬蟲已初始化")
+        logger.debug("1111 人力銀行爬蟲已初始化")
     
     def setup_session(self):
         """設定 HTTP session 和請求標頭"""
@@ -37,8 +271,136 @@ class Job1111Crawler:
         self.session = requests.Session()
         self.session.headers.update(self.headers)
         self.session.verify = False
+        self.mount_pool(self.pool_size)
+    
+    def mount_pool(self, pool_size):
+        """
+        掛載連線池大小與並行數相符的 HTTPAdapter，讓 keep-alive 連線能被重複使用
+        
+        requests 預設每個主機只保留 10 條連線，並行數超過時多出的連線用完就被
+        丟棄，下一個請求又要重新建立 TCP / TLS 連線。
+        
+        Args:
+            pool_size (int): 每個主機保留的連線數
+        """
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.pool_size = pool_size
+    
+    def ensure_pool(self, concurrency):
+        """
+        並行數超過目前的連線池大小時放大連線池
+        
+        Args:
+            concurrency (int): 同時進行的請求數
+        """
+        if concurrency > self.pool_size:
+            self.mount_pool(concurrency)
+    
+    def request(self, url, params=None, headers=None, rate_limited=True, kind='search'):
+        """
+        發出 GET 請求，暫時性錯誤會自動重試
+        
+        逾時、連線錯誤與 429 / 5xx 依 self.retry_policy 以指數退避重試（有 Retry-After
+        時至少等待該秒數）；每次回應都回報給 self.throttle 調整速率，連續失敗時由
+        self.circuit_breaker 暫停所有請求。
+        
+        Args:
+            url (str): 請求 URL
+            params (dict): 查詢參數
+            headers (dict): 額外的請求標頭
+            rate_limited (bool): 每次嘗試前是否先向共用限速器取得配額
+            kind (str): 請求種類（search / detail），作為指標的標籤
+        
+        Returns:
+            requests.Response: 最後一次的回應，重試用盡仍是連線錯誤、發生其他請求錯誤或斷路器開啟時返回 None
+        """
+        response = None
+        for attempt in range(self.retry_policy.max_retries + 1):
+            if not self.circuit_breaker.allow():
+                logger.warning("連續請求失敗，暫停請求 %.0f 秒後再試", self.circuit_breaker.retry_in())
+                return None
+            if rate_limited:
+                self.rate_limiter.acquire(self.host)
+            
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=15)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self.circuit_breaker.record_failure()
+                self.throttle.on_throttle()
+                response = None
+                timed_out = isinstance(e, requests.exceptions.Timeout)
+                self.metrics.inc('fetch_errors_total', kind=kind, reason='timeout' if timed_out else 'connection')
+                reason = "請求超時" if timed_out else "連線錯誤"
+                delay = self.retry_policy.backoff(attempt)
+            except requests.exceptions.RequestException as e:
+                # 其他請求錯誤（回應中斷、解碼失敗、重新導向過多等）也要回報斷路器，
+                # 否則半開狀態的試探請求永遠沒有結果，之後的請求都會被擋下
+                self.circuit_breaker.record_failure()
+                response = None
+                self.metrics.inc('fetch_errors_total', kind=kind, reason='request')
+                reason = f"請求錯誤 ({type(e).__name__})"
+                # 只有回應傳輸中斷是暫時性錯誤，其他錯誤重試也不會成功
+                retryable = isinstance(e, requests.exceptions.ChunkedEncodingError)
+                delay = self.retry_policy.backoff(attempt) if retryable else None
+                if not retryable:
+                    logger.warning("%s: %s", reason, e)
+            except BaseException:
+                # 非預期的例外同樣結束試探請求，再往外拋出
+                self.circuit_breaker.record_failure()
+                raise
+            else:
+                self.metrics.observe('fetch_seconds', time.monotonic() - started, kind=kind)
+                self.metrics.observe('response_bytes', len(response.content), kind=kind)
+                self.metrics.inc('http_responses_total', kind=kind, status=str(response.status_code))
+                if response.status_code not in RETRY_STATUSES:
+                    self.circuit_breaker.record_success()
+                    self.throttle.on_success(time.monotonic() - started)
+                    return response
+                
+                self.circuit_breaker.record_failure()
+                if response.status_code in THROTTLE_STATUSES:
+                    self.throttle.on_throttle()
+                reason = f"狀態碼 {response.status_code}"
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = self.retry_policy.backoff(attempt, retry_after)
+            
+            if attempt == self.retry_policy.max_retries or delay is None:
+                break
+            if self.circuit_breaker.is_open:
+                # 斷路器剛開啟，不必再等待退避時間
+                continue
+            logger.warning("%s，%.1f 秒後重試（第 %d 次）", reason, delay, attempt + 1)
+            self.metrics.inc('retries_total', kind=kind)
+            time.sleep(delay)
+        
+        return response
     
-    def search_jobs(self, keyword="資料工程師", page=1, delay=True):
+    def archive_page(self, response, url, kind='search', keyword=None, page=None):
+        """
+        把從網路取得的頁面寫入原始頁面封存（304 沒有內容，不寫入）
+        
+        封存失敗只記錄警告，不影響爬取。
+        
+        Args:
+            response (requests.Response): 回應
+            url (str): 完整請求網址（含查詢參數）
+            kind (str): 頁面種類（search / detail）
+            keyword (str): 搜尋關鍵字
+            page (int): 搜尋結果頁碼
+        """
+        if self.archive is None or response.status_code == 304:
+            return
+        try:
+            self.archive.append(response.text, url, keyword, page, response.status_code, kind)
+        except (OSError, RuntimeError) as e:
+            logger.warning("頁面封存失敗: %s (%s)", e, url)
+            return
+        self.metrics.inc('archived_pages_total', kind=kind)
+    
+    def search_jobs(self, keyword="資料工程師", page=1, delay=True, rate_limited=False):
         """
         搜尋職缺
         
@@ -46,118 +408,221 @@ class Job1111Crawler:
             keyword (str): 搜尋關鍵字
             page (int): 頁數
             delay (bool): 是否加入隨機延遲
+            rate_limited (bool): 發出請求前是否先向共用限速器取得配額
         
         Returns:
             str: HTML 內容，失敗時返回 None
         """
+        url = f"{self.base_url}/search/job"
         params = {
             'ks': keyword,
             'page': page,
             'order': 1  # 1=最新, 2=相關度
         }
         
+        # 先查快取：未過期或離線模式直接使用快取內容
+        cached = self.cache.get(url, params) if self.cache else None
+        if cached and (self.cache.offline or cached.is_fresh(self.cache.ttl)):
+            logger.debug("使用快取結果: %s, 第 %d 頁", keyword, page)
+            self.metrics.inc('cache_total', kind='search', result='hit')
+            return cached.body
+        if self.cache and self.cache.offline:
+            logger.warning("離線模式下沒有快取: %s, 第 %d 頁", keyword, page)
+            self.metrics.inc('cache_total', kind='search', result='offline_miss')
+            return None
+        if self.cache:
+            self.metrics.inc('cache_total', kind='search', result='stale' if cached else 'miss')
+        
         try:
             if delay:
                 # 隨機延遲避免被封鎖
                 time.sleep(random.uniform(1, 3))
             
-            print(f"搜尋關鍵字: {keyword}, 第 {page} 頁")
+            logger.info("搜尋關鍵字: %s, 第 %d 頁", keyword, page)
             
-            response = self.session.get(
-                f"{self.base_url}/search/job", 
-                params=params, 
-                timeout=15
+            response = self.request(
+                url,
+                params=params,
+                headers=cached.revalidation_headers() if cached else None,
+                rate_limited=rate_limited
             )
+            if response is None:
+                logger.warning("請求失敗")
+                return None
             response.encoding = 'utf-8'
+            self.archive_page(response, f"{url}?{urlencode(params)}", 'search', keyword, page)
             
-            if response.status_code == 200:
-                print(f"成功獲取搜尋結果")
+            if response.status_code == 304 and cached:
+                # 伺服器確認內容未變更，沿用快取
+                logger.debug("搜尋結果未變更，使用快取")
+                self.metrics.inc('cache_total', kind='search', result='revalidated')
+                self.cache.refresh(cached)
+                return cached.body
+            elif response.status_code == 200:
+                logger.debug("成功獲取搜尋結果")
+                if self.cache:
+                    self.cache.put(url, params, response.text, response.headers)
                 return response.text
             else:
-                print(f"搜尋失敗，狀態碼: {response.status_code}")
+                logger.warning("搜尋失敗，狀態碼: %d", response.status_code)
                 return None
                 
         except requests.exceptions.Timeout:
-            print("請求超時")
+            logger.warning("請求超時")
             return None
         except requests.exceptions.ConnectionError:
-            print("連線錯誤")
+            logger.warning("連線錯誤")
             return None
         except Exception as e:
-            print(f"搜尋錯誤: {e}")
+            logger.warning("搜尋錯誤: %s", e)
             return None
     
-    def parse_jobs(self, html_content):
+    def select_job_cards(self, html_content):
         """
-        解析職缺資訊
+        找出頁面中的職缺卡片
         
         Args:
             html_content (str): HTML 內容
         
         Returns:
-            list: 職缺資訊列表
+            list: BeautifulSoup 職缺卡片元素
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        jobs = []
+        # 使用多種選擇器找到職缺卡片：先只解析卡片子樹，找不到時再解析整頁
+        job_cards = html_backends.parse_cards(html_content, self.parser)
+        if job_cards:
+            self.metrics.inc('extraction_path_total', field='card_selector', path='strainer')
+        else:
+            # [class*="job"] 會同時命中卡片與其內部元素，只保留最外層的卡片
+            soup = html_backends.parse_document(html_content, self.parser)
+            job_cards = html_backends.outermost_job_elements(soup)
+            self.metrics.inc('extraction_path_total', field='card_selector', path='fallback')
+        return job_cards
+    
+    def select_job_records(self, html_content):
+        """
+        從頁面內嵌的 JSON（__NEXT_DATA__、application/json、ld+json、window.__XXX__）取出職缺
         
-        # 使用多種選擇器找到職缺卡片
-        job_cards = soup.select('.job-card')
-        if not job_cards:
-            job_cards = soup.select('.job-list-item')
-        if not job_cards:
-            job_cards = soup.select('[class*="job"]')
+        Args:
+            html_content (str): HTML 內容
         
-        print(f"找到 {len(job_cards)} 個職缺卡片")
+        Returns:
+            list: embedded_json.normalize_record 的結果列表，沒有內嵌職缺或已停用時為空列表
+        """
+        if not self.embedded_json:
+            return []
+        records = embedded_json.find_job_records(html_content, self.base_url)
+        self.metrics.inc('extraction_path_total', field='page_source',
+                         path='embedded_json' if records else 'html')
+        return records
+    
+    def parse_page(self, html_content, seen_ids=None, duplicate_ids=None):
+        """
+        解析單一頁面的職缺資訊，並依職缺 ID 去除重複
         
-        for i, card in enumerate(job_cards):
-            job_info = self.extract_job_from_card(card, i+1)
+        Args:
+            html_content (str): HTML 內容
+            seen_ids (set): 已處理過的職缺 ID，跨頁、跨關鍵字共用；會就地更新
+            duplicate_ids (list): 因重複而略過的職缺 ID 會加入此列表，None 表示不記錄
+        
+        Returns:
+            tuple: (職缺資訊列表, 頁面上的卡片數)
+        """
+        if seen_ids is None:
+            seen_ids = set()
+        jobs = []
+        duplicates = 0
+        started = time.perf_counter()
+        
+        # 頁面內嵌職缺 JSON 時直接使用，不需要建立 DOM；否則從 HTML 卡片擷取
+        records = self.select_job_records(html_content)
+        if records:
+            items = [(html_backends.job_id_from_link(record.get('link')), record) for record in records]
+            extract = self.extract_job_from_record
+            source = 'embedded_json'
+            card_count = len(records)
+        else:
+            job_cards = self.select_job_cards(html_content)
+            items = ((html_backends.card_job_id(card), card) for card in job_cards)
+            extract = self.extract_job_from_card
+            source = self.parser
+            card_count = len(job_cards)
+        logger.debug("找到 %d 個職缺卡片", card_count)
+        
+        for job_id, item in items:
+            # 在擷取欄位之前先以職缺 ID 去除重複
+            if job_id is not None:
+                if job_id in seen_ids:
+                    duplicates += 1
+                    if duplicate_ids is not None:
+                        duplicate_ids.append(job_id)
+                    continue
+                seen_ids.add(job_id)
+            
+            job_info = extract(item, len(jobs) + 1)
             if job_info:
                 jobs.append(job_info)
         
-        return jobs
+        self.metrics.observe('parse_page_seconds', time.perf_counter() - started, parser=source)
+        self.metrics.inc('cards_total', card_count)
+        self.metrics.inc('jobs_total', len(jobs))
+        if duplicates:
+            self.metrics.inc('duplicate_cards_total', duplicates)
+        return jobs, card_count
+    
+    def parse_jobs(self, html_content, seen_ids=None):
+        """
+        解析職缺資訊
+        
+        Args:
+            html_content (str): HTML 內容
+            seen_ids (set): 已處理過的職缺 ID，用於跨頁、跨關鍵字去除重複
+        
+        Returns:
+            list: 職缺資訊列表
+        """
+        return self.parse_page(html_content, seen_ids)[0]
     
-    def extract_industry(self, card):
+    def extract_industry(self, card, context=None):
         """
         提取產業類別
         
         Args:
             card: BeautifulSoup 職缺卡片元素
+            context (CardContext): 卡片解析上下文，None 時自行建立
         
         Returns:
             str: 產業類別
         """
         # 方法1: 尋找包含「產業」關鍵字的元素
-        industry_elem = card.find(class_=re.compile(r'industry|category|type', re.I))
+        industry_elem = card.find(class_=INDUSTRY_CLASS_RE)
         if industry_elem:
+            self.metrics.inc('extraction_path_total', field='industry', path='class')
             return industry_elem.get_text(strip=True)
         
         # 方法2: 尋找特定的產業標籤
-        industry_tag = card.find('span', class_=re.compile(r'tag|label|badge', re.I))
+        industry_tag = card.find('span', class_=TAG_CLASS_RE)
         if industry_tag:
             text = industry_tag.get_text(strip=True)
             # 檢查是否為產業類別（通常包含「業」字）
             if '業' in text or '產業' in text:
+                self.metrics.inc('extraction_path_total', field='industry', path='tag')
                 return text
         
         # 方法3: 從文字中提取產業資訊
-        card_text = card.get_text()
-        
-        # 常見產業關鍵字模式
-        industry_patterns = [
-            r'產業[：:]\s*([^\n\|]+)',
-            r'產業類別[：:]\s*([^\n\|]+)',
-            r'(軟體.*?業|資訊.*?業|電子.*?業|製造.*?業|金融.*?業|服務.*?業|零售.*?業|醫療.*?業|教育.*?業|建築.*?業|運輸.*?業|餐飲.*?業|旅遊.*?業|媒體.*?業|通訊.*?業)',
-            r'(網路相關業|電腦.*?相關業|半導體業|光電業|通信.*?業|顧問.*?業|人力.*?業|廣告.*?業|出版.*?業|娛樂.*?業)',
-        ]
-        
-        for pattern in industry_patterns:
-            match = re.search(pattern, card_text)
+        context = context or CardContext(card)
+        card_text = context.text
+        
+        for pattern, anchors in zip(INDUSTRY_PATTERNS, INDUSTRY_PATTERN_ANCHORS):
+            if not any(anchor in context.keywords for anchor in anchors):
+                continue
+            match = pattern.search(card_text)
             if match:
                 industry = match.group(1).strip()
                 # 清理產業名稱
-                industry = re.sub(r'\s+', ' ', industry)
+                industry = WHITESPACE_RE.sub(' ', industry)
                 industry = industry.split('|')[0].strip()
                 if len(industry) > 2 and len(industry) < 50:
+                    self.metrics.inc('extraction_path_total', field='industry', path='pattern')
                     return industry
         
         # 方法4: 從所有 span 標籤中尋找
@@ -167,18 +632,20 @@ class Job1111Crawler:
             # 檢查是否符合產業類別特徵
             if ('業' in text or '產業' in text) and len(text) < 30 and len(text) > 3:
                 # 排除一些非產業的文字
-                exclude_keywords = ['職業', '專業', '畢業', '作業', '營業', '就業', '創業']
-                if not any(keyword in text for keyword in exclude_keywords):
+                if not any(keyword in text for keyword in INDUSTRY_EXCLUDE_KEYWORDS):
+                    self.metrics.inc('extraction_path_total', field='industry', path='span')
                     return text
         
+        self.metrics.inc('extraction_path_total', field='industry', path='none')
         return 'N/A'
     
-    def extract_requirements(self, card):
+    def extract_requirements(self, card, context=None):
         """
         提取要求條件
         
         Args:
             card: BeautifulSoup 職缺卡片元素
+            context (CardContext): 卡片解析上下文，None 時自行建立
         
         Returns:
             dict: 包含六種要求條件的字典
@@ -192,129 +659,97 @@ class Job1111Crawler:
             'additional': 'N/A'      # 附加條件
         }
         
-        card_text = card.get_text()
+        context = context or CardContext(card)
+        card_text = context.text
+        # 各欄位實際使用的規則：pattern（正規表示式）、keyword（關鍵字比對）或 none
+        paths = dict.fromkeys(('education', 'department', 'experience', 'language', 'skills'), 'none')
         
         # 1. 學歷要求
-        education_patterns = [
-            r'學歷要求[：:]\s*([^\n]+)',
-            r'學歷[：:]\s*([^\n\|]+)',
-            r'(大學|碩士|博士|專科|高中職|國中|不拘)(?:以上)?',
-        ]
-        for pattern in education_patterns:
-            match = re.search(pattern, card_text)
+        for pattern in EDUCATION_PATTERNS:
+            match = pattern.search(card_text)
             if match:
                 edu = match.group(1).strip()
                 # 清理學歷文字
-                edu = re.sub(r'\s+', ' ', edu)
+                edu = WHITESPACE_RE.sub(' ', edu)
                 if len(edu) < 50:
                     requirements['education'] = edu
+                    paths['education'] = 'pattern'
                     break
         
         # 2. 科系要求
-        department_patterns = [
-            r'科系要求[：:]\s*([^\n]+)',
-            r'科系[：:]\s*([^\n\|]+)',
-            r'(?:相關)?科系[：:]?\s*([^\n\|]{2,30})',
-        ]
-        for pattern in department_patterns:
-            match = re.search(pattern, card_text)
+        for pattern in DEPARTMENT_PATTERNS:
+            match = pattern.search(card_text)
             if match:
                 dept = match.group(1).strip()
                 # 清理科系文字
-                dept = re.sub(r'\s+', ' ', dept)
+                dept = WHITESPACE_RE.sub(' ', dept)
                 if len(dept) < 100 and '不拘' not in dept:
                     requirements['department'] = dept
+                    paths['department'] = 'pattern'
                     break
         
         # 如果找到「不拘」，則設為不拘
         if '科系不拘' in card_text or '科系：不拘' in card_text:
             requirements['department'] = '不拘'
+            paths['department'] = 'keyword'
         
         # 3. 工作經驗
-        experience_patterns = [
-            r'工作經驗[：:]\s*([^\n]+)',
-            r'經驗[：:]\s*([^\n\|]+)',
-            r'(\d+年以上|\d+年|\d+\s*[-~至]\s*\d+年|不拘|無經驗可|應屆畢業生)',
-        ]
-        for pattern in experience_patterns:
-            match = re.search(pattern, card_text)
+        for pattern in EXPERIENCE_PATTERNS:
+            match = pattern.search(card_text)
             if match:
                 exp = match.group(1).strip()
                 # 清理經驗文字
-                exp = re.sub(r'\s+', ' ', exp)
+                exp = WHITESPACE_RE.sub(' ', exp)
                 if len(exp) < 50:
                     requirements['experience'] = exp
+                    paths['experience'] = 'pattern'
                     break
         
         # 4. 外語能力
-        language_patterns = [
-            r'外語能力[：:]\s*([^\n]+)',
-            r'語言[：:]\s*([^\n\|]+)',
-            r'(英文|日文|韓文|法文|德文|西班牙文)[：:]?\s*([^\n\|]{2,30})',
-            r'(TOEIC|多益|托福|雅思)\s*(\d+)(?:分)?(?:以上)?',
-        ]
-        for pattern in language_patterns:
-            match = re.search(pattern, card_text)
+        for pattern in LANGUAGE_PATTERNS:
+            match = pattern.search(card_text)
             if match:
                 lang = match.group(0).strip()
                 # 清理語言文字
-                lang = re.sub(r'\s+', ' ', lang)
+                lang = WHITESPACE_RE.sub(' ', lang)
                 if len(lang) < 100:
                     requirements['language'] = lang
+                    paths['language'] = 'pattern'
                     break
         
         # 如果找到「不拘」，則設為不拘
         if '語言不拘' in card_text or '外語：不拘' in card_text:
             requirements['language'] = '不拘'
+            paths['language'] = 'keyword'
         
         # 5. 工作技能
-        skills_patterns = [
-            r'工作技能[：:]\s*([^\n]+)',
-            r'技能[：:]\s*([^\n\|]+)',
-            r'擅長工具[：:]\s*([^\n]+)',
-        ]
-        
-        # 常見技能關鍵字
-        skill_keywords = [
-            'Python', 'Java', 'SQL', 'JavaScript', 'C\+\+', 'C#', 'PHP', 'Ruby',
-            'Spark', 'Hadoop', 'Kafka', 'Airflow', 'Docker', 'Kubernetes',
-            'AWS', 'Azure', 'GCP', 'Linux', 'Git', 'ETL',
-            'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Elasticsearch',
-            'Tableau', 'Power BI', 'Excel', 'R語言'
-        ]
-        
         # 先嘗試從特定模式提取
-        for pattern in skills_patterns:
-            match = re.search(pattern, card_text)
+        for pattern in SKILLS_PATTERNS:
+            match = pattern.search(card_text)
             if match:
                 skills = match.group(1).strip()
                 # 清理技能文字
-                skills = re.sub(r'\s+', ' ', skills)
+                skills = WHITESPACE_RE.sub(' ', skills)
                 if len(skills) < 200:
                     requirements['skills'] = skills
+                    paths['skills'] = 'pattern'
                     break
         
         # 如果沒找到，則搜尋常見技能關鍵字
         if requirements['skills'] == 'N/A':
             found_skills = []
-            for skill in skill_keywords:
-                if re.search(skill, card_text, re.IGNORECASE):
+            for skill, literal in SKILL_KEYWORD_LITERALS:
+                if literal in context.keywords:
                     found_skills.append(skill)
             
             if found_skills:
                 requirements['skills'] = ', '.join(found_skills[:10])  # 最多列出10個
+                paths['skills'] = 'keyword'
         
         # 6. 附加條件
-        additional_patterns = [
-            r'附加條件[：:]\s*([^\n]+)',
-            r'其他條件[：:]\s*([^\n]+)',
-            r'(需.*?證照|具.*?證照|持有.*?證照)',
-            r'(可配合.*?|願意.*?|需.*?)',
-        ]
-        
         additional_items = []
-        for pattern in additional_patterns:
-            matches = re.finditer(pattern, card_text)
+        for pattern in ADDITIONAL_PATTERNS:
+            matches = pattern.finditer(card_text)
             for match in matches:
                 item = match.group(1) if match.lastindex else match.group(0)
                 item = item.strip()
@@ -324,6 +759,9 @@ class Job1111Crawler:
         if additional_items:
             requirements['additional'] = ' | '.join(additional_items[:3])  # 最多列出3個
         
+        for field, path in paths.items():
+            self.metrics.inc('extraction_path_total', field=field, path=path)
+        
         return requirements
     
     def extract_job_from_card(self, card, index):
@@ -335,72 +773,68 @@ class Job1111Crawler:
             index (int): 職缺編號
         
         Returns:
-            dict: 職缺資訊字典
+            JobRecord: 職缺資訊（介面與 dict 相同，類別欄位的字串共用同一個物件）
         """
-        job_info = {'index': index}
+        job_info = JobRecord(index=index)
         
         try:
+            # 卡片文字只取一次，之後各擷取步驟共用
+            context = CardContext(card)
+            card_text = context.text
+            
             # 職缺標題和連結
-            title_link = card.find('a', href=re.compile(r'/job/'))
+            title_link = card.find('a', href=JOB_LINK_RE)
             if title_link:
                 job_info['title'] = title_link.get_text(strip=True)
                 href = title_link.get('href', '')
                 job_info['link'] = href if href.startswith('http') else self.base_url + href
             
             # 公司名稱
-            company_elem = card.find(class_=re.compile(r'company', re.I))
+            company_elem = card.find(class_=COMPANY_CLASS_RE)
             if not company_elem:
                 # 嘗試從所有文字中尋找公司名稱
-                all_text = card.get_text()
-                company_match = re.search(r'([^｜\n\r\t]+(?:股份有限公司|有限公司|公司))', all_text)
+                company_match = COMPANY_NAME_RE.search(card_text)
                 if company_match:
                     job_info['company'] = company_match.group(1).strip()
+                    company_path = 'regex'
                 else:
                     # 提取卡片中的公司資訊
-                    company_text = all_text.split('\n')[0] if '\n' in all_text else all_text[:50]
+                    company_text = card_text.split('\n')[0] if '\n' in card_text else card_text[:50]
                     job_info['company'] = company_text.strip()
+                    company_path = 'first_line'
             else:
                 job_info['company'] = company_elem.get_text(strip=True)
+                company_path = 'class'
+            self.metrics.inc('extraction_path_total', field='company', path=company_path)
             
             # 產業類別
-            job_info['industry'] = self.extract_industry(card)
+            with self.metrics.timer('extractor_seconds', extractor='industry'):
+                job_info['industry'] = self.extract_industry(card, context)
             
             # 工作地點
-            location_patterns = [
-                '台北市', '新北市', '桃園市', '台中市', '台南市', '高雄市', 
-                '新竹市', '新竹縣', '基隆市', '宜蘭縣', '苗栗縣', '彰化縣',
-                '南投縣', '雲林縣', '嘉義市', '嘉義縣', '屏東縣', '花蓮縣',
-                '台東縣', '澎湖縣', '金門縣', '連江縣'
-            ]
-            
-            card_text = card.get_text()
-            for location in location_patterns:
-                if location in card_text:
+            for location in LOCATION_KEYWORDS:
+                if location in context.keywords:
                     job_info['location'] = location
                     break
             
             # 薪資資訊
-            salary_elem = card.find(class_=re.compile(r'salary|wage|pay', re.I))
+            salary_elem = card.find(class_=SALARY_CLASS_RE)
+            salary_path = 'none'
             if salary_elem:
                 job_info['salary'] = salary_elem.get_text(strip=True)
+                salary_path = 'class'
             else:
-                # 從文字中尋找薪資模式
-                salary_patterns = [
-                    r'月薪\s*(\d+[,\d]*\s*[-~至]\s*\d+[,\d]*|\d+[,\d]*)\s*元',
-                    r'年薪\s*(\d+[,\d]*\s*[-~至]\s*\d+[,\d]*|\d+[,\d]*)\s*元',
-                    r'(\d+[,\d]*\s*[-~至]\s*\d+[,\d]*)\s*元',
-                    r'薪資\s*(\d+[,\d]*\s*[-~至]\s*\d+[,\d]*)',
-                    r'面議.*經常性薪資達(\d+[,\d]*)萬?元'
-                ]
-                
-                for pattern in salary_patterns:
-                    salary_match = re.search(pattern, card_text)
+                for pattern in SALARY_PATTERNS:
+                    salary_match = pattern.search(card_text)
                     if salary_match:
                         job_info['salary'] = salary_match.group(0)
+                        salary_path = 'pattern'
                         break
+            self.metrics.inc('extraction_path_total', field='salary', path=salary_path)
             
             # 提取要求條件（新增）
-            requirements = self.extract_requirements(card)
+            with self.metrics.timer('extractor_seconds', extractor='requirements'):
+                requirements = self.extract_requirements(card, context)
             job_info['education'] = requirements['education']
             job_info['department'] = requirements['department']
             job_info['experience'] = requirements['experience']
@@ -409,9 +843,8 @@ class Job1111Crawler:
             job_info['additional'] = requirements['additional']
             
             # 發布時間
-            time_patterns = [r'\d+/\d+', r'\d+天前', r'昨天', r'今天', r'\d+小時前']
-            for pattern in time_patterns:
-                time_match = re.search(pattern, card_text)
+            for pattern in TIME_PATTERNS:
+                time_match = pattern.search(card_text)
                 if time_match:
                     job_info['publish_date'] = time_match.group(0)
                     break
@@ -420,195 +853,784 @@ class Job1111Crawler:
             summary_elem = card.find(class_='job-summary')
             if summary_elem:
                 job_info['summary'] = summary_elem.get_text(strip=True)[:200]
+                summary_path = 'class'
             else:
                 # 提取卡片的部分文字作為摘要
-                summary_text = card.get_text()[:200]
-                job_info['summary'] = summary_text.replace('\n', ' ').strip()
+                job_info['summary'] = card_text[:200].replace('\n', ' ').strip()
+                summary_path = 'text'
+            self.metrics.inc('extraction_path_total', field='summary', path=summary_path)
             
             # 計算相關度評分
-            job_info['relevance_score'] = self.calculate_relevance_score(card_text)
+            with self.metrics.timer('extractor_seconds', extractor='relevance'):
+                job_info['relevance_score'] = self.calculate_relevance_score(card_text, context.keywords)
             
             # 確保至少有標題才返回
             return job_info if job_info.get('title') else None
             
         except Exception as e:
-            print(f"解析職缺卡片 {index} 時發生錯誤: {e}")
+            logger.warning("解析職缺卡片 %d 時發生錯誤: %s", index, e)
+            self.metrics.inc('card_errors_total')
             return None
     
-    def calculate_relevance_score(self, text):
+    def extract_job_from_record(self, record, index):
+        """
+        把內嵌 JSON 的職缺轉成與 extract_job_from_card 相同的欄位
+        
+        JSON 已有明確的欄位，不需要猜測 class 或以正規表示式擷取；只有地點（正規化為縣市）、
+        JSON 沒有提供的技能，以及相關度評分仍以關鍵字比對卡片文字取得。
+        
+        Args:
+            record (dict): embedded_json.normalize_record 的結果
+            index (int): 職缺編號
+        
+        Returns:
+            JobRecord: 職缺資訊，沒有標題時為 None
+        """
+        job_info = JobRecord(index=index)
+        text = '\n'.join(record.values())
+        keywords = CARD_KEYWORD_MATCHER.find_all(text)
+        
+        for field in ('title', 'link', 'company'):
+            if field in record:
+                job_info[field] = record[field]
+        job_info['industry'] = record.get('industry', 'N/A')
+        
+        # 地點只保留縣市，與 HTML 路徑相同
+        location_keywords = CARD_KEYWORD_MATCHER.find_all(record['location']) if 'location' in record else keywords
+        for location in LOCATION_KEYWORDS:
+            if location in location_keywords:
+                job_info['location'] = location
+                break
+        
+        if 'salary' in record:
+            job_info['salary'] = record['salary']
+        
+        for field in DETAIL_FIELDS:
+            job_info[field] = record.get(field, 'N/A')
+        if job_info['skills'] == 'N/A':
+            found_skills = [skill for skill, literal in SKILL_KEYWORD_LITERALS if literal in keywords]
+            if found_skills:
+                job_info['skills'] = ', '.join(found_skills[:10])
+        
+        if 'publish_date' in record:
+            job_info['publish_date'] = record['publish_date']
+        job_info['summary'] = record.get('summary', '')
+        job_info['relevance_score'] = self.calculate_relevance_score(text, keywords)
+        
+        self.metrics.inc('extraction_path_total', field='company',
+                         path='embedded_json' if 'company' in record else 'none')
+        return job_info if job_info.get('title') else None
+    
+    def calculate_relevance_score(self, text, keywords=None):
         """
         計算職缺相關度評分
         
         Args:
             text (str): 職缺文字內容
+            keywords (set): 已比對出的關鍵字，None 時自行比對 text
         
         Returns:
             int: 相關度評分
         """
-        text_lower = text.lower()
-        
-        # 資料工程相關關鍵字
-        data_keywords = [
-            '資料', 'data', '數據', '分析', 'analytics', 
-            'etl', 'sql', 'python', 'spark', 'hadoop',
-            'big data', '大數據', 'warehouse', '倉儲',
-            'pipeline', '管道', 'kafka', 'airflow',
-            'mongodb', 'mysql', 'postgresql', 'redis',
-            'aws', 'azure', 'gcp', 'cloud', '雲端'
-        ]
+        if keywords is None:
+            keywords = CARD_KEYWORD_MATCHER.find_all(text)
         
         score = 0
-        for keyword in data_keywords:
-            if keyword in text_lower:
+        for keyword in DATA_KEYWORDS:
+            if keyword in keywords:
                 score += 1
         
         return score
     
-    def save_to_csv(self, jobs, keyword='jobs'):
+    def save_to_csv(self, jobs, keyword='jobs', output_dir=None):
         """
         儲存職缺資料到 CSV 檔案（檔名包含日期時間）
         
         Args:
             jobs (list): 職缺資訊列表
             keyword (str): 搜尋關鍵字
+            output_dir (str): 輸出目錄，None 表示使用專案的 data/
         
         Returns:
             pandas.DataFrame: 職缺資料框
         """
         if not jobs:
-            print("沒有職缺資料可儲存")
+            logger.warning("沒有職缺資料可儲存")
             return None
         
-        df = pd.DataFrame(jobs)
+        import pandas as pd
         
-        # 調整欄位順序，將要求條件放在前面
-        column_order = [
-            'index', 'title', 'company', 'industry', 'location', 'salary',
-            'education', 'department', 'experience', 'language', 'skills', 'additional',
-            'publish_date', 'relevance_score', 'summary', 'link'
-        ]
+        df = pd.DataFrame(jobs)
         
-        # 只保留存在的欄位
-        column_order = [col for col in column_order if col in df.columns]
+        # 調整欄位順序，只保留存在的欄位
+        column_order = [col for col in COLUMN_ORDER if col in df.columns]
         df = df[column_order]
         
         # 生成包含日期時間的檔案名稱
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"/Users/txwu/project/data/GetOffer/data/1111_{keyword.replace(' ', '_')}_{timestamp}.csv"
+        filename = build_output_path(keyword, 'csv', output_dir)
         
         df.to_csv(filename, index=False, encoding='utf-8-sig')
-        print(f"已儲存 {len(jobs)} 筆職缺資料到 {filename}")
+        logger.info("已儲存 %d 筆職缺資料到 %s", len(jobs), filename)
         return df
     
-    def analyze_jobs(self, jobs):
+    def save_to_parquet(self, jobs, keyword='jobs', root=None):
         """
-        分析職缺統計資訊
+        以附加方式儲存職缺資料到 Parquet 資料集（依關鍵字與爬取日期分割）
         
         Args:
             jobs (list): 職缺資訊列表
+            keyword (str): 搜尋關鍵字
+            root (str): 資料集根目錄，None 表示使用 data/parquet
+        
+        Returns:
+            str: 資料集根目錄，失敗時返回 None
         """
         if not jobs:
-            print("沒有職缺資料可分析")
-            return
+            logger.warning("沒有職缺資料可儲存")
+            return None
         
-        print(f"統計分析")
-        print("=" * 50)
-        
-        # 公司統計
-        companies = [job.get('company') for job in jobs 
-                    if job.get('company') and job.get('company') != 'N/A']
-        if companies:
-            company_counts = Counter(companies)
-            print(f"公司分布 (前5名):")
-            for company, count in company_counts.most_common(5):
-                print(f"   {company}: {count} 個職缺")
-        
-        # 產業統計
-        industries = [job.get('industry') for job in jobs 
-                     if job.get('industry') and job.get('industry') != 'N/A']
-        if industries:
-            industry_counts = Counter(industries)
-            print(f"產業分布:")
-            for industry, count in industry_counts.most_common():
-                print(f"   {industry}: {count} 個職缺")
-        
-        # 地點統計
-        locations = [job.get('location') for job in jobs 
-                    if job.get('location') and job.get('location') != 'N/A']
-        if locations:
-            location_counts = Counter(locations)
-            print(f"地點分布:")
-            for location, count in location_counts.most_common():
-                print(f"   {location}: {count} 個職缺")
-        
-        # 學歷要求統計
-        educations = [job.get('education') for job in jobs 
-                     if job.get('education') and job.get('education') != 'N/A']
-        if educations:
-            education_counts = Counter(educations)
-            print(f"學歷要求分布:")
-            for education, count in education_counts.most_common():
-                print(f"   {education}: {count} 個職缺")
-        
-        # 工作經驗統計
-        experiences = [job.get('experience') for job in jobs 
-                      if job.get('experience') and job.get('experience') != 'N/A']
-        if experiences:
-            experience_counts = Counter(experiences)
-            print(f"工作經驗要求分布:")
-            for experience, count in experience_counts.most_common():
-                print(f"   {experience}: {count} 個職缺")
-        
-        # 相關度統計
-        relevance_scores = [job.get('relevance_score', 0) for job in jobs]
-        if relevance_scores:
-            avg_relevance = sum(relevance_scores) / len(relevance_scores)
-            print(f"平均相關度: {avg_relevance:.2f}")
-            print(f"   最高相關度: {max(relevance_scores)}")
-            print(f"   最低相關度: {min(relevance_scores)}")
-        
-        # 各項資料完整度統計
-        print(f"\n資料完整度:")
-        print(f"   有薪資資訊: {len([j for j in jobs if j.get('salary') and j.get('salary') != 'N/A'])} 個 ({len([j for j in jobs if j.get('salary') and j.get('salary') != 'N/A'])/len(jobs)*100:.1f}%)")
-        print(f"   有學歷要求: {len(educations)} 個 ({len(educations)/len(jobs)*100:.1f}%)")
-        print(f"   有科系要求: {len([j for j in jobs if j.get('department') and j.get('department') != 'N/A'])} 個 ({len([j for j in jobs if j.get('department') and j.get('department') != 'N/A'])/len(jobs)*100:.1f}%)")
-        print(f"   有經驗要求: {len(experiences)} 個 ({len(experiences)/len(jobs)*100:.1f}%)")
-        print(f"   有外語要求: {len([j for j in jobs if j.get('language') and j.get('language') != 'N/A'])} 個 ({len([j for j in jobs if j.get('language') and j.get('language') != 'N/A'])/len(jobs)*100:.1f}%)")
-        print(f"   有技能要求: {len([j for j in jobs if j.get('skills') and j.get('skills') != 'N/A'])} 個 ({len([j for j in jobs if j.get('skills') and j.get('skills') != 'N/A'])/len(jobs)*100:.1f}%)")
-        print(f"   有附加條件: {len([j for j in jobs if j.get('additional') and j.get('additional') != 'N/A'])} 個 ({len([j for j in jobs if j.get('additional') and j.get('additional') != 'N/A'])/len(jobs)*100:.1f}%)")
-    
-    def crawl_multiple_pages(self, keyword="資料工程師", max_pages=3):
+        root = parquet_store.write_parquet(jobs, keyword, root)
+        if root:
+            logger.info("已儲存 %d 筆職缺資料到 Parquet 資料集 %s", len(jobs), root)
+        return root
+    
+    def analyze_jobs(self, jobs, dedupe=False):
         """
-        爬取多頁職缺資料
+        分析職缺統計資訊（以 DataFrame 向量化計算，可直接分析歷史 CSV / Parquet）
+        
+        Args:
+            jobs: 職缺資訊列表、pandas.DataFrame、pyarrow.Table，或 CSV glob（例如 data/*.csv）
+            dedupe (bool): 是否先合併近似重複的職缺再統計
+        
+        Returns:
+            dict: 統計結果，格式見 job_analysis.analyze_frame
+        """
+        result = job_analysis.analyze_frame(jobs, dedupe=dedupe)
+        job_analysis.print_report(result)
+        return result
+    
+    def fetch_page(self, keyword, page):
+        """
+        經由共用限速器取得搜尋結果頁（取代固定的隨機延遲）
         
         Args:
             keyword (str): 搜尋關鍵字
-            max_pages (int): 最大頁數
+            page (int): 頁數
         
         Returns:
-            list: 所有職缺資訊列表
+            str: HTML 內容，失敗時返回 None
         """
-        all_jobs = []
+        return self.search_jobs(keyword, page, delay=False, rate_limited=True)
+    
+    def fetch_detail(self, link):
+        """
+        經由共用限速器取得職缺詳細頁（有快取時先查快取）
+        
+        Args:
+            link (str): 職缺連結，例如 https://www.1111.com.tw/job/132096607
+        
+        Returns:
+            str: HTML 內容，失敗時返回 None
+        """
+        cached = self.cache.get(link) if self.cache else None
+        if cached and (self.cache.offline or cached.is_fresh(self.cache.ttl)):
+            self.metrics.inc('cache_total', kind='detail', result='hit')
+            return cached.body
+        if self.cache and self.cache.offline:
+            self.metrics.inc('cache_total', kind='detail', result='offline_miss')
+            return None
+        if self.cache:
+            self.metrics.inc('cache_total', kind='detail', result='stale' if cached else 'miss')
         
-        for page in range(1, max_pages + 1):
-            print(f"正在爬取第 {page} 頁...")
+        try:
+            response = self.request(link, headers=cached.revalidation_headers() if cached else None,
+                                    kind='detail')
+            if response is None:
+                return None
+            response.encoding = 'utf-8'
+            self.archive_page(response, link, 'detail')
             
-            html_content = self.search_jobs(keyword, page)
-            if html_content:
-                jobs = self.parse_jobs(html_content)
-                if jobs:
-                    all_jobs.extend(jobs)
-                    print(f"第 {page} 頁爬取完成，獲得 {len(jobs)} 個職缺")
-                else:
-                    print(f"第 {page} 頁沒有找到職缺")
+            if response.status_code == 304 and cached:
+                self.metrics.inc('cache_total', kind='detail', result='revalidated')
+                self.cache.refresh(cached)
+                return cached.body
+            elif response.status_code == 200:
+                if self.cache:
+                    self.cache.put(link, None, response.text, response.headers)
+                return response.text
+            else:
+                logger.warning("詳細頁取得失敗，狀態碼: %d (%s)", response.status_code, link)
+                return None
+                
+        except requests.exceptions.RequestException as e:
+            logger.warning("詳細頁請求錯誤: %s (%s)", e, link)
+            return None
+    
+    def parse_detail(self, html_content):
+        """
+        解析職缺詳細頁的要求條件
+        
+        先依「學歷要求」「工作經驗」等標籤取出對應內容，找不到標籤的欄位
+        再以搜尋卡片使用的規則從詳細頁文字中擷取。
+        
+        Args:
+            html_content (str): 詳細頁 HTML
+        
+        Returns:
+            dict: 找到的要求條件（只包含有值的欄位）
+        """
+        soup = html_backends.parse_document(html_content, self.parser)
+        for tag in soup.find_all(DETAIL_NOISE_TAGS):
+            tag.decompose()
+        root = soup.find('main') or soup.body or soup
+        
+        # 以換行分隔各元素文字，讓標籤與內容各自成為一行
+        lines = [line.strip() for line in root.get_text('\n').split('\n') if line.strip()]
+        
+        details = {}
+        for i, line in enumerate(lines):
+            label, value = line, ''
+            for colon in ('：', ':'):
+                if colon in line:
+                    label, _, value = line.partition(colon)
                     break
+            field = DETAIL_LABELS.get(label.strip())
+            if not field or field in details:
+                continue
+            
+            # 標籤與內容在同一行（學歷要求：大學以上）或內容在下一行
+            value = value.strip() or (lines[i + 1] if i + 1 < len(lines) else '')
+            value = WHITESPACE_RE.sub(' ', value)
+            if value and value.rstrip('：:') not in DETAIL_LABELS:
+                details[field] = value[:200]
+        
+        # 沒有標籤的欄位改用卡片的擷取規則
+        requirements = self.extract_requirements(root, CardContext(root, '\n'.join(lines)))
+        for field in DETAIL_FIELDS:
+            if field not in details and requirements[field] != 'N/A':
+                details[field] = requirements[field]
+        
+        return details
+    
+    def crawl_details(self, jobs, concurrency=4, store=None):
+        """
+        抓取職缺詳細頁，補齊學歷、科系、經驗、外語、技能與附加條件（就地更新 jobs）
+        
+        以最多 concurrency 個請求的執行緒池抓取，連線池大小會配合並行數放大。
+        有 store 時，職缺 ID 已保存且搜尋卡片內容未變更的職缺直接沿用保存的
+        詳細頁結果，不重新抓取。
+        
+        Args:
+            jobs (list): 職缺資訊列表（需要有 link 欄位）
+            concurrency (int): 同時進行的請求數
+            store (JobStore): 保存詳細頁結果的資料庫，None 表示每次都抓取
+        
+        Returns:
+            dict: {'fetched': 抓取數, 'skipped': 沿用保存結果數, 'failed': 失敗數}
+        """
+        stats = {'fetched': 0, 'skipped': 0, 'failed': 0}
+        
+        # card_hash 不含發布時間、分數與詳細頁欄位，內容未變更時每天都相同
+        targets = []
+        for job in jobs:
+            job_id = html_backends.job_id_from_link(job.get('link'))
+            if job_id is not None:
+                targets.append((job, job_id, job_store.card_hash(job)))
+        
+        saved = store.get_details(job_id for _, job_id, _ in targets) if store else {}
+        to_fetch = []
+        for job, job_id, digest in targets:
+            if job_id in saved and saved[job_id][0] == digest:
+                job.update(saved[job_id][1])
+                stats['skipped'] += 1
             else:
-                print(f"第 {page} 頁爬取失敗")
-                break
+                to_fetch.append((job, job_id, digest))
+        
+        if not to_fetch:
+            return stats
+        
+        concurrency = max(concurrency, 1)
+        self.ensure_pool(concurrency)
+        logger.info("抓取 %d 個職缺詳細頁（略過 %d 個未變更的職缺）", len(to_fetch), stats['skipped'])
+        
+        def fetch_and_parse(job):
+            html_content = self.fetch_detail(job['link'])
+            return self.parse_detail(html_content) if html_content else None
+        
+        results = []
+        pending = {}
+        remaining = iter(to_fetch)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                # 維持最多 concurrency 個進行中的請求，不一次送出全部工作
+                for target in remaining:
+                    pending[executor.submit(fetch_and_parse, target[0])] = target
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, job_id, digest = pending.pop(future)
+                    try:
+                        details = future.result()
+                    except Exception as e:
+                        logger.warning("解析詳細頁 %s 時發生錯誤: %s", job_id, e)
+                        details = None
+                    if details is None:
+                        stats['failed'] += 1
+                        continue
+                    job.update(details)
+                    results.append((job_id, digest, details))
+                    stats['fetched'] += 1
+        
+        if store and results:
+            store.save_details(results)
+        logger.info("詳細頁完成：抓取 %d、沿用 %d、失敗 %d", stats['fetched'], stats['skipped'], stats['failed'])
+        return stats
+    
+    def iter_pages(self, keyword="資料工程師", max_pages=3, concurrency=1):
+        """
+        依頁碼順序逐頁取得搜尋結果
+        
+        concurrency 大於 1 時以執行緒池並行抓取，最多同時有 concurrency 個請求
+        在進行，請求節奏由 self.rate_limiter 控制；呼叫端停止迭代時會取消尚未
+        開始的請求。
+        
+        Args:
+            keyword (str): 搜尋關鍵字
+            max_pages (int): 最大頁數
+            concurrency (int): 同時進行的請求數
+        
+        Yields:
+            tuple: (頁數, HTML 內容)，抓取失敗時 HTML 內容為 None
+        """
+        if concurrency <= 1:
+            for page in range(1, max_pages + 1):
+                # 頁面間延遲
+                if page > 1:
+                    time.sleep(random.uniform(2, 4))
+                logger.info("正在爬取第 %d 頁...", page)
+                yield page, self.search_jobs(keyword, page)
+            return
+        
+        self.ensure_pool(concurrency)
+        pending = {}
+        next_page = 1
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                for page in range(1, max_pages + 1):
+                    # 補滿請求視窗，維持 concurrency 個請求在進行中
+                    while next_page <= max_pages and len(pending) < concurrency:
+                        pending[next_page] = executor.submit(self.fetch_page, keyword, next_page)
+                        next_page += 1
+                    
+                    yield page, pending.pop(page).result()
+            finally:
+                # 提前停止時取消尚未開始的請求
+                for future in pending.values():
+                    future.cancel()
+    
+    def iter_job_pages(self, keyword="資料工程師", max_pages=3, concurrency=1, seen_ids=None,
+                       parse_workers=0):
+        """
+        逐頁爬取並解析，每解析完一頁就產生該頁的職缺
+        
+        遇到抓取失敗或沒有職缺卡片的頁面時停止。
+        
+        Args:
+            keyword (str): 搜尋關鍵字
+            max_pages (int): 最大頁數
+            concurrency (int): 同時進行的請求數，大於 1 時改用限速器並行爬取
+            seen_ids (set): 已收集的職缺 ID；多個關鍵字共用同一個集合即可跨關鍵字去除重複
+            parse_workers (int): 大於 0 時改用管線模式，以此數量的行程解析頁面
+        
+        Yields:
+            tuple: (頁數, 該頁新職缺列表)
+        """
+        if parse_workers > 0:
+            yield from self.iter_pipeline_pages(keyword, max_pages, max(concurrency, 1),
+                                                parse_workers, seen_ids=seen_ids)
+            return
+        
+        if seen_ids is None:
+            seen_ids = set()
+        
+        for page, html_content in self.iter_pages(keyword, max_pages, concurrency):
+            if not html_content:
+                logger.warning("第 %d 頁爬取失敗", page)
+                return
+            
+            jobs, card_count = self.parse_page(html_content, seen_ids)
+            if not card_count:
+                logger.info("第 %d 頁沒有找到職缺", page)
+                return
+            
+            logger.info("第 %d 頁爬取完成，獲得 %d 個職缺", page, len(jobs))
+            yield page, jobs
+    
+    def iter_pipeline_pages(self, keyword="資料工程師", max_pages=3, fetch_workers=4,
+                            parse_workers=None, queue_size=8, seen_ids=None):
+        """
+        以管線方式逐頁爬取：抓取與解析同時進行，依頁碼順序產生各頁職缺
+        
+        I/O 執行緒把 HTML 放進有上限的佇列，ProcessPoolExecutor 的解析行程把頁面
+        轉成職缺資料，呼叫端作為唯一的寫入者依頁碼順序取得結果。佇列與進行中
+        的解析工作都有上限，抓取速度超過解析速度時會自動暫停，記憶體用量維持平穩。
+        
+        Args:
+            keyword (str): 搜尋關鍵字
+            max_pages (int): 最大頁數
+            fetch_workers (int): 同時進行的請求數
+            parse_workers (int): 解析行程數，None 表示使用全部 CPU 核心
+            queue_size (int): 等待解析的頁面上限
+            seen_ids (set): 已收集的職缺 ID，用於跨頁、跨關鍵字去除重複
+        
+        Yields:
+            tuple: (頁數, 該頁新職缺列表)
+        """
+        parse_workers = parse_workers or os.cpu_count() or 1
+        if seen_ids is None:
+            seen_ids = set()
+        
+        pages = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        
+        def fetch_pages():
+            page_iter = self.iter_pages(keyword, max_pages, fetch_workers)
+            try:
+                for item in page_iter:
+                    # 佇列已滿時等待解析端消化，收到停止訊號就結束
+                    while not stop.is_set():
+                        try:
+                            pages.put(item, timeout=0.2)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        break
+            finally:
+                page_iter.close()
+                pages.put(None)
+        
+        with ProcessPoolExecutor(max_workers=parse_workers,
+                                 initializer=parse_worker.init_worker,
+                                 initargs=(self.parser, self.embedded_json)) as executor:
+            # 先讓解析行程啟動完成，再開始抓取的執行緒
+            executor.submit(parse_worker.warm_up).result()
+            fetcher = threading.Thread(target=fetch_pages, daemon=True)
+            fetcher.start()
+            
+            in_flight = deque()
+            fetch_done = False
+            
+            try:
+                while in_flight or not fetch_done:
+                    # 解析工作未滿且還有頁面時，繼續從佇列取出頁面送去解析
+                    if not fetch_done and len(in_flight) < parse_workers * 2:
+                        item = pages.get()
+                        if item is None:
+                            fetch_done = True
+                            continue
+                        page, html_content = item
+                        if not html_content:
+                            logger.warning("第 %d 頁爬取失敗", page)
+                            stop.set()
+                            fetch_done = True
+                            continue
+                        in_flight.append((page, executor.submit(parse_worker.parse_page, html_content)))
+                        continue
+                    
+                    # 依頁碼順序取出最早送出的解析結果
+                    page, future = in_flight.popleft()
+                    jobs, card_count, delta = future.result()
+                    self.metrics.merge(delta)
+                    if not card_count:
+                        logger.info("第 %d 頁沒有找到職缺", page)
+                        break
+                    
+                    new_jobs = []
+                    for job in jobs:
+                        job_id = html_backends.job_id_from_link(job.get('link'))
+                        if job_id is not None:
+                            if job_id in seen_ids:
+                                continue
+                            seen_ids.add(job_id)
+                        new_jobs.append(job)
+                    logger.info("第 %d 頁爬取完成，獲得 %d 個職缺", page, len(new_jobs))
+                    yield page, new_jobs
+            finally:
+                # 通知抓取執行緒停止，並清空佇列讓它不會卡在 put
+                stop.set()
+                for _, future in in_flight:
+                    future.cancel()
+                while fetcher.is_alive():
+                    try:
+                        pages.get(timeout=0.2)
+                    except queue.Empty:
+                        pass
+    
+    def iter_jobs(self, keyword="資料工程師", max_pages=3, concurrency=1, seen_ids=None,
+                  parse_workers=0):
+        """
+        串流爬取職缺：每解析完一頁就逐筆產生職缺資料，不在記憶體中累積
+        
+        Args:
+            keyword (str): 搜尋關鍵字
+            max_pages (int): 最大頁數
+            concurrency (int): 同時進行的請求數
+            seen_ids (set): 已收集的職缺 ID，用於跨頁、跨關鍵字去除重複
+            parse_workers (int): 大於 0 時改用管線模式，以此數量的行程解析頁面
+        
+        Yields:
+            dict: 職缺資訊（index 為本次爬取的連續編號）
+        """
+        index = 0
+        for _, jobs in self.iter_job_pages(keyword, max_pages, concurrency, seen_ids, parse_workers):
+            for job in jobs:
+                index += 1
+                job['index'] = index
+                yield job
+    
+    def crawl_to_files(self, keyword="資料工程師", max_pages=3, writers=(), concurrency=1,
+                       seen_ids=None, parse_workers=0):
+        """
+        爬取並逐頁寫入輸出檔案（CSV / JSONL 等），中途中斷也會保留已完成的頁面
+        
+        Args:
+            keyword (str): 搜尋關鍵字
+            max_pages (int): 最大頁數
+            writers (iterable): 具有 write(jobs) 方法的輸出器，例如 CsvJobWriter
+            concurrency (int): 同時進行的請求數
+            seen_ids (set): 已收集的職缺 ID，用於跨頁、跨關鍵字去除重複
+            parse_workers (int): 大於 0 時改用管線模式解析
+        
+        Returns:
+            int: 寫入的職缺數
+        """
+        total = 0
+        for _, jobs in self.iter_job_pages(keyword, max_pages, concurrency, seen_ids, parse_workers):
+            for job in jobs:
+                total += 1
+                job['index'] = total
+            for writer in writers:
+                writer.write(jobs)
+        
+        return total
+    
+    def crawl_incremental(self, keyword="資料工程師", max_pages=10, store=None, concurrency=1,
+                          writers=(), detail_concurrency=0):
+        """
+        增量爬取：搜尋結果依最新排序，遇到整頁都是已知職缺時停止翻頁
+        
+        每頁的職缺都會寫回 JobStore（新職缺記錄首次出現時間、既有職缺更新最後
+        出現時間、內容有變更時覆寫），只有新出現或內容變更的職缺會回傳並寫入 writers。
+        
+        Args:
+            keyword (str): 搜尋關鍵字
+            max_pages (int): 最多翻幾頁
+            store (JobStore): 職缺資料庫，None 表示使用 data/jobs.db
+            concurrency (int): 同時進行的請求數
+            writers (iterable): 具有 write(jobs) 方法的輸出器
+            detail_concurrency (int): 大於 0 時為新出現或內容變更的職缺抓取詳細頁
+        
+        Returns:
+            list: 新出現或內容變更的職缺
+        """
+        own_store = store is None
+        store = store or JobStore()
+        changed_jobs = []
+        
+        try:
+            for page, jobs in self.iter_job_pages(keyword, max_pages, concurrency):
+                records = [(html_backends.job_id_from_link(job.get('link')), job) for job in jobs]
+                records = [(job_id, job) for job_id, job in records if job_id is not None]
+                
+                # 寫入前先取得既有內容雜湊，用來判斷哪些職缺是新的或有變更
+                known = store.get_hashes(job_id for job_id, _ in records)
+                stats = store.upsert(records, keyword)
+                
+                page_changed = [job for job_id, job in records
+                                if known.get(job_id) != job_store.content_hash(job)]
+                for job in page_changed:
+                    job['index'] = len(changed_jobs) + 1
+                    changed_jobs.append(job)
+                if detail_concurrency > 0 and page_changed:
+                    self.crawl_details(page_changed, detail_concurrency, store)
+                for writer in writers:
+                    writer.write(page_changed)
+                
+                logger.info("第 %d 頁：新增 %d、更新 %d、未變更 %d",
+                            page, stats['inserted'], stats['updated'], stats['unchanged'])
+                
+                # 空白頁是搜尋結果的結尾；沒有職缺 ID 的頁面無法判斷是否已收錄，繼續翻頁
+                if not jobs:
+                    logger.info("第 %d 頁沒有職缺，停止翻頁", page)
+                    break
+                if records and len(known) == len(records):
+                    logger.info("第 %d 頁全部是已收錄的職缺，停止翻頁", page)
+                    break
+        finally:
+            if own_store:
+                store.close()
+        
+        return changed_jobs
+    
+    def iter_batch_pages(self, budgets, concurrency=1, stopped=None):
+        """
+        輪流排程多個關鍵字的頁面請求：先抓每個關鍵字的第 1 頁，再抓第 2 頁，依此類推
+        
+        所有請求共用同一個 session 與限速器，最多同時有 concurrency 個請求在進行。
+        呼叫端把關鍵字加入 stopped 後，該關鍵字不再排入新的頁面，已送出的請求結果也會略過。
+        
+        Args:
+            budgets (dict): 關鍵字 -> 最多爬取頁數
+            concurrency (int): 同時進行的請求數
+            stopped (set): 已停止的關鍵字，由呼叫端更新
+        
+        Yields:
+            tuple: (關鍵字, 頁數, HTML 內容)，抓取失敗時 HTML 內容為 None
+        """
+        stopped = set() if stopped is None else stopped
+        concurrency = max(concurrency, 1)
+        
+        def schedule():
+            # 每次取下一個請求時才檢查 stopped，已停止的關鍵字不會再排入
+            for page in range(1, max(budgets.values(), default=0) + 1):
+                for keyword, pages in budgets.items():
+                    if page <= pages and keyword not in stopped:
+                        yield keyword, page
+        
+        self.ensure_pool(concurrency)
+        slots = schedule()
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                while True:
+                    # 補滿請求視窗
+                    while len(pending) < concurrency:
+                        slot = next(slots, None)
+                        if slot is None:
+                            break
+                        keyword, page = slot
+                        pending.append((keyword, page, executor.submit(self.fetch_page, keyword, page)))
+                    if not pending:
+                        break
+                    
+                    keyword, page, future = pending.popleft()
+                    if keyword in stopped:
+                        future.cancel()
+                        continue
+                    yield keyword, page, future.result()
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+    
+    def crawl_batch(self, keywords, max_pages=3, concurrency=1, seen_ids=None):
+        """
+        批次爬取多個關鍵字：頁面請求輪流排程，結果依職缺 ID 合併
+        
+        同一個職缺出現在多個關鍵字的搜尋結果時只解析一次，matched_keywords 欄位
+        記錄所有搜尋到它的關鍵字（以 " | " 分隔，依搜尋到的先後排列）。
+        某個關鍵字遇到抓取失敗或沒有職缺的頁面時只停止該關鍵字。
+        
+        Args:
+            keywords (dict | list): 關鍵字 -> 頁數的 dict，或關鍵字 / (關鍵字, 頁數) 列表
+            max_pages (int): 列表中沒有指定頁數的關鍵字使用的頁數
+            concurrency (int): 同時進行的請求數
+            seen_ids (set): 已收集的職缺 ID，這些職缺不會再出現在結果中
+        
+        Returns:
+            list: 合併後的職缺資訊列表
+        """
+        if isinstance(keywords, dict):
+            budgets = dict(keywords)
+        else:
+            budgets = {}
+            for item in keywords:
+                if isinstance(item, str):
+                    budgets[item] = max_pages
+                else:
+                    budgets[item[0]] = item[1]
+        
+        if seen_ids is None:
+            seen_ids = set()
+        all_jobs = []
+        jobs_by_id = {}
+        stopped = set()
+        
+        for keyword, page, html_content in self.iter_batch_pages(budgets, concurrency, stopped):
+            if not html_content:
+                logger.warning("%s 第 %d 頁爬取失敗，停止此關鍵字", keyword, page)
+                stopped.add(keyword)
+                continue
+            
+            duplicate_ids = []
+            jobs, card_count = self.parse_page(html_content, seen_ids, duplicate_ids)
+            if not card_count:
+                logger.info("%s 第 %d 頁沒有找到職缺，停止此關鍵字", keyword, page)
+                stopped.add(keyword)
+                continue
+            
+            for job in jobs:
+                job['matched_keywords'] = [keyword]
+                job_id = html_backends.job_id_from_link(job.get('link'))
+                if job_id is not None:
+                    jobs_by_id[job_id] = job
+                all_jobs.append(job)
             
-            # 頁面間延遲
-            if page < max_pages:
-                time.sleep(random.uniform(2, 4))
+            # 其他關鍵字已收集過的職缺只補上關鍵字
+            for job_id in duplicate_ids:
+                job = jobs_by_id.get(job_id)
+                if job is not None and keyword not in job['matched_keywords']:
+                    job['matched_keywords'].append(keyword)
+            
+            logger.info("%s 第 %d 頁完成，新職缺 %d 個、重複 %d 個", keyword, page, len(jobs), len(duplicate_ids))
+        
+        for i, job in enumerate(all_jobs):
+            job['index'] = i + 1
+            job['matched_keywords'] = ' | '.join(job['matched_keywords'])
+        
+        return all_jobs
+    
+    def crawl_multiple_pages(self, keyword="資料工程師", max_pages=3, concurrency=1, seen_ids=None):
+        """
+        爬取多頁職缺資料
+        
+        Args:
+            keyword (str): 搜尋關鍵字
+            max_pages (int): 最大頁數
+            concurrency (int): 同時進行的請求數，大於 1 時改用限速器並行爬取
+            seen_ids (set): 已收集的職缺 ID；多個關鍵字共用同一個集合即可跨關鍵字去除重複
+        
+        Returns:
+            list: 所有職缺資訊列表
+        """
+        return list(self.iter_jobs(keyword, max_pages, concurrency, seen_ids))
+    
+    def crawl_pipeline(self, keyword="資料工程師", max_pages=3, fetch_workers=4,
+                       parse_workers=None, queue_size=8, seen_ids=None):
+        """
+        以管線方式爬取多頁（抓取與解析同時進行，詳見 iter_pipeline_pages）
+        
+        Args:
+            keyword (str): 搜尋關鍵字
+            max_pages (int): 最大頁數
+            fetch_workers (int): 同時進行的請求數
+            parse_workers (int): 解析行程數，None 表示使用全部 CPU 核心
+            queue_size (int): 等待解析的頁面上限
+            seen_ids (set): 已收集的職缺 ID，用於跨頁、跨關鍵字去除重複
+        
+        Returns:
+            list: 所有職缺資訊列表
+        """
+        all_jobs = []
+        for _, jobs in self.iter_pipeline_pages(keyword, max_pages, fetch_workers,
+                                                parse_workers, queue_size, seen_ids):
+            all_jobs.extend(jobs)
         
         # 重新編號
         for i, job in enumerate(all_jobs):
@@ -617,48 +1639,290 @@ class Job1111Crawler:
         return all_jobs
 
 
-def main():
-    """主程式"""
+def split_keywords(values):
+    """
+    整理關鍵字參數（每個參數可再以逗號或全形逗號分隔）
+    
+    Args:
+        values (list): 命令列上的關鍵字參數
+    
+    Returns:
+        list: 去除空白與重複後的關鍵字，保留原本順序
+    """
+    keywords = []
+    for value in values:
+        for keyword in value.replace('，', ',').split(','):
+            keyword = keyword.strip()
+            if keyword and keyword not in keywords:
+                keywords.append(keyword)
+    return keywords
+
+
+def build_arg_parser():
+    """
+    建立非互動模式的命令列參數
+    
+    Returns:
+        argparse.ArgumentParser: 參數解析器
+    """
+    parser = argparse.ArgumentParser(
+        description="1111 人力銀行職缺爬蟲（不帶參數執行時進入互動模式）")
+    parser.add_argument('keywords', nargs='*', default=["資料工程師"],
+                        help="搜尋關鍵字，可給多個或以逗號分隔，預設: 資料工程師")
+    parser.add_argument('-p', '--pages', type=int, default=1, help="每個關鍵字最多爬取的頁數")
+    parser.add_argument('-c', '--concurrency', type=int, default=1, help="同時請求數")
+    parser.add_argument('-f', '--format', nargs='+', dest='formats', default=['csv'],
+                        choices=list(OUTPUT_FORMATS) + [PARQUET_FORMAT], help="輸出格式，可指定多個")
+    parser.add_argument('-o', '--output-dir', help="CSV / JSONL 輸出目錄，預設 data/")
+    parser.add_argument('--parquet-dir', help="Parquet 資料集目錄，預設 data/parquet")
+    parser.add_argument('--details', type=int, nargs='?', const=4, default=0, metavar='N',
+                        help="抓取職缺詳細頁補齊要求條件，N 為同時請求數（預設 4）")
+    parser.add_argument('--incremental', nargs='?', const='', metavar='DB',
+                        help="增量爬取，只輸出新出現或內容變更的職缺；DB 預設 data/jobs.db")
+    parser.add_argument('--index', nargs='?', const='', metavar='DB',
+                        help="把本次取得的職缺加入倒排索引；DB 預設 data/job_index.db")
+    parser.add_argument('--rollup', nargs='?', const='', metavar='DB',
+                        help="把本次的輸出計入每日趨勢彙總（trend_rollups.py 查詢）；DB 預設 data/trends.db")
+    parser.add_argument('--parser', default='html.parser', choices=html_backends.PARSER_BACKENDS,
+                        help="HTML 解析後端")
+    parser.add_argument('--no-embedded-json', dest='embedded_json', action='store_false',
+                        help="不使用頁面內嵌的職缺 JSON，一律從 HTML 卡片擷取")
+    parser.add_argument('--rps', type=float, default=1.0, help="起始的每秒請求數")
+    parser.add_argument('--max-rps', type=float, metavar='RPS',
+                        help="自動調速的每秒請求數上限，回應正常時逐步加速到此值，預設與 --rps 相同（不會超過起始速率）")
+    parser.add_argument('--max-retries', type=int, default=3, help="暫時性錯誤最多重試次數")
+    parser.add_argument('--archive', nargs='?', const='', metavar='DIR',
+                        help="把取得的每個頁面壓縮封存，之後可用 page_archive.py reparse 重新解析；DIR 預設 data/archive")
+    parser.add_argument('--cache', metavar='DIR', help="搜尋結果快取目錄")
+    parser.add_argument('--offline', action='store_true', help="只讀快取、不連網（需搭配 --cache）")
+    parser.add_argument('--analyze', action='store_true', help="爬取後印出統計分析（需要 pandas）")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="爬取後以 MinHash / LSH 標記近似重複職缺（cluster_id），統計時每群只計一次")
+    parser.add_argument('--score', nargs='*', metavar='PROFILE',
+                        help="爬取後以 BM25 / TF-IDF 計算各設定檔的相關度（score_<設定檔> 欄位）；"
+                             f"不指定名稱時以搜尋關鍵字評分，內建：{', '.join(relevance.DEFAULT_PROFILES)}")
+    parser.add_argument('--profiles-file', metavar='JSON', help="自訂相關度設定檔")
+    parser.add_argument('--scoring', default='bm25', choices=relevance.SCORING_METHODS, help="相關度評分方法")
+    parser.add_argument('--metrics', metavar='PATH', help="把執行指標寫入檔案（.json 為 JSON，否則為 Prometheus 格式）")
+    parser.add_argument('-v', '--verbose', action='store_true', help="顯示每次請求與每頁卡片數等除錯訊息")
+    parser.add_argument('-q', '--quiet', action='store_true', help="只顯示警告與錯誤")
+    return parser
+
+
+def run(args):
+    """
+    依命令列參數爬取並輸出職缺，不需要任何互動輸入（可由排程器執行）
+    
+    Args:
+        args (argparse.Namespace): build_arg_parser() 解析後的參數
+    
+    Returns:
+        int: 結束代碼，沒有取得任何職缺時為 1，相關度設定檔不存在時為 2
+    """
+    keywords = split_keywords(args.keywords) or ["資料工程師"]
+    name = keywords[0] if len(keywords) == 1 else 'batch'
+    
+    # 相關度設定檔在爬取前先確認，避免爬完才發現名稱打錯
+    profiles = None
+    if args.score is not None:
+        available = relevance.load_profiles(args.profiles_file, keywords)
+        names = args.score or [relevance.KEYWORD_PROFILE]
+        unknown = [profile for profile in names if profile not in available]
+        if unknown:
+            logger.error("未知的相關度設定檔: %s", ', '.join(unknown))
+            return 2
+        profiles = {profile: available[profile] for profile in names}
+    
+    cache = ResponseCache(args.cache, offline=args.offline) if args.cache else None
+    archive = PageArchive(args.archive or None) if args.archive is not None else None
+    crawler = Job1111Crawler(requests_per_second=args.rps, cache=cache, parser=args.parser,
+                             max_retries=args.max_retries, max_requests_per_second=args.max_rps,
+                             embedded_json=args.embedded_json, archive=archive)
+    
+    paths = [(build_output_path(name, fmt, args.output_dir), writer_class)
+             for fmt, writer_class in OUTPUT_FORMATS.items() if fmt in args.formats]
+    # 近似重複分群與相關度評分需要整批職缺，啟用時在處理完後才寫檔（含 cluster_id 與
+    # score_* 欄位），否則逐頁寫入
+    deferred = args.dedupe or profiles is not None
+    # 只有後續步驟需要整批職缺時才保留在記憶體中，否則逐頁寫入後即丟棄
+    collect = (deferred or PARQUET_FORMAT in args.formats or args.index is not None or args.analyze
+               or (args.rollup is not None and not paths))
+    columns = COLUMN_ORDER + [relevance.SCORE_PREFIX + profile for profile in profiles] if profiles else None
+    jobs = []
+    count = 0
+    with contextlib.ExitStack() as stack:
+        writers = [stack.enter_context(writer_class(path, columns)) for path, writer_class in paths]
+        page_writers = [] if deferred else writers
+        if archive is not None:
+            stack.enter_context(archive)
+        
+        if args.incremental is not None:
+            # 增量爬取：已收錄且內容未變更的職缺不輸出
+            store = stack.enter_context(contextlib.closing(JobStore(args.incremental or None)))
+            for keyword in keywords:
+                for job in crawler.crawl_incremental(keyword, args.pages, store, args.concurrency,
+                                                     page_writers, args.details):
+                    count += 1
+                    job['index'] = count
+                    if collect:
+                        jobs.append(job)
+        elif len(keywords) > 1:
+            jobs = crawler.crawl_batch(keywords, args.pages, args.concurrency)
+            count = len(jobs)
+            if jobs and args.details:
+                crawler.crawl_details(jobs, args.details)
+            for writer in page_writers:
+                writer.write(jobs)
+        else:
+            # 每完成一頁就寫入，中途中斷也保留已爬取的資料
+            for _, page_jobs in crawler.iter_job_pages(name, args.pages, args.concurrency):
+                for job in page_jobs:
+                    count += 1
+                    job['index'] = count
+                if collect:
+                    jobs.extend(page_jobs)
+                if args.details:
+                    crawler.crawl_details(page_jobs, args.details)
+                for writer in page_writers:
+                    writer.write(page_jobs)
+        
+        if jobs and args.dedupe:
+            clusters = near_duplicates.assign_clusters(jobs)
+            logger.info("近似重複：%d 筆職缺分成 %d 群", len(jobs), clusters)
+        if jobs and profiles:
+            # 整批職缺共用詞彙表與 IDF，一次計算所有設定檔的分數
+            score_columns = relevance.score_jobs(jobs, profiles, args.scoring)
+            logger.info("相關度評分（%s）：%s", args.scoring, ', '.join(score_columns))
+        if deferred:
+            for writer in writers:
+                writer.write(jobs)
+    
+    for path, _ in paths:
+        if count:
+            logger.info("已儲存 %d 筆職缺資料到 %s", count, path)
+        else:
+            os.remove(path)
+    if jobs and PARQUET_FORMAT in args.formats:
+        crawler.save_to_parquet(jobs, name, args.parquet_dir)
+    if jobs and args.index is not None:
+        with JobIndex(args.index or None) as index:
+            stats = index.add_jobs(jobs)
+            logger.info("索引更新：新增 %d、更新 %d、未變更 %d，共 %d 個職缺",
+                        stats['added'], stats['updated'], stats['unchanged'], index.count())
+    if count and args.rollup is not None:
+        # 有輸出檔時以檔案彙總（日期取自檔名，之後 trend_rollups.py build 不會重複處理）
+        with TrendStore(args.rollup or None) as store:
+            if paths:
+                stats = store.add_files([path for path, _ in paths])
+            else:
+                stats = store.add_jobs(jobs, keyword=None if name == 'batch' else name)
+            logger.info("趨勢彙總：新計入 %d 個職缺，當天已計入 %d 個", stats['new'], stats['seen'])
+    if jobs and args.analyze:
+        crawler.analyze_jobs(jobs, dedupe=args.dedupe)
+    if args.metrics:
+        crawler.metrics.export(args.metrics)
+    
+    if not count:
+        logger.warning("沒有找到任何職缺資料")
+        return 1
+    logger.info("爬取完成！共獲得 %d 個職缺資料", count)
+    return 0
+
+
+def interactive():
+    """互動模式：依提示輸入關鍵字、頁數與同時請求數"""
     print("1111 人力銀行職缺爬蟲")
     print("=" * 50)
     
     # 建立爬蟲實例
     crawler = Job1111Crawler()
     
-    # 設定搜尋參數
-    keyword = input("請輸入搜尋關鍵字 (預設: 資料工程師): ").strip() or "資料工程師"
+    # 設定搜尋參數（多個關鍵字以逗號分隔）
+    keyword = input("請輸入搜尋關鍵字，多個以逗號分隔 (預設: 資料工程師): ").strip() or "資料工程師"
+    keywords = [k.strip() for k in keyword.replace('，', ',').split(',') if k.strip()]
     
     try:
         max_pages = int(input("請輸入要爬取的頁數 (預設: 1): ").strip() or "1")
     except ValueError:
         max_pages = 1
     
+    try:
+        concurrency = int(input("請輸入同時請求數 (預設: 1): ").strip() or "1")
+    except ValueError:
+        concurrency = 1
+    
+    fetch_details = input("是否抓取職缺詳細頁補齊要求條件？(y/N): ").strip().lower() == 'y'
+    
     # 開始爬取
     print(f"開始搜尋 '{keyword}' 相關職缺...")
     
-    if max_pages == 1:
+    if len(keywords) > 1:
+        # 多個關鍵字：共用 session 與限速器輪流爬取，合併重複職缺
+        jobs = crawler.crawl_batch(keywords, max_pages, concurrency)
+        if jobs and fetch_details:
+            crawler.crawl_details(jobs, max(concurrency, 1))
+        if jobs:
+            crawler.save_to_csv(jobs, 'batch')
+    elif max_pages == 1:
         # 單頁爬取
         html_content = crawler.search_jobs(keyword)
         if html_content:
             jobs = crawler.parse_jobs(html_content)
         else:
             jobs = []
+        if jobs and fetch_details:
+            crawler.crawl_details(jobs, max(concurrency, 1))
+        
+        if jobs:
+            # 儲存檔案（檔名包含日期時間）
+            crawler.save_to_csv(jobs, keyword)
     else:
-        # 多頁爬取
-        jobs = crawler.crawl_multiple_pages(keyword, max_pages)
+        # 多頁爬取：每完成一頁就寫入 CSV，中途中斷也保留已爬取的資料
+        filename = build_output_path(keyword, 'csv')
+        jobs = []
+        with CsvJobWriter(filename) as writer:
+            for page, page_jobs in crawler.iter_job_pages(keyword, max_pages, concurrency):
+                for job in page_jobs:
+                    job['index'] = len(jobs) + 1
+                    jobs.append(job)
+                if fetch_details:
+                    crawler.crawl_details(page_jobs, max(concurrency, 1))
+                writer.write(page_jobs)
+        if jobs:
+            print(f"已儲存 {len(jobs)} 筆職缺資料到 {filename}")
+        else:
+            os.remove(filename)
     
     if jobs:
         # 統計分析
         crawler.analyze_jobs(jobs)
         
-        # 儲存檔案（檔名包含日期時間）
-        df = crawler.save_to_csv(jobs, keyword)
-        
         print(f"爬取完成！共獲得 {len(jobs)} 個職缺資料")
         
     else:
         print("沒有找到任何職缺資料")
 
 
+def main(argv=None):
+    """
+    主程式：帶參數時以非互動模式執行，不帶參數時進入互動模式
+    
+    Returns:
+        int: 結束代碼
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    
+    if not argv:
+        # 進度與錯誤訊息經由 logging 輸出；INFO 以上的訊息照原本的格式顯示在終端機
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        interactive()
+        return 0
+    
+    args = build_arg_parser().parse_args(argv)
+    level = logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO
+    logging.basicConfig(level=level, format='%(asctime)s %(levelname)s %(message)s')
+    return run(args)
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,422 @@
+import argparse
+import contextlib
+import csv
+import gc
+import glob
+import html
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import html_backends
+import parse_worker
+from job_writers import DATA_DIR
+
+# 基準結果與預設語料目錄
+BENCHMARK_DIR = os.path.join(DATA_DIR, 'benchmark')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_CORPUS = os.path.join(BENCHMARK_DIR, 'pages')
+
+# 語料檔案副檔名（.body 為 ResponseCache 保存的回應內容，可直接當作語料）
+CORPUS_EXTENSIONS = ('.html', '.htm', '.body')
+
+# 合成頁面的卡片數
+SYNTHETIC_SIZES = [20, 200, 500]
+
+# 個別計時的解析方法（時間為包含內部呼叫的總時間）
+TIMED_METHODS = [
+    'select_job_records',
+    'select_job_cards',
+    'extract_job_from_card',
+    'extract_job_from_record',
+    'extract_industry',
+    'extract_requirements',
+    'calculate_relevance_score',
+]
+
+# 以內嵌 JSON 解析時的結果名稱（與解析後端無關）
+EMBEDDED_JSON_LABEL = 'embedded-json'
+
+# 與基準比較的指標：數值越大越差
+COMPARED_METRICS = ['seconds_per_card', 'peak_memory_bytes']
+
+SYNTHETIC_CARD = '''<div class="job-card">
+  <div class="job-card-header"><span class="date">{date}</span>
+  <a class="title" href="/job/{job_id}" title="{title}">{title}</a></div>
+  <a class="company-name" href="/corp/{index}">{company}</a>
+  <span class="tag">{industry}</span>
+  <div class="job-card-condition">{location} | {salary} | {conditions}</div>
+  <div class="job-summary">{summary}</div>
+</div>
+'''
+
+
+def load_corpus(path=None):
+    """
+    讀取語料目錄中的搜尋結果頁（遞迴尋找 .html / .htm / .body）
+    
+    Args:
+        path (str): 語料目錄，None 表示使用 data/benchmark/pages
+    
+    Returns:
+        list: (名稱, HTML 內容) 列表，依檔名排序
+    """
+    path = path or DEFAULT_CORPUS
+    pages = []
+    for file_path in sorted(glob.glob(os.path.join(path, '**', '*'), recursive=True)):
+        if not file_path.endswith(CORPUS_EXTENSIONS):
+            continue
+        with open(file_path, encoding='utf-8', errors='replace') as f:
+            pages.append((os.path.relpath(file_path, path), f.read()))
+    return pages
+
+
+def load_sample_rows(pattern=None):
+    """
+    從歷史 CSV 讀取職缺資料，作為合成頁面的內容
+    
+    Args:
+        pattern (str): CSV glob，None 表示 data/*.csv
+    
+    Returns:
+        list: 職缺資料 dict 列表
+    """
+    rows = []
+    for file_path in sorted(glob.glob(pattern or os.path.join(DATA_DIR, '*.csv'))):
+        with open(file_path, encoding='utf-8-sig', newline='') as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def synthetic_page(rows, n_cards, seed=0, embedded=False):
+    """
+    以歷史職缺資料組出一頁搜尋結果（卡片結構與 1111 搜尋頁相同）
+    
+    Args:
+        rows (list): 職缺資料 dict 列表
+        n_cards (int): 卡片數
+        seed (int): 亂數種子，相同種子產生相同頁面
+        embedded (bool): 是否同時以 __NEXT_DATA__ 內嵌相同職缺的 JSON（伺服器端繪製的頁面狀態）
+    
+    Returns:
+        str: HTML 內容
+    """
+    rnd = random.Random(seed)
+    cards = []
+    state = []
+    for i in range(n_cards):
+        row = rnd.choice(rows) if rows else {}
+        conditions = row.get('conditions') or ' | '.join(
+            row.get(field, '') for field in ('education', 'experience', 'department', 'language')
+            if row.get(field) and row.get(field) != 'N/A'
+        )
+        fields = {
+            'job_id': 100000000 + seed * 10000 + i,
+            'index': i,
+            'date': row.get('publish_date', '') or '10/30',
+            'title': row.get('title', '') or '資料工程師',
+            'company': row.get('company', '') or 'N/A',
+            'industry': row.get('industry', '') or '資訊軟體業',
+            'location': row.get('location', '') or '',
+            'salary': row.get('salary', '') or '',
+            'conditions': conditions,
+            'summary': row.get('summary', '') or '',
+        }
+        cards.append(SYNTHETIC_CARD.format(**{
+            key: html.escape(str(value)) for key, value in fields.items()
+        }))
+        state.append({
+            'jobId': fields['job_id'],
+            'title': fields['title'],
+            'companyName': fields['company'],
+            'industry': fields['industry'],
+            'city': fields['location'],
+            'salary': fields['salary'],
+            'education': row.get('education', ''),
+            'department': row.get('department', ''),
+            'experience': row.get('experience', ''),
+            'language': row.get('language', ''),
+            'skills': row.get('skills', ''),
+            'publishDate': fields['date'],
+            'description': fields['summary'],
+        })
+    script = '<script>window.__STATE__ = {};</script>'
+    if embedded:
+        payload = json.dumps({'props': {'pageProps': {'jobs': {'list': state}}}}, ensure_ascii=False)
+        script += ('<script id="__NEXT_DATA__" type="application/json">'
+                   + payload.replace('</', '<\\/') + '</script>')
+    return ('<!DOCTYPE html><html><head><title>1111 人力銀行</title>'
+            + script + '</head><body>'
+            '<nav class="nav">職缺搜尋</nav><div class="search-result job-list">'
+            + ''.join(cards) +
+            '</div><footer>1111 人力銀行</footer></body></html>')
+
+
+def synthetic_pages(sizes=None, seed=0, embedded=False):
+    """
+    產生各種卡片數的合成頁面
+    
+    Args:
+        sizes (list): 每頁卡片數，None 表示使用 SYNTHETIC_SIZES
+        seed (int): 亂數種子
+        embedded (bool): 是否同時內嵌職缺 JSON
+    
+    Returns:
+        list: (名稱, HTML 內容) 列表
+    """
+    rows = load_sample_rows()
+    return [(f"synthetic-{n}", synthetic_page(rows, n, seed + i, embedded))
+            for i, n in enumerate(sizes or SYNTHETIC_SIZES)]
+
+
+@contextlib.contextmanager
+def timed_methods(crawler, names=TIMED_METHODS):
+    """
+    暫時以計時包裝取代爬蟲實例的方法
+    
+    Args:
+        crawler (Job1111Crawler): 爬蟲實例
+        names (list): 要計時的方法名稱
+    
+    Yields:
+        dict: 方法名稱 -> {'calls': 呼叫次數, 'seconds': 累計秒數}
+    """
+    stats = {name: {'calls': 0, 'seconds': 0.0} for name in names}
+    
+    def wrap(name, method):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats[name]['calls'] += 1
+                stats[name]['seconds'] += time.perf_counter() - started
+        return timed
+    
+    for name in names:
+        setattr(crawler, name, wrap(name, getattr(crawler, name)))
+    try:
+        yield stats
+    finally:
+        for name in names:
+            delattr(crawler, name)
+
+
+def run_benchmark(crawler, pages, repeat=3, label=None):
+    """
+    量測一組頁面的解析效能
+    
+    Args:
+        crawler (Job1111Crawler): 爬蟲實例（只用來解析，不發出請求）
+        pages (list): (名稱, HTML 內容) 列表
+        repeat (int): 每頁重複解析次數，取最快的一次
+        label (str): 結果名稱（基準檔的鍵），None 表示使用解析後端名稱
+    
+    Returns:
+        dict: 吞吐量、記憶體高峰與各方法耗時
+    """
+    per_page = []
+    # 解析過程的訊息不列入量測
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, html_content in pages:
+            best = None
+            for _ in range(max(repeat, 1)):
+                started = time.perf_counter()
+                jobs, card_count = crawler.parse_page(html_content)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            per_page.append({
+                'name': name,
+                'bytes': len(html_content.encode('utf-8')),
+                'cards': card_count,
+                'jobs': len(jobs),
+                'seconds': best,
+            })
+        
+        with timed_methods(crawler) as functions:
+            for _, html_content in pages:
+                crawler.parse_page(html_content)
+        
+        # tracemalloc 會拖慢執行，記憶體高峰另外量測；
+        # BeautifulSoup 文件樹有循環參照，每頁前先回收，避免前一頁的垃圾計入高峰
+        peak = 0
+        tracemalloc.start()
+        try:
+            for _, html_content in pages:
+                gc.collect()
+                tracemalloc.reset_peak()
+                crawler.parse_page(html_content)
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    
+    seconds = sum(page['seconds'] for page in per_page)
+    cards = sum(page['cards'] for page in per_page)
+    return {
+        'parser': label or crawler.parser,
+        'pages': len(per_page),
+        'cards': cards,
+        'seconds': seconds,
+        'pages_per_second': len(per_page) / seconds if seconds else 0.0,
+        'cards_per_second': cards / seconds if seconds else 0.0,
+        'seconds_per_card': seconds / cards if cards else 0.0,
+        'peak_memory_bytes': peak,
+        'functions': functions,
+        'per_page': per_page,
+    }
+
+
+def compare_with_baseline(result, baseline, threshold=0.25):
+    """
+    與基準結果比較，找出變差超過門檻的指標
+    
+    Args:
+        result (dict): run_benchmark 的結果
+        baseline (dict): 同一解析後端的基準結果
+        threshold (float): 容許變差的比例，例如 0.25 表示 25%
+    
+    Returns:
+        list: (指標, 基準值, 目前值, 變化比例) 列表，只包含超過門檻的指標
+    """
+    regressions = []
+    for metric in COMPARED_METRICS:
+        before = baseline.get(metric)
+        after = result.get(metric)
+        if not before or after is None:
+            continue
+        change = after / before - 1
+        if change > threshold:
+            regressions.append((metric, before, after, change))
+    return regressions
+
+
+def load_baseline(path=None):
+    """
+    讀取基準結果檔
+    
+    Args:
+        path (str): 基準檔路徑，None 表示 data/benchmark/baseline.json
+    
+    Returns:
+        dict: 解析後端 -> 基準結果，檔案不存在時為空 dict
+    """
+    path = path or DEFAULT_BASELINE
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=None):
+    """
+    把本次結果存為基準（只更新本次有量測的解析後端）
+    
+    Args:
+        results (list): run_benchmark 的結果列表
+        path (str): 基準檔路徑，None 表示 data/benchmark/baseline.json
+    """
+    path = path or DEFAULT_BASELINE
+    baseline = load_baseline(path)
+    for result in results:
+        baseline[result['parser']] = {
+            key: value for key, value in result.items() if key != 'per_page'
+        }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+def print_result(result):
+    """印出單一解析後端的量測結果"""
+    print(f"\n解析後端: {result['parser']}")
+    print("=" * 50)
+    for page in result['per_page']:
+        print(f"   {page['name']}: {page['cards']} 張卡片, {page['seconds'] * 1000:.1f} ms")
+    print(f"每秒頁數: {result['pages_per_second']:.2f}")
+    print(f"每秒卡片數: {result['cards_per_second']:.1f}")
+    print(f"每張卡片: {result['seconds_per_card'] * 1e6:.0f} µs")
+    print(f"記憶體高峰: {result['peak_memory_bytes'] / 1024 / 1024:.2f} MB")
+    print(f"各方法耗時（含內部呼叫）:")
+    for name, stats in result['functions'].items():
+        per_call = stats['seconds'] / stats['calls'] * 1e6 if stats['calls'] else 0
+        print(f"   {name}: {stats['calls']} 次, 共 {stats['seconds'] * 1000:.1f} ms, 每次 {per_call:.0f} µs")
+
+
+def main(argv=None):
+    """
+    離線解析效能測試
+    
+    Returns:
+        int: 結束代碼，有指標變差超過門檻時為 1
+    """
+    parser = argparse.ArgumentParser(description="1111 搜尋結果頁解析效能測試（離線執行）")
+    parser.add_argument('--corpus', help="搜尋結果頁語料目錄（.html / .htm / .body），預設 data/benchmark/pages")
+    parser.add_argument('--sizes', type=int, nargs='*', default=SYNTHETIC_SIZES,
+                        help="合成頁面的卡片數，不給值表示不使用合成頁面")
+    parser.add_argument('--parser', nargs='*', dest='parsers',
+                        help="要量測的解析後端，預設為所有已安裝的後端")
+    parser.add_argument('--embedded-json', action='store_true',
+                        help="合成頁面同時內嵌職缺 JSON，比較 HTML 擷取與 JSON 解析（HTML 路徑停用 JSON）")
+    parser.add_argument('--repeat', type=int, default=3, help="每頁重複解析次數，取最快的一次")
+    parser.add_argument('--baseline', help="基準結果檔，預設 data/benchmark/baseline.json")
+    parser.add_argument('--save-baseline', action='store_true', help="把本次結果存為基準")
+    parser.add_argument('--threshold', type=float, default=0.25, help="容許變差的比例")
+    parser.add_argument('--json', help="把完整結果寫入 JSON 檔")
+    args = parser.parse_args(argv)
+    
+    pages = load_corpus(args.corpus)
+    if args.sizes:
+        pages += synthetic_pages(args.sizes, embedded=args.embedded_json)
+    if not pages:
+        print("沒有可量測的頁面")
+        return 1
+    print(f"量測 {len(pages)} 個頁面")
+    
+    parsers = args.parsers or [name for name in html_backends.PARSER_BACKENDS
+                               if html_backends.is_available(name)]
+    module = parse_worker.load_crawler_module()
+    results = []
+    for name in parsers:
+        with contextlib.redirect_stdout(io.StringIO()):
+            crawler = module.Job1111Crawler(parser=name, embedded_json=not args.embedded_json)
+        result = run_benchmark(crawler, pages, args.repeat)
+        print_result(result)
+        results.append(result)
+    
+    if args.embedded_json:
+        # 同一批頁面改由內嵌 JSON 解析
+        crawler = module.Job1111Crawler(embedded_json=True)
+        result = run_benchmark(crawler, pages, args.repeat, EMBEDDED_JSON_LABEL)
+        print_result(result)
+        results.append(result)
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\n已儲存基準結果到 {args.baseline or DEFAULT_BASELINE}")
+        return 0
+    
+    baseline = load_baseline(args.baseline)
+    failed = False
+    for result in results:
+        if result['parser'] not in baseline:
+            continue
+        regressions = compare_with_baseline(result, baseline[result['parser']], args.threshold)
+        for metric, before, after, change in regressions:
+            print(f"效能變差 [{result['parser']}] {metric}: {before:.6g} -> {after:.6g} (+{change * 100:.1f}%)")
+        failed = failed or bool(regressions)
+    
+    if baseline and not failed:
+        print(f"\n與基準比較：沒有超過 {args.threshold * 100:.0f}% 的變差")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import html
+import json
+import re
+
+# 頁面中的 <script> 區塊（屬性, 內容）
+SCRIPT_RE = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.S | re.I)
+
+# 內容為 JSON 的 script：Next.js 的 __NEXT_DATA__、application/json、schema.org 的 ld+json
+JSON_SCRIPT_ATTR_RE = re.compile(
+    r'''id\s*=\s*["']__NEXT_DATA__["']|type\s*=\s*["']application/(?:ld\+)?json["']''', re.I
+)
+
+# 以 window.__XXX__ = {...} 指定的頁面狀態（只有內容是合法 JSON 時才能解析）
+STATE_ASSIGNMENT_RE = re.compile(r'^\s*window\.__\w+__\s*=\s*(.*?)\s*;?\s*$', re.S)
+
+# 描述文字中的 HTML 標籤與連續空白
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+# 摘要長度與 HTML 路徑相同
+SUMMARY_LENGTH = 200
+
+# 各欄位在 JSON 中可能的鍵（依序嘗試，可用「.」表示巢狀鍵）
+FIELD_KEYS = {
+    'title': ('title', 'jobName', 'job_name', 'jobTitle', 'position'),
+    'link': ('url', 'link', 'jobUrl', 'job_url', 'href'),
+    'company': ('companyName', 'company_name', 'corpName', 'company.name',
+                'hiringOrganization.name', 'company'),
+    'industry': ('industry', 'industryName', 'company.industry', 'corpIndustry', 'hiringOrganization.industry'),
+    'location': ('location', 'workCity', 'city', 'area', 'address',
+                 'jobLocation.address.addressRegion', 'jobLocation.address.addressLocality'),
+    'salary': ('salary', 'salaryDesc', 'salaryText', 'salary_text', 'baseSalary'),
+    'education': ('education', 'educationRequirements', 'eduName', 'degree'),
+    'department': ('department', 'major', 'majorName', 'departmentRequirements'),
+    'experience': ('experience', 'experienceRequirements', 'workExp', 'workExperience'),
+    'language': ('language', 'languageRequirements', 'languages'),
+    'skills': ('skills', 'skill', 'tools', 'skillNames'),
+    'additional': ('additional', 'otherRequirements', 'qualifications'),
+    'publish_date': ('publishDate', 'publish_date', 'datePosted', 'updateDate', 'date'),
+    'summary': ('summary', 'description', 'jobDescription', 'job_description'),
+}
+
+# 職缺 ID 可能的鍵，沒有連結時以 ID 組出 /job/<id>
+ID_KEYS = ('jobId', 'job_id', 'jobNo', 'eNo', 'id', 'identifier.value')
+
+# 判斷是否為職缺時，除了標題與 ID / 連結之外至少要有其中一個欄位（排除選單、分類等列表）
+EVIDENCE_FIELDS = ('company', 'salary', 'location', 'industry', 'education', 'experience')
+
+# schema.org 薪資單位
+SALARY_UNITS = {'MONTH': '月薪', 'YEAR': '年薪', 'HOUR': '時薪', 'DAY': '日薪'}
+
+
+def iter_payloads(html_content):
+    """
+    找出頁面中內嵌的 JSON 資料（不建立 DOM，直接以正規表示式掃描 script）
+    
+    Args:
+        html_content (str): HTML 內容
+    
+    Yields:
+        dict | list: 解析後的 JSON；無法解析的 script 略過
+    """
+    if '<script' not in html_content and '<SCRIPT' not in html_content:
+        return
+    for match in SCRIPT_RE.finditer(html_content):
+        attributes, body = match.groups()
+        if JSON_SCRIPT_ATTR_RE.search(attributes):
+            text = body
+        else:
+            assignment = STATE_ASSIGNMENT_RE.match(body)
+            if not assignment:
+                continue
+            text = assignment.group(1)
+        try:
+            yield json.loads(text)
+        except ValueError:
+            continue
+
+
+def lookup(item, key):
+    """以「a.b.c」取出巢狀鍵的值，任何一層不存在時返回 None"""
+    value = item
+    for part in key.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def first_value(item, keys):
+    """依序嘗試各個鍵，返回第一個不是空值的值"""
+    for key in keys:
+        value = lookup(item, key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def looks_like_job(item):
+    """判斷 JSON 物件是否為一筆職缺（有標題、有 ID 或連結，且有公司、薪資、地點等任一欄位）"""
+    if not isinstance(item, dict):
+        return False
+    if item.get('@type') == 'JobPosting':
+        return True
+    title = first_value(item, FIELD_KEYS['title'])
+    if not isinstance(title, str):
+        return False
+    if first_value(item, ID_KEYS) is None and first_value(item, FIELD_KEYS['link']) is None:
+        return False
+    return any(first_value(item, FIELD_KEYS[field]) is not None for field in EVIDENCE_FIELDS)
+
+
+def find_job_lists(payload):
+    """
+    走訪 JSON，找出由職缺物件組成的列表
+    
+    Args:
+        payload (dict | list): 內嵌的 JSON
+    
+    Returns:
+        list: 職缺物件列表的列表；schema.org 中零散的 JobPosting 合併為一個列表
+    """
+    found = []
+    postings = []
+    stack = [payload]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, list):
+            if value and sum(looks_like_job(item) for item in value) * 2 > len(value):
+                found.append([item for item in value if looks_like_job(item)])
+                continue
+            stack.extend(reversed(value))
+        elif isinstance(value, dict):
+            if value.get('@type') == 'JobPosting':
+                postings.append(value)
+                continue
+            stack.extend(reversed(list(value.values())))
+    if postings:
+        found.append(postings)
+    return found
+
+
+def format_value(value):
+    """把 JSON 值轉成與 HTML 路徑相同的文字（列表以逗號合併、物件取 name）"""
+    if isinstance(value, str):
+        return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', value))).strip()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, list):
+        return ', '.join(filter(None, (format_value(item) for item in value)))
+    if isinstance(value, dict):
+        for key in ('name', 'text', 'description', 'addressRegion'):
+            if isinstance(value.get(key), str):
+                return format_value(value[key])
+    return ''
+
+
+def format_salary(value):
+    """把 schema.org 的 MonetaryAmount 轉成「月薪 40,000~60,000元」格式，其他值直接轉成文字"""
+    if not isinstance(value, dict) or not isinstance(value.get('value'), dict):
+        return format_value(value)
+    amount = value['value']
+    low, high = amount.get('minValue'), amount.get('maxValue', amount.get('value'))
+    unit = SALARY_UNITS.get(str(amount.get('unitText', '')).upper(), '')
+    numbers = [f"{int(number):,}" for number in (low, high) if isinstance(number, (int, float))]
+    if not numbers:
+        return ''
+    return f"{unit} {'~'.join(dict.fromkeys(numbers))}元".strip()
+
+
+def normalize_record(item, base_url):
+    """
+    把一筆 JSON 職缺轉成與 HTML 路徑相同的欄位（值都是文字，找不到的欄位不會出現）
+    
+    Args:
+        item (dict): JSON 職缺物件
+        base_url (str): 網站根網址，用來補全相對連結或以 ID 組出連結
+    
+    Returns:
+        dict: 欄位 -> 文字
+    """
+    record = {}
+    for field, keys in FIELD_KEYS.items():
+        value = first_value(item, keys)
+        if value is None:
+            continue
+        text = format_salary(value) if field == 'salary' else format_value(value)
+        if text:
+            record[field] = text
+    
+    link = record.get('link')
+    if link and not link.startswith('http'):
+        record['link'] = base_url + '/' + link.lstrip('/')
+    elif not link:
+        job_id = first_value(item, ID_KEYS)
+        if job_id is not None:
+            record['link'] = f"{base_url}/job/{format_value(job_id)}"
+    if 'summary' in record:
+        record['summary'] = record['summary'][:SUMMARY_LENGTH]
+    return record
+
+
+def find_job_records(html_content, base_url):
+    """
+    從頁面內嵌的 JSON 取出職缺資料
+    
+    Args:
+        html_content (str): 搜尋結果頁 HTML
+        base_url (str): 網站根網址
+    
+    Returns:
+        list: normalize_record 的結果列表；頁面沒有內嵌職缺資料時為空列表
+    """
+    best = []
+    for payload in iter_payloads(html_content):
+        for jobs in find_job_lists(payload):
+            if len(jobs) > len(best):
+                best = jobs
+    records = [normalize_record(item, base_url) for item in best]
+    return [record for record in records if record.get('title')]
@@ -0,0 +1,245 @@
+import importlib.util
+import logging
+import re
+
+logger = logging.getLogger('job1111.html_backends')
+
+# 可選用的 HTML 解析後端
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+# 各後端需要的第三方套件
+BACKEND_MODULES = {
+    'lxml': 'lxml',
+    'selectolax': 'selectolax',
+}
+
+# 職缺卡片的 class 名稱
+CARD_CLASSES = frozenset(['job-card', 'job-list-item'])
+
+# 職缺連結與其中的數字 ID（/job/<id>）
+JOB_LINK_RE = re.compile(r'/job/')
+JOB_ID_RE = re.compile(r'/job/(\d+)')
+
+
+def is_card_class(class_value):
+    """判斷 class 屬性是否包含職缺卡片的 class（供 SoupStrainer 使用）"""
+    if not class_value:
+        return False
+    if isinstance(class_value, str):
+        class_value = class_value.split()
+    return not CARD_CLASSES.isdisjoint(class_value)
+
+
+_card_strainer = None
+
+
+def card_strainer():
+    """只建立職缺卡片子樹的 SoupStrainer（第一次解析時才載入 bs4）"""
+    global _card_strainer
+    if _card_strainer is None:
+        from bs4 import SoupStrainer
+        _card_strainer = SoupStrainer(class_=is_card_class)
+    return _card_strainer
+
+
+def is_available(backend):
+    """
+    檢查解析後端需要的套件是否已安裝
+    
+    Args:
+        backend (str): 後端名稱
+    
+    Returns:
+        bool: 是否可用
+    """
+    module = BACKEND_MODULES.get(backend)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def resolve_backend(backend):
+    """
+    檢查並決定實際使用的解析後端，套件未安裝時退回 html.parser
+    
+    Args:
+        backend (str): 指定的後端名稱
+    
+    Returns:
+        str: 實際使用的後端名稱
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"不支援的解析後端: {backend}，可用: {', '.join(PARSER_BACKENDS)}")
+    if not is_available(backend):
+        logger.warning("未安裝 %s，改用 html.parser", BACKEND_MODULES[backend])
+        return 'html.parser'
+    return backend
+
+
+def soup_parser(backend):
+    """
+    取得 BeautifulSoup 使用的 tree builder 名稱
+    
+    selectolax 只負責定位卡片，卡片內容仍交給 BeautifulSoup 擷取，
+    因此優先使用 lxml 建立卡片片段。
+    """
+    if backend == 'selectolax':
+        return 'lxml' if is_available('lxml') else 'html.parser'
+    return backend
+
+
+def parse_cards(html_content, backend='html.parser'):
+    """
+    只解析 .job-card / .job-list-item 子樹並回傳卡片元素
+    
+    Args:
+        html_content (str): 搜尋結果頁 HTML
+        backend (str): 解析後端
+    
+    Returns:
+        list: BeautifulSoup 職缺卡片元素，找不到時為空列表
+    """
+    if backend == 'selectolax':
+        return _parse_cards_selectolax(html_content)
+    
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html_content, backend, parse_only=card_strainer())
+    job_cards = soup.select('.job-card')
+    if not job_cards:
+        job_cards = soup.select('.job-list-item')
+    return job_cards
+
+
+def _parse_cards_selectolax(html_content):
+    """以 lexbor 引擎定位卡片，再把每張卡片的片段交給 BeautifulSoup"""
+    from bs4 import BeautifulSoup
+    from selectolax.lexbor import LexborHTMLParser
+    
+    tree = LexborHTMLParser(html_content)
+    nodes = tree.css('.job-card')
+    if not nodes:
+        nodes = tree.css('.job-list-item')
+    
+    builder = soup_parser('selectolax')
+    job_cards = []
+    for node in nodes:
+        fragment = BeautifulSoup(node.html, builder)
+        job_cards.append(fragment.find(class_=is_card_class))
+    return job_cards
+
+
+def parse_document(html_content, backend='html.parser'):
+    """
+    解析完整頁面（卡片選擇器都找不到時的後備方案）
+    
+    Args:
+        html_content (str): 搜尋結果頁 HTML
+        backend (str): 解析後端
+    
+    Returns:
+        BeautifulSoup: 完整文件樹
+    """
+    from bs4 import BeautifulSoup
+    
+    return BeautifulSoup(html_content, soup_parser(backend))
+
+
+def job_id_from_link(link):
+    """
+    從職缺連結取出數字 ID
+    
+    Args:
+        link (str): 職缺連結，例如 https://www.1111.com.tw/job/132096607
+    
+    Returns:
+        str: 職缺 ID，連結不含數字 ID 時返回 None
+    """
+    match = JOB_ID_RE.search(link or '')
+    return match.group(1) if match else None
+
+
+def card_job_id(card):
+    """
+    取得卡片第一個職缺連結中的數字 ID（與標題連結相同）
+    
+    Args:
+        card: BeautifulSoup 職缺卡片元素
+    
+    Returns:
+        str: 職缺 ID，沒有職缺連結或連結不含數字 ID 時返回 None
+    """
+    link = card.find('a', href=JOB_LINK_RE)
+    if not link:
+        return None
+    return job_id_from_link(link.get('href', ''))
+
+
+def _multi_job_containers(soup):
+    """
+    找出所有包含兩個以上不同職缺連結的元素（代表是列表容器而非單張卡片）
+    
+    由每個職缺連結往上標記祖先元素看過的職缺 ID，一次走訪完成：祖先已標記為
+    同一個 ID 或已是容器時，更上層也必定如此，不必再往上走；每個元素最多
+    被標記兩次，不會因卡片層層巢狀而重複掃描子樹。
+    
+    Args:
+        soup: BeautifulSoup 文件樹
+    
+    Returns:
+        set: 容器元素的 id()
+    """
+    job_ids = {}
+    containers = set()
+    for link in soup.find_all('a', href=JOB_LINK_RE):
+        match = JOB_ID_RE.search(link.get('href', ''))
+        if not match:
+            continue
+        job_id = match.group(1)
+        parent = link.parent
+        while parent is not None:
+            key = id(parent)
+            if key in containers:
+                break
+            seen = job_ids.get(key)
+            if seen == job_id:
+                break
+            if seen is None:
+                job_ids[key] = job_id
+            else:
+                containers.add(key)
+            parent = parent.parent
+    return containers
+
+
+def outermost_job_elements(soup):
+    """
+    找出 class 含有 "job" 的最外層卡片，略過其內部所有子元素
+    
+    等同 [class*="job"] 選擇器，但以一次深度優先走訪完成：遇到符合的元素就
+    收下並不再往下走；若該元素包含多個不同職缺的連結（例如 .job-list 容器），
+    則視為容器繼續往下尋找卡片。
+    
+    Args:
+        soup: BeautifulSoup 文件樹
+    
+    Returns:
+        list: 依文件順序排列的卡片元素
+    """
+    from bs4 import Tag
+    
+    cards = []
+    # 第一次遇到符合的元素時才計算容器，沒有 job 類別的頁面不必走訪連結
+    containers = None
+    stack = [child for child in reversed(soup.contents) if isinstance(child, Tag)]
+    while stack:
+        tag = stack.pop()
+        classes = tag.get('class')
+        if classes:
+            class_value = ' '.join(classes) if isinstance(classes, list) else classes
+            if 'job' in class_value:
+                if containers is None:
+                    containers = _multi_job_containers(soup)
+                if id(tag) not in containers:
+                    cards.append(tag)
+                    continue
+        stack.extend(child for child in reversed(tag.contents) if isinstance(child, Tag))
+    return cards
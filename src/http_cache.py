@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlencode
+
+
+class CacheEntry:
+    """單筆快取的回應內容與中繼資料"""
+    
+    def __init__(self, key, body, meta):
+        self.key = key
+        self.body = body
+        self.meta = meta
+    
+    @property
+    def fetched_at(self):
+        return self.meta.get('fetched_at', 0)
+    
+    def is_fresh(self, ttl):
+        """
+        檢查快取是否仍在有效期限內
+        
+        Args:
+            ttl (float): 有效秒數，None 表示永不過期
+        
+        Returns:
+            bool: 是否仍有效
+        """
+        if ttl is None:
+            return True
+        return time.time() - self.fetched_at < ttl
+    
+    def revalidation_headers(self):
+        """
+        產生條件式請求標頭（If-None-Match / If-Modified-Since）
+        
+        Returns:
+            dict: 伺服器提供 ETag / Last-Modified 時的標頭，否則為空
+        """
+        headers = {}
+        if self.meta.get('etag'):
+            headers['If-None-Match'] = self.meta['etag']
+        if self.meta.get('last_modified'):
+            headers['If-Modified-Since'] = self.meta['last_modified']
+        return headers
+
+
+class ResponseCache:
+    """以請求內容定址的磁碟 HTTP 回應快取，支援 TTL 與 LRU 容量淘汰"""
+    
+    def __init__(self, cache_dir, ttl=3600, max_bytes=200 * 1024 * 1024, offline=False):
+        """
+        初始化快取
+        
+        Args:
+            cache_dir (str): 快取目錄
+            ttl (float): 快取有效秒數，None 表示永不過期
+            max_bytes (int): 快取總容量上限，超過時淘汰最久未使用的項目
+            offline (bool): 離線模式，只從快取讀取、不發出任何網路請求
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        # key -> (最後使用時間, 大小)，第一次淘汰檢查時才從磁碟載入
+        self.index = None
+        self.total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(url, params=None):
+        """
+        依 URL 與查詢參數計算快取鍵（參數排序後取 SHA-256）
+        
+        Args:
+            url (str): 請求 URL
+            params (dict): 查詢參數
+        
+        Returns:
+            str: 快取鍵
+        """
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"GET {url}?{query}".encode('utf-8')).hexdigest()
+    
+    def _paths(self, key):
+        # 以前兩個字元分目錄，避免單一目錄檔案過多
+        directory = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(directory, key + '.body'), os.path.join(directory, key + '.json')
+    
+    def get(self, url, params=None):
+        """
+        讀取快取（不論是否過期），並更新最後使用時間
+        
+        Args:
+            url (str): 請求 URL
+            params (dict): 查詢參數
+        
+        Returns:
+            CacheEntry: 快取項目，不存在時返回 None
+        """
+        key = self.make_key(url, params)
+        body_path, meta_path = self._paths(key)
+        
+        with self.lock:
+            try:
+                with open(meta_path, encoding='utf-8') as f:
+                    meta = json.load(f)
+                with open(body_path, encoding='utf-8') as f:
+                    body = f.read()
+            except (OSError, ValueError):
+                return None
+            
+            meta['accessed_at'] = time.time()
+            self._write_meta(meta_path, meta)
+            if self.index is not None and key in self.index:
+                self.index[key] = (meta['accessed_at'], self.index[key][1])
+        
+        return CacheEntry(key, body, meta)
+    
+    def put(self, url, params, body, headers=None):
+        """
+        寫入快取並視需要淘汰舊項目
+        
+        Args:
+            url (str): 請求 URL
+            params (dict): 查詢參數
+            body (str): 回應內容
+            headers (Mapping): 回應標頭，用來保存 ETag / Last-Modified
+        
+        Returns:
+            CacheEntry: 新寫入的快取項目
+        """
+        headers = headers or {}
+        key = self.make_key(url, params)
+        body_path, meta_path = self._paths(key)
+        now = time.time()
+        encoded = body.encode('utf-8')
+        meta = {
+            'url': url,
+            'params': params or {},
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': now,
+            'accessed_at': now,
+            'size': len(encoded),
+        }
+        
+        with self.lock:
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            # 先寫暫存檔再替換，避免中斷時留下不完整的內容
+            tmp_path = body_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded)
+            os.replace(tmp_path, body_path)
+            self._write_meta(meta_path, meta)
+            self._load_index()
+            self.total_bytes += meta['size'] - self.index.get(key, (0, 0))[1]
+            self.index[key] = (now, meta['size'])
+            self._evict()
+        
+        return CacheEntry(key, body, meta)
+    
+    def refresh(self, entry):
+        """
+        伺服器回應 304 時更新快取的抓取時間
+        
+        Args:
+            entry (CacheEntry): 已驗證仍有效的快取項目
+        """
+        _, meta_path = self._paths(entry.key)
+        entry.meta['fetched_at'] = time.time()
+        with self.lock:
+            self._write_meta(meta_path, entry.meta)
+    
+    def _write_meta(self, meta_path, meta):
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+    
+    def _load_index(self):
+        """掃描快取目錄建立使用時間索引（呼叫時須持有 lock）"""
+        if self.index is not None:
+            return
+        
+        self.index = {}
+        self.total_bytes = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    with open(os.path.join(root, name), encoding='utf-8') as f:
+                        meta = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                size = meta.get('size', 0)
+                self.index[name[:-5]] = (meta.get('accessed_at', 0), size)
+                self.total_bytes += size
+    
+    def _evict(self):
+        """超過容量上限時依最後使用時間淘汰（呼叫時須持有 lock）"""
+        if self.max_bytes is None or self.total_bytes <= self.max_bytes:
+            return
+        
+        for key, (_, size) in sorted(self.index.items(), key=lambda item: item[1][0]):
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            del self.index[key]
+            self.total_bytes -= size
+            if self.total_bytes <= self.max_bytes:
+                break
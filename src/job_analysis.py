@@ -0,0 +1,227 @@
+import glob
+
+from salary import normalize_salary
+
+# 統計分布的欄位與顯示名稱；公司只列前幾名
+DISTRIBUTION_COLUMNS = [
+    ('company', '公司分布'),
+    ('industry', '產業分布'),
+    ('location', '地點分布'),
+    ('education', '學歷要求分布'),
+    ('experience', '工作經驗要求分布'),
+]
+
+# 資料完整度統計的欄位與顯示名稱
+COMPLETENESS_COLUMNS = [
+    ('salary', '有薪資資訊'),
+    ('education', '有學歷要求'),
+    ('department', '有科系要求'),
+    ('experience', '有經驗要求'),
+    ('language', '有外語要求'),
+    ('skills', '有技能要求'),
+    ('additional', '有附加條件'),
+]
+
+# 視為沒有資料的值
+INVALID_VALUES = ['', 'N/A']
+
+# 分析需要讀取的欄位
+ANALYSIS_COLUMNS = sorted(
+    {column for column, _ in DISTRIBUTION_COLUMNS}
+    | {column for column, _ in COMPLETENESS_COLUMNS}
+    | {'relevance_score'}
+)
+
+
+def load_frame(source, columns=None):
+    """
+    把各種來源轉成 DataFrame
+    
+    Args:
+        source: 職缺列表、pandas.DataFrame、pyarrow.Table，或 CSV 路徑 / glob（例如 data/*.csv）
+        columns (list): 讀取 CSV 或職缺列表時只載入這些欄位，None 表示全部
+    
+    Returns:
+        pandas.DataFrame: 職缺資料框
+    """
+    import pandas as pd
+    
+    if isinstance(source, pd.DataFrame):
+        return source
+    if hasattr(source, 'to_pandas'):
+        return source.to_pandas()
+    if isinstance(source, str):
+        paths = sorted(glob.glob(source))
+        if not paths:
+            return pd.DataFrame(columns=columns or [])
+        wanted = set(columns) if columns else None
+        frames = [
+            pd.read_csv(path, encoding='utf-8-sig',
+                        usecols=(lambda column: column in wanted) if wanted else None)
+            for path in paths
+        ]
+        return pd.concat(frames, ignore_index=True)
+    # 職缺列表只取需要的欄位，以 object 型別建立避免逐欄推斷字串型別
+    records = list(source)
+    if columns is None:
+        return pd.DataFrame(records)
+    return pd.DataFrame({
+        column: pd.Series([record.get(column) for record in records], dtype=object)
+        for column in columns
+    })
+
+
+def valid_mask(series):
+    """
+    判斷欄位是否有有效值（非空、非空字串、非 N/A）
+    
+    Args:
+        series (pandas.Series): 欄位資料
+    
+    Returns:
+        pandas.Series: 布林遮罩
+    """
+    return (series.notna() & ~series.isin(INVALID_VALUES)).astype(bool)
+
+
+def value_distribution(series, top=None):
+    """
+    計算欄位的值分布（次數相同時依首次出現順序，與 Counter.most_common 一致）
+    
+    Args:
+        series (pandas.Series): 欄位資料
+        top (int): 只取前幾名，None 表示全部
+    
+    Returns:
+        list: (值, 次數) 列表，依次數由多到少
+    """
+    values = series[valid_mask(series)]
+    # category 型別的 value_counts 依類別排序，先依首次出現順序重排再做穩定排序
+    counts = values.value_counts(sort=False).reindex(values.unique())
+    counts = counts.sort_values(ascending=False, kind='stable')
+    if top is not None:
+        counts = counts.head(top)
+    return [(value, int(count)) for value, count in counts.items()]
+
+
+def analyze_frame(source, top_companies=5, dedupe=False):
+    """
+    以向量化運算計算職缺統計資訊
+    
+    Args:
+        source: 職缺列表、pandas.DataFrame、pyarrow.Table，或 CSV glob
+        top_companies (int): 公司分布只列前幾名
+        dedupe (bool): 是否先以 near_duplicates 合併近似重複的職缺（每群只計一次）
+    
+    Returns:
+        dict: {
+            'total': 職缺數,
+            'distributions': {欄位: [(值, 次數), ...]},
+            'relevance': {'mean', 'max', 'min'}，沒有資料時為 None,
+            'salary': {'count', 'negotiable', 'min_median', 'min_mean', 'max_median'} 或 None,
+            'completeness': {欄位: {'count', 'ratio'}},
+            'duplicates': 合併掉的近似重複職缺數（僅 dedupe=True 時）,
+        }
+    """
+    import pandas as pd
+    
+    if dedupe:
+        import near_duplicates
+        
+        columns = sorted(set(ANALYSIS_COLUMNS) | set(near_duplicates.DEDUPE_COLUMNS)
+                         | {'link', 'cluster_id'})
+        df = load_frame(source, columns)
+        duplicates = 0
+        if len(df):
+            # 已由 assign_clusters 標記過的資料直接沿用 cluster_id
+            if 'cluster_id' not in df.columns:
+                df = near_duplicates.add_cluster_column(df)
+            unique = df.drop_duplicates('cluster_id')
+            duplicates = len(df) - len(unique)
+            df = unique
+    else:
+        df = load_frame(source, ANALYSIS_COLUMNS)
+    total = len(df)
+    result = {'total': total, 'distributions': {}, 'relevance': None, 'salary': None,
+              'completeness': {}}
+    if dedupe:
+        result['duplicates'] = duplicates
+    if not total:
+        return result
+    
+    for column, _ in DISTRIBUTION_COLUMNS:
+        if column in df.columns:
+            top = top_companies if column == 'company' else None
+            result['distributions'][column] = value_distribution(df[column], top)
+        else:
+            result['distributions'][column] = []
+    
+    # 缺少相關度欄位時視為 0，與逐筆 job.get('relevance_score', 0) 一致
+    if 'relevance_score' in df.columns:
+        scores = pd.to_numeric(df['relevance_score'], errors='coerce').fillna(0)
+        result['relevance'] = {
+            'mean': float(scores.mean()),
+            'max': scores.max().item(),
+            'min': scores.min().item(),
+        }
+    else:
+        result['relevance'] = {'mean': 0.0, 'max': 0, 'min': 0}
+    
+    # 薪資統計（月薪換算後），沒有可解析的薪資時為 None
+    if 'salary' in df.columns:
+        salaries = normalize_salary(df['salary'])
+        minimum = salaries['salary_min'].dropna()
+        if len(minimum):
+            result['salary'] = {
+                'count': len(minimum),
+                'negotiable': int(salaries['is_negotiable'].sum()),
+                'min_median': float(minimum.median()),
+                'min_mean': float(minimum.mean()),
+                'max_median': float(salaries['salary_max'].median()),
+            }
+    
+    for column, _ in COMPLETENESS_COLUMNS:
+        count = int(valid_mask(df[column]).sum()) if column in df.columns else 0
+        result['completeness'][column] = {'count': count, 'ratio': count / total}
+    
+    return result
+
+
+def print_report(result):
+    """
+    印出統計分析結果
+    
+    Args:
+        result (dict): analyze_frame 的回傳值
+    """
+    if not result['total']:
+        print("沒有職缺資料可分析")
+        return
+    
+    print(f"統計分析")
+    print("=" * 50)
+    
+    if 'duplicates' in result:
+        print(f"不重複職缺: {result['total']} 個（已合併近似重複 {result['duplicates']} 個）")
+    
+    for column, label in DISTRIBUTION_COLUMNS:
+        distribution = result['distributions'].get(column)
+        if not distribution:
+            continue
+        if column == 'company':
+            print(f"{label} (前5名):")
+        else:
+            print(f"{label}:")
+        for value, count in distribution:
+            print(f"   {value}: {count} 個職缺")
+    
+    relevance = result['relevance']
+    if relevance:
+        print(f"平均相關度: {relevance['mean']:.2f}")
+        print(f"   最高相關度: {relevance['max']}")
+        print(f"   最低相關度: {relevance['min']}")
+    
+    print(f"\n資料完整度:")
+    for column, label in COMPLETENESS_COLUMNS:
+        stats = result['completeness'][column]
+        print(f"   {label}: {stats['count']} 個 ({stats['ratio'] * 100:.1f}%)")
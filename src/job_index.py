@@ -0,0 +1,731 @@
+import argparse
+import csv
+import glob
+import itertools
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from array import array
+from datetime import datetime
+
+import html_backends
+from job_store import SQL_BATCH_SIZE, content_hash
+from job_writers import DATA_DIR
+
+# 預設索引資料庫路徑
+DEFAULT_INDEX_PATH = os.path.join(DATA_DIR, 'job_index.db')
+
+# 建立索引的欄位：技能、縣市、學歷、工作年資、職缺標題的詞與標題詞數
+INDEX_FIELDS = ('skill', 'location', 'education', 'experience', 'title', 'title_length')
+
+# 記錄所有職缺的內部欄位（只有一個空字串詞），作為查詢的起點
+DOCUMENT_FIELD = 'document'
+
+# 縣市名稱（爬蟲的地點只保存這些值）
+LOCATIONS = (
+    '台北市', '新北市', '桃園市', '台中市', '台南市', '高雄市',
+    '新竹市', '新竹縣', '基隆市', '宜蘭縣', '苗栗縣', '彰化縣',
+    '南投縣', '雲林縣', '嘉義市', '嘉義縣', '屏東縣', '花蓮縣',
+    '台東縣', '澎湖縣', '金門縣', '連江縣',
+)
+
+# 學歷等級（依高到低），卡片上常寫成「專科、大學」或「大學以上」
+EDUCATION_LEVELS = ['博士', '碩士', '大學', '專科', '高中職', '國中', '不拘']
+
+# 技能欄位的分隔符號
+SKILL_SPLIT_RE = re.compile(r'[,，、/|;；\n]+')
+
+# 標題分詞：英數詞（保留 C++ / C# / .NET 之類的符號）與連續的中日韓文字
+LATIN_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+CJK_RUN_RE = re.compile(r'[㐀-鿿豈-﫿]+')
+
+# 工作經驗：「不拘」「無經驗可」視為 0 年，範圍取下限
+EXPERIENCE_YEARS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:[-~～至]\s*\d+(?:\.\d+)?\s*)?年')
+NO_EXPERIENCE_RE = re.compile(r'不拘|無經驗|應屆')
+
+# BM25 參數（標題詞的排序）
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 參與排序的查詢詞上限（取最少見的詞）
+MAX_RANKED_TERMS = 8
+
+# 舊版 CSV 把學歷、經驗等條件合併在 conditions 欄位
+CONDITIONS_COLUMN = 'conditions'
+
+
+def title_tokens(text):
+    """
+    把職缺標題切成索引用的詞：英文詞轉小寫，中文以相鄰兩字（bigram）切分
+    
+    Args:
+        text (str): 職缺標題
+    
+    Returns:
+        list: 詞列表（可能重複）
+    """
+    text = (text or '').lower()
+    tokens = LATIN_TOKEN_RE.findall(text)
+    for run in CJK_RUN_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def normalize_skill(skill):
+    """正規化技能名稱（去除空白、轉小寫），例如 ' Power BI ' -> 'power bi'"""
+    return ' '.join(skill.split()).lower()
+
+
+def normalize_location(location):
+    """正規化縣市名稱（臺 -> 台）"""
+    return (location or '').strip().replace('臺', '台')
+
+
+def resolve_location(location):
+    """
+    把查詢的縣市名稱對應到 LOCATIONS（爬蟲只會保存這些縣市）
+    
+    省略「市 / 縣」的名稱對應到所有開頭相同的縣市，例如 '台北' -> ['台北市']、
+    '新竹' -> ['新竹市', '新竹縣']。
+    
+    Args:
+        location (str): 縣市名稱
+    
+    Returns:
+        list: 對應的縣市
+    
+    Raises:
+        ValueError: 沒有對應的縣市（訊息列出可用的縣市）
+    """
+    name = normalize_location(location)
+    if name in LOCATIONS:
+        return [name]
+    matches = [candidate for candidate in LOCATIONS if name and candidate.startswith(name)]
+    if not matches:
+        raise ValueError(f"未知的縣市: {location}，可用: {'、'.join(LOCATIONS)}")
+    return matches
+
+
+def skill_terms(text):
+    """
+    從技能欄位取出正規化後的技能
+    
+    Args:
+        text (str): 技能欄位，例如 'Python、SQL, Airflow'
+    
+    Returns:
+        set: 技能
+    """
+    if not text or text == 'N/A':
+        return set()
+    return {normalize_skill(skill) for skill in SKILL_SPLIT_RE.split(text) if skill.strip()}
+
+
+def education_terms(text):
+    """
+    找出文字中提到的學歷等級
+    
+    Args:
+        text (str): 學歷欄位
+    
+    Returns:
+        set: EDUCATION_LEVELS 中出現過的等級
+    """
+    if not text:
+        return set()
+    return {level for level in EDUCATION_LEVELS if level in text}
+
+
+def experience_years(text):
+    """
+    解析要求的工作年資
+    
+    Args:
+        text (str): 工作經驗欄位，例如 '2年以上'、'1~3年'、'不拘'
+    
+    Returns:
+        float: 年資下限，無法判斷時為 None
+    """
+    if not text:
+        return None
+    match = EXPERIENCE_YEARS_RE.search(text)
+    if match:
+        return float(match.group(1))
+    if NO_EXPERIENCE_RE.search(text):
+        return 0.0
+    return None
+
+
+def index_terms(job):
+    """
+    取出職缺各欄位要建立索引的詞
+    
+    工作年資（取整數年）與標題詞數也當作詞建立索引，年資範圍與 BM25 排序
+    都能直接以 postings 運算完成。
+    
+    Args:
+        job (dict): 職缺資訊
+    
+    Returns:
+        dict: 欄位 -> 詞的集合
+    """
+    conditions = job.get(CONDITIONS_COLUMN) or ''
+    location = normalize_location(job.get('location'))
+    years = experience_years(job.get('experience') or conditions)
+    tokens = title_tokens(job.get('title'))
+    return {
+        'skill': skill_terms(job.get('skills')),
+        'location': {location} if location and location != 'N/A' else set(),
+        'education': education_terms(job.get('education') or conditions),
+        'experience': {str(int(years))} if years is not None else set(),
+        'title': set(tokens),
+        'title_length': {str(len(tokens))},
+        DOCUMENT_FIELD: {''},
+    }
+
+
+# 每個位元組中為 1 的位元位置（由高到低），用來從 bitmap 取出 doc_id
+BYTE_BITS = [tuple(bit for bit in range(7, -1, -1) if byte >> bit & 1) for byte in range(256)]
+
+
+def bitmap_from_ids(doc_ids):
+    """
+    把 doc_id 集合轉成 bitmap（Python 整數，第 n 個位元代表 doc_id n）
+    
+    Args:
+        doc_ids (iterable): doc_id
+    
+    Returns:
+        int: bitmap
+    """
+    doc_ids = list(doc_ids)
+    if not doc_ids:
+        return 0
+    buffer = bytearray(max(doc_ids) // 8 + 1)
+    for doc_id in doc_ids:
+        buffer[doc_id >> 3] |= 1 << (doc_id & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def iter_bitmap(bitmap):
+    """
+    由大到小列出 bitmap 中的 doc_id（逐位元組掃描，可以提早停止）
+    
+    Args:
+        bitmap (int): bitmap
+    
+    Yields:
+        int: doc_id
+    """
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for index in range(len(data) - 1, -1, -1):
+        byte = data[index]
+        if byte:
+            base = index * 8
+            for bit in BYTE_BITS[byte]:
+                yield base + bit
+
+
+def encode_postings(bitmap):
+    """
+    選擇較小的儲存格式：稀疏的詞存成排序過的 doc_id 陣列，常見的詞存成 bitmap
+    
+    Args:
+        bitmap (int): bitmap
+    
+    Returns:
+        tuple: (格式, BLOB)
+    """
+    size = (bitmap.bit_length() + 7) // 8
+    if bitmap.bit_count() * 4 < size:
+        return 'array', array('I', sorted(iter_bitmap(bitmap))).tobytes()
+    return 'bitmap', bitmap.to_bytes(size, 'little')
+
+
+def decode_postings(encoding, blob):
+    """把 encode_postings 的結果還原成 bitmap"""
+    if encoding == 'bitmap':
+        return int.from_bytes(blob, 'little')
+    doc_ids = array('I')
+    doc_ids.frombytes(blob)
+    return bitmap_from_ids(doc_ids)
+
+
+class JobIndex:
+    """
+    以 SQLite 保存的職缺倒排索引
+    
+    每個 (欄位, 詞) 對應一份 postings：稀疏的詞存成 doc_id 陣列、常見的詞存成
+    bitmap，讀出後一律轉成 bitmap（Python 整數），布林條件只是整數的 & | ~ 運算。
+    同一職缺內容未變更時不會重新索引，內容變更時先移除舊的詞。
+    """
+    
+    def __init__(self, path=None):
+        """
+        開啟（或建立）索引
+        
+        Args:
+            path (str): 索引資料庫路徑，None 表示使用 data/job_index.db
+        """
+        self.path = path or DEFAULT_INDEX_PATH
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY,
+                job_id TEXT NOT NULL UNIQUE,
+                content_hash TEXT NOT NULL,
+                terms TEXT NOT NULL,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                skills TEXT,
+                experience TEXT,
+                link TEXT,
+                indexed_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                field TEXT NOT NULL,
+                term TEXT NOT NULL,
+                encoding TEXT NOT NULL,
+                doc_ids BLOB NOT NULL,
+                PRIMARY KEY (field, term)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                indexed_at TEXT NOT NULL
+            );
+        ''')
+        self.conn.commit()
+        self.cache = {}
+    
+    def count(self):
+        """取得索引中的職缺數"""
+        return self.postings(DOCUMENT_FIELD, '').bit_count()
+    
+    def postings(self, field, term):
+        """
+        取得某個詞的 postings
+        
+        Args:
+            field (str): 欄位（INDEX_FIELDS 之一）
+            term (str): 正規化後的詞
+        
+        Returns:
+            int: bitmap，詞不存在時為 0
+        """
+        key = (field, term)
+        bitmap = self.cache.get(key)
+        if bitmap is None:
+            row = self.conn.execute(
+                'SELECT encoding, doc_ids FROM postings WHERE field = ? AND term = ?', key
+            ).fetchone()
+            bitmap = decode_postings(*row) if row else 0
+            self.cache[key] = bitmap
+        return bitmap
+    
+    def field_terms(self, field):
+        """
+        列出某個欄位的所有詞與 postings
+        
+        Args:
+            field (str): 欄位
+        
+        Returns:
+            dict: 詞 -> bitmap
+        """
+        terms = [row[0] for row in self.conn.execute('SELECT term FROM postings WHERE field = ?', (field,))]
+        return {term: self.postings(field, term) for term in terms}
+    
+    def _apply(self, added, removed):
+        """把新增 / 移除的 (欄位, 詞) -> doc_id 寫回 postings（呼叫時須在交易中）"""
+        for key in set(added) | set(removed):
+            bitmap = self.postings(*key)
+            bitmap &= ~bitmap_from_ids(removed.get(key, ()))
+            bitmap |= bitmap_from_ids(added.get(key, ()))
+            if bitmap:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO postings (field, term, encoding, doc_ids) VALUES (?, ?, ?, ?)',
+                    (*key, *encode_postings(bitmap))
+                )
+            else:
+                self.conn.execute('DELETE FROM postings WHERE field = ? AND term = ?', key)
+        self.cache.clear()
+    
+    def add_jobs(self, jobs, indexed_at=None):
+        """
+        新增或更新職缺（以連結中的職缺 ID 識別），內容未變更的職缺略過
+        
+        Args:
+            jobs (iterable): 職缺資訊 dict
+            indexed_at (str): 索引時間（ISO 格式），None 表示現在
+        
+        Returns:
+            dict: {'added': 新增數, 'updated': 內容變更數, 'unchanged': 未變更數, 'skipped': 沒有職缺 ID 的數量}
+        """
+        indexed_at = indexed_at or datetime.now().isoformat(timespec='seconds')
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+        
+        records = {}
+        for job in jobs:
+            job_id = html_backends.job_id_from_link(job.get('link'))
+            if job_id is None:
+                stats['skipped'] += 1
+                continue
+            records[job_id] = job
+        if not records:
+            return stats
+        
+        existing = {}
+        job_ids = list(records)
+        for start in range(0, len(job_ids), SQL_BATCH_SIZE):
+            batch = job_ids[start:start + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(
+                f'SELECT job_id, doc_id, content_hash, terms FROM documents WHERE job_id IN ({placeholders})',
+                batch
+            )
+            existing.update((row[0], row[1:]) for row in rows)
+        
+        added = {}
+        removed = {}
+        with self.conn:
+            for job_id, job in records.items():
+                digest = content_hash(job)
+                terms = index_terms(job)
+                encoded_terms = json.dumps({field: sorted(values) for field, values in terms.items()},
+                                           ensure_ascii=False)
+                values = (digest, encoded_terms, job.get('title'), job.get('company'),
+                          job.get('location'), job.get('skills'), job.get('experience'),
+                          job.get('link'), indexed_at)
+                
+                if job_id in existing:
+                    doc_id, old_digest, old_terms = existing[job_id]
+                    if old_digest == digest:
+                        stats['unchanged'] += 1
+                        continue
+                    stats['updated'] += 1
+                    for field, old_values in json.loads(old_terms).items():
+                        for term in old_values:
+                            removed.setdefault((field, term), set()).add(doc_id)
+                    self.conn.execute('''
+                        UPDATE documents SET content_hash = ?, terms = ?, title = ?, company = ?,
+                            location = ?, skills = ?, experience = ?, link = ?, indexed_at = ?
+                        WHERE doc_id = ?
+                    ''', (*values, doc_id))
+                else:
+                    stats['added'] += 1
+                    doc_id = self.conn.execute('''
+                        INSERT INTO documents (job_id, content_hash, terms, title, company, location,
+                                               skills, experience, link, indexed_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (job_id, *values)).lastrowid
+                
+                for field, field_terms in terms.items():
+                    for term in field_terms:
+                        key = (field, term)
+                        if doc_id in removed.get(key, ()):
+                            removed[key].discard(doc_id)
+                        else:
+                            added.setdefault(key, set()).add(doc_id)
+            
+            self._apply(added, removed)
+        
+        return stats
+    
+    def remove(self, job_ids):
+        """
+        從索引移除職缺
+        
+        Args:
+            job_ids (iterable): 職缺 ID
+        
+        Returns:
+            int: 實際移除的職缺數
+        """
+        removed = {}
+        count = 0
+        with self.conn:
+            for job_id in job_ids:
+                row = self.conn.execute(
+                    'SELECT doc_id, terms FROM documents WHERE job_id = ?', (job_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                doc_id, terms = row
+                for field, values in json.loads(terms).items():
+                    for term in values:
+                        removed.setdefault((field, term), set()).add(doc_id)
+                self.conn.execute('DELETE FROM documents WHERE doc_id = ?', (doc_id,))
+                count += 1
+            if count:
+                self._apply({}, removed)
+        return count
+    
+    def add_files(self, paths):
+        """
+        索引爬蟲輸出的 CSV / JSONL 檔案，大小與修改時間都沒變的檔案略過
+        
+        Args:
+            paths (iterable): 檔案路徑或 glob 樣式
+        
+        Returns:
+            dict: add_jobs 的統計，另含 'files'（實際讀取的檔案數）
+        """
+        totals = {'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'files': 0}
+        for pattern in paths:
+            for path in sorted(glob.glob(pattern)):
+                if not os.path.isfile(path):
+                    continue
+                stat = os.stat(path)
+                source = os.path.abspath(path)
+                row = self.conn.execute('SELECT size, mtime FROM sources WHERE path = ?', (source,)).fetchone()
+                if row == (stat.st_size, stat.st_mtime):
+                    continue
+                
+                stats = self.add_jobs(read_jobs(path))
+                for key, value in stats.items():
+                    totals[key] += value
+                totals['files'] += 1
+                with self.conn:
+                    self.conn.execute(
+                        'INSERT OR REPLACE INTO sources (path, size, mtime, indexed_at) VALUES (?, ?, ?, ?)',
+                        (source, stat.st_size, stat.st_mtime, datetime.now().isoformat(timespec='seconds'))
+                    )
+        return totals
+    
+    def _match_any(self, field, terms):
+        """任一詞出現即符合的 bitmap，terms 為空時返回 None（不限制）"""
+        if not terms:
+            return None
+        bitmap = 0
+        for term in terms:
+            bitmap |= self.postings(field, term)
+        return bitmap
+    
+    def search(self, text=None, skills=(), any_skills=(), exclude_skills=(), locations=(),
+               education=(), min_experience=None, max_experience=None, limit=20):
+        """
+        查詢職缺：技能、縣市、學歷與年資為布林條件，text 以 BM25 依標題排序
+        
+        Args:
+            text (str): 標題查詢字詞（切詞後任一詞符合即列入，符合越多、越少見的詞分數越高）
+            skills (iterable): 必須全部具備的技能
+            any_skills (iterable): 至少具備其中一項的技能
+            exclude_skills (iterable): 不可出現的技能
+            locations (iterable): 縣市（任一），省略市 / 縣時比對所有同名縣市（見 resolve_location）
+            education (iterable): 學歷等級（任一），例如 ['大學', '碩士']
+            min_experience (float): 要求年資至少幾年（例如找 3 年以上經驗的職缺）
+            max_experience (float): 要求年資至多幾年（例如求職者只有 2 年經驗）
+            limit (int): 最多返回幾筆，None 表示全部
+        
+        Returns:
+            list: 依分數排序的職缺 dict（job_id、score、title、company、location、skills、experience、link）
+        
+        Raises:
+            ValueError: 縣市名稱沒有對應的縣市
+        """
+        candidates = self.postings(DOCUMENT_FIELD, '')
+        for skill in skills:
+            candidates &= self.postings('skill', normalize_skill(skill))
+        for skill in exclude_skills:
+            candidates &= ~self.postings('skill', normalize_skill(skill))
+        
+        if min_experience is not None or max_experience is not None:
+            low = -math.inf if min_experience is None else min_experience
+            high = math.inf if max_experience is None else max_experience
+            years = [term for term in self.field_terms('experience') if low <= int(term) <= high]
+            candidates &= self._match_any('experience', years) or 0
+        
+        for field, terms in (('skill', [normalize_skill(skill) for skill in any_skills]),
+                             ('location', [name for location in locations for name in resolve_location(location)]),
+                             ('education', list(education))):
+            matched = self._match_any(field, terms)
+            if matched is not None:
+                candidates &= matched
+        
+        if text:
+            ranked = self._rank_titles(text, candidates, limit)
+        else:
+            # 沒有查詢字詞時依索引順序由新到舊排列
+            ranked = [(doc_id, 0.0) for doc_id in itertools.islice(iter_bitmap(candidates), limit)]
+        return self._fetch_documents(ranked)
+    
+    def _rank_titles(self, text, candidates, limit=None):
+        """
+        以 BM25 排序標題，沒有任何查詢詞符合的職缺不列入
+        
+        標題很短，同一個詞幾乎只出現一次，tf 固定為 1；此時分數只由「符合哪些詞」
+        與「標題詞數」決定。把所有 (符合的詞組合, 標題詞數) 依分數由高到低排列，
+        依序以 bitmap 取出職缺，取滿 limit 筆就停止，不需要逐一計算每個職缺的分數。
+        
+        Args:
+            text (str): 查詢字詞
+            candidates (int): 符合布林條件的 bitmap
+            limit (int): 最多返回幾筆，None 表示全部
+        
+        Returns:
+            list: (doc_id, 分數) 列表
+        """
+        document_count = self.count()
+        lengths = {int(term): bitmap & candidates for term, bitmap in self.field_terms('title_length').items()}
+        if not document_count or not lengths:
+            return []
+        average_length = sum(int(term) * bitmap.bit_count()
+                             for term, bitmap in self.field_terms('title_length').items()) / document_count
+        
+        matched = []
+        for term in set(title_tokens(text)):
+            postings = self.postings('title', term)
+            if postings & candidates:
+                idf = math.log(1 + (document_count - postings.bit_count() + 0.5) / (postings.bit_count() + 0.5))
+                matched.append((idf, postings & candidates))
+        # 組合數隨詞數指數成長，只保留最少見的幾個詞
+        matched = sorted(matched, reverse=True)[:MAX_RANKED_TERMS]
+        if not matched:
+            return []
+        
+        groups = []
+        for mask in range(1, 1 << len(matched)):
+            weight = sum(idf for i, (idf, _) in enumerate(matched) if mask >> i & 1)
+            for length in lengths:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                groups.append((weight * (BM25_K1 + 1) / (1 + norm), mask, length))
+        groups.sort(reverse=True)
+        
+        exact = {}
+        ranked = []
+        for score, mask, length in groups:
+            if mask not in exact:
+                # 恰好符合 mask 中的詞、不含其他查詢詞的職缺
+                bitmap = candidates
+                for i, (_, postings) in enumerate(matched):
+                    bitmap = bitmap & postings if mask >> i & 1 else bitmap & ~postings
+                exact[mask] = bitmap
+            bitmap = exact[mask] & lengths[length]
+            if not bitmap:
+                continue
+            for doc_id in iter_bitmap(bitmap):
+                ranked.append((doc_id, score))
+                if limit is not None and len(ranked) >= limit:
+                    return ranked
+        return ranked
+    
+    def _fetch_documents(self, ranked):
+        """依排序結果讀取職缺內容"""
+        results = []
+        for start in range(0, len(ranked), SQL_BATCH_SIZE):
+            batch = ranked[start:start + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(f'''
+                SELECT doc_id, job_id, title, company, location, skills, experience, link
+                FROM documents WHERE doc_id IN ({placeholders})
+            ''', [doc_id for doc_id, _ in batch])
+            documents = {row[0]: row[1:] for row in rows}
+            for doc_id, score in batch:
+                job_id, title, company, location, skills, experience, link = documents[doc_id]
+                results.append({
+                    'job_id': job_id, 'score': round(score, 4), 'title': title, 'company': company,
+                    'location': location, 'skills': skills, 'experience': experience, 'link': link,
+                })
+        return results
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_jobs(path):
+    """
+    讀取爬蟲輸出的 CSV（UTF-8-BOM）或 JSONL 檔案
+    
+    Args:
+        path (str): 檔案路徑
+    
+    Yields:
+        dict: 職缺資訊
+    """
+    if path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            yield from csv.DictReader(f)
+
+
+def print_results(results):
+    """印出查詢結果"""
+    for result in results:
+        print(f"[{result['score']:.2f}] {result['title']} | {result['company']} | "
+              f"{result['location']} | {result['experience'] or 'N/A'} | {result['skills'] or 'N/A'}")
+        print(f"       {result['link']}")
+
+
+def main(argv=None):
+    """
+    建立索引或查詢職缺
+    
+    Returns:
+        int: 結束代碼
+    """
+    parser = argparse.ArgumentParser(description="職缺倒排索引：建立與查詢")
+    parser.add_argument('--db', help="索引資料庫路徑，預設 data/job_index.db")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    build = commands.add_parser('build', help="索引爬蟲輸出的 CSV / JSONL（只處理新的或有變更的檔案）")
+    build.add_argument('paths', nargs='*', default=[os.path.join(DATA_DIR, '*.csv'),
+                                                    os.path.join(DATA_DIR, '*.jsonl')])
+    
+    query = commands.add_parser('query', help="查詢職缺")
+    query.add_argument('text', nargs='?', help="標題查詢字詞")
+    query.add_argument('-s', '--skill', action='append', default=[], help="必須具備的技能，可重複指定")
+    query.add_argument('--any-skill', action='append', default=[], help="至少具備其中一項的技能")
+    query.add_argument('--exclude-skill', action='append', default=[], help="不可出現的技能")
+    query.add_argument('-l', '--location', action='append', default=[], help="縣市，可重複指定；省略市 / 縣時比對所有同名縣市（例如 新竹）")
+    query.add_argument('-e', '--education', action='append', default=[], choices=EDUCATION_LEVELS)
+    query.add_argument('--min-experience', type=float, help="要求年資至少幾年")
+    query.add_argument('--max-experience', type=float, help="要求年資至多幾年")
+    query.add_argument('-n', '--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    with JobIndex(args.db) as index:
+        if args.command == 'build':
+            stats = index.add_files(args.paths)
+            print(f"讀取 {stats['files']} 個檔案：新增 {stats['added']}、更新 {stats['updated']}、"
+                  f"未變更 {stats['unchanged']}；索引共 {index.count()} 個職缺")
+            return 0
+        
+        started = time.perf_counter()
+        try:
+            results = index.search(args.text, args.skill, args.any_skill, args.exclude_skill,
+                                   args.location, args.education, args.min_experience,
+                                   args.max_experience, args.limit)
+        except ValueError as e:
+            print(e)
+            return 2
+        elapsed = time.perf_counter() - started
+        print_results(results)
+        print(f"\n{len(results)} 筆結果（{elapsed * 1000:.1f} ms）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
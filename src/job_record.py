@@ -0,0 +1,212 @@
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from collections.abc import MutableMapping
+
+# 職缺卡片的欄位（依擷取順序，轉成 dict 時的鍵值順序與原本的 dict 相同）
+JOB_FIELDS = (
+    'index', 'title', 'link', 'company', 'industry', 'location', 'salary',
+    'education', 'department', 'experience', 'language', 'skills', 'additional',
+    'publish_date', 'summary', 'relevance_score',
+)
+
+# 重複度高的欄位：相同的值共用同一個字串物件
+CATEGORICAL_FIELDS = frozenset({
+    'company', 'industry', 'location', 'salary', 'education', 'department',
+    'experience', 'language', 'publish_date',
+})
+
+# 其他欄位中也經常出現的值
+COMMON_VALUES = frozenset({'N/A', '不拘'})
+
+_FIELD_SET = frozenset(JOB_FIELDS)
+
+# getattr 的預設值，用來分辨「沒有設定」與「值為 None」
+_MISSING = object()
+
+
+class JobRecord(MutableMapping):
+    """
+    以 __slots__ 儲存的職缺資料，介面與 dict 相同（job['title']、job.get()、job.update() ...）
+    
+    固定欄位存在 slot 中，沒有設定的欄位不佔空間也不會出現在 keys() 中；
+    類別欄位的字串經 sys.intern 共用；其他欄位（例如 matched_keywords、詳細頁欄位、
+    cluster_id）存在額外的 dict，只有用到時才建立。
+    """
+    
+    __slots__ = JOB_FIELDS + ('_extra',)
+    
+    def __init__(self, *args, **kwargs):
+        self._extra = None
+        if args or kwargs:
+            self.update(*args, **kwargs)
+    
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+    
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            if isinstance(value, str) and (key in CATEGORICAL_FIELDS or value in COMMON_VALUES):
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+    
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+    
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+    
+    def __iter__(self):
+        for field in JOB_FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra:
+            yield from self._extra
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+    
+    def to_dict(self):
+        """轉成一般的 dict（與原本 extract_job_from_card 產生的 dict 相同）"""
+        result = {}
+        for field in JOB_FIELDS:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING:
+                result[field] = value
+        if self._extra:
+            result.update(self._extra)
+        return result
+    
+    def copy(self):
+        return JobRecord(self.to_dict())
+    
+    def __repr__(self):
+        return f"JobRecord({self.to_dict()!r})"
+
+
+def records_to_frame(records, columns=None):
+    """
+    逐欄建立 DataFrame（不需要先把每筆職缺轉成 dict）
+    
+    Args:
+        records (list): JobRecord 或 dict 列表
+        columns (list): 只建立這些欄位，None 表示所有出現過的欄位（依第一次出現的順序）
+    
+    Returns:
+        pandas.DataFrame: 職缺資料框，缺少的值為 NaN，與 pd.DataFrame(dict 列表) 相同
+    """
+    import pandas as pd
+    
+    if columns is None:
+        columns = list(dict.fromkeys(key for record in records for key in record))
+    if not records:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame({column: [record.get(column, float('nan')) for record in records]
+                         for column in columns})
+
+
+def measure_memory(records_factory, count):
+    """
+    量測建立 count 筆職缺資料佔用的記憶體
+    
+    Args:
+        records_factory (callable): 傳入筆數，返回職缺列表
+        count (int): 筆數
+    
+    Returns:
+        tuple: (位元組數, 秒數)
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = records_factory(count)
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size, elapsed
+
+
+def main(argv=None):
+    """
+    比較 dict 與 JobRecord 保存大量職缺時的記憶體用量
+    
+    以歷史 CSV 的職缺為樣本重複產生資料；每筆的字串都是新的物件，與實際解析的結果相同。
+    
+    Returns:
+        int: 結束代碼
+    """
+    import job_analysis
+    
+    parser = argparse.ArgumentParser(description="量測職缺資料的記憶體用量（dict 與 JobRecord）")
+    parser.add_argument('source', nargs='?', default=None, help="樣本 CSV glob，預設 data/*.csv")
+    parser.add_argument('-n', '--count', type=int, default=1_000_000, help="職缺筆數")
+    args = parser.parse_args(argv)
+    
+    from job_writers import DATA_DIR
+    df = job_analysis.load_frame(args.source or f"{DATA_DIR}/*.csv", list(JOB_FIELDS))
+    if df.empty:
+        print("沒有樣本職缺資料")
+        return 1
+    samples = [{key: value for key, value in row.items() if isinstance(value, (str, int))}
+               for row in df.to_dict('records')]
+    
+    def fresh(value):
+        # 產生內容相同、但不是同一個物件的字串（模擬每次解析產生的新字串）
+        return (value + ' ')[:-1] if isinstance(value, str) else value
+    
+    def make_dicts(count):
+        return [{key: fresh(value) for key, value in samples[i % len(samples)].items()}
+                for i in range(count)]
+    
+    def make_records(count):
+        records = []
+        for i in range(count):
+            record = JobRecord()
+            for key, value in samples[i % len(samples)].items():
+                record[key] = fresh(value)
+            records.append(record)
+        return records
+    
+    print(f"{args.count:,} 筆職缺（樣本 {len(samples)} 筆）")
+    results = {}
+    for name, factory in (('dict', make_dicts), ('JobRecord', make_records)):
+        size, elapsed = measure_memory(factory, args.count)
+        results[name] = size
+        print(f"   {name:<10} {size / 1024 ** 2:8.1f} MB  {size / args.count:6.0f} B/筆  建立 {elapsed:.1f} 秒")
+    print(f"   節省 {(1 - results['JobRecord'] / results['dict']) * 100:.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
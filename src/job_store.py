@@ -0,0 +1,298 @@
+import hashlib
+import json
+import math
+import numbers
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+from job_writers import COLUMN_ORDER, DATA_DIR
+
+# 預設資料庫路徑
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, 'jobs.db')
+
+# 計算內容雜湊時略過的欄位（編號每次爬取都不同，搜尋到的關鍵字與近似重複群組與職缺內容無關；
+# 發布時間多為「今天」「3天前」等相對時間，相關度分數由其他欄位算出，內容不變也可能每天不同）
+HASH_EXCLUDE_COLUMNS = {'index', 'matched_keywords', 'cluster_id', 'publish_date', 'relevance_score'}
+
+# 詳細頁會覆寫的欄位：判斷是否需要重新抓取詳細頁時不列入雜湊
+DETAIL_COLUMNS = ('education', 'department', 'experience', 'language', 'skills', 'additional')
+
+# 卡片文字中會隨時間改變的片段（日期、相對時間、應徵人數），計算雜湊前先去除
+VOLATILE_TEXT_RE = re.compile(
+    r'\d{1,2}\s*/\s*\d{1,2}|\d+\s*(?:天|小時|分鐘)前|昨天|今天|\d+\s*(?:[~～-]\s*\d+\s*)?人應徵'
+)
+
+# SQLite 單一查詢的參數數量上限
+SQL_BATCH_SIZE = 500
+
+
+def hash_value(value):
+    """
+    計算雜湊用的欄位值
+    
+    CSV 讀回的欄位都是文字、缺值為空字串，爬取或 JSONL / Parquet 讀回的則可能是數字、
+    None 或 NaN；先統一成文字（缺值為空字串、整數值的浮點數去掉 .0），同一職缺不論來源
+    雜湊都相同。文字再去除日期、相對時間與應徵人數並整理空白。
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        if isinstance(value, numbers.Integral) or float(value).is_integer():
+            value = int(value)
+        value = str(value)
+    if isinstance(value, str):
+        return ' '.join(VOLATILE_TEXT_RE.sub(' ', value).split())
+    return value
+
+
+def content_hash(job, exclude=HASH_EXCLUDE_COLUMNS):
+    """
+    計算職缺內容的雜湊值，用來判斷資料是否有變更
+    
+    只看職缺本身的內容：發布時間、相關度分數與文字中的日期、應徵人數不列入，
+    同一職缺沒有變更時每天的雜湊都相同。
+    
+    Args:
+        job (dict): 職缺資訊
+        exclude (set): 不列入雜湊的欄位
+    
+    Returns:
+        str: SHA-1 雜湊
+    """
+    payload = {key: hash_value(job.get(key)) for key in COLUMN_ORDER if key not in exclude}
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def card_hash(job):
+    """
+    計算判斷是否需要重新抓取詳細頁用的雜湊
+    
+    與 content_hash 相同，但不含詳細頁會覆寫的欄位：職缺補上詳細頁欄位之前或之後
+    計算的結果都相同，只有搜尋卡片本身的內容變更時才會不同。
+    
+    Args:
+        job (dict): 職缺資訊
+    
+    Returns:
+        str: SHA-1 雜湊
+    """
+    return content_hash(job, HASH_EXCLUDE_COLUMNS | set(DETAIL_COLUMNS))
+
+
+class JobStore:
+    """以 SQLite 保存職缺 ID、首次 / 最後出現時間與最新內容"""
+    
+    def __init__(self, path=None):
+        """
+        開啟（或建立）職缺資料庫
+        
+        Args:
+            path (str): 資料庫路徑，None 表示使用 data/jobs.db
+        """
+        self.path = path or DEFAULT_DB_PATH
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                keyword TEXT,
+                title TEXT,
+                company TEXT,
+                link TEXT,
+                content_hash TEXT NOT NULL,
+                record TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        ''')
+        # 詳細頁解析結果，content_hash 為抓取當時搜尋卡片內容的 card_hash
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS job_details (
+                job_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                details TEXT NOT NULL,
+                fetched_at TEXT NOT NULL
+            )
+        ''')
+        self.conn.commit()
+    
+    def known_ids(self, job_ids):
+        """
+        查詢哪些職缺 ID 已經在資料庫中
+        
+        Args:
+            job_ids (iterable): 職缺 ID
+        
+        Returns:
+            set: 已存在的職缺 ID
+        """
+        job_ids = list(job_ids)
+        known = set()
+        for start in range(0, len(job_ids), SQL_BATCH_SIZE):
+            batch = job_ids[start:start + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(
+                f'SELECT job_id FROM jobs WHERE job_id IN ({placeholders})', batch
+            )
+            known.update(row[0] for row in rows)
+        return known
+    
+    def get_hashes(self, job_ids):
+        """
+        取得職缺目前保存的內容雜湊
+        
+        Args:
+            job_ids (iterable): 職缺 ID
+        
+        Returns:
+            dict: 職缺 ID -> 內容雜湊
+        """
+        job_ids = list(job_ids)
+        hashes = {}
+        for start in range(0, len(job_ids), SQL_BATCH_SIZE):
+            batch = job_ids[start:start + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(
+                f'SELECT job_id, content_hash FROM jobs WHERE job_id IN ({placeholders})', batch
+            )
+            hashes.update(rows)
+        return hashes
+    
+    def upsert(self, records, keyword=None, seen_at=None):
+        """
+        新增或更新職缺：新職缺寫入首次出現時間，既有職缺更新最後出現時間，
+        內容有變更時才覆寫保存的資料
+        
+        Args:
+            records (list): (職缺 ID, 職缺資訊) 列表
+            keyword (str): 搜尋關鍵字
+            seen_at (str): 出現時間（ISO 格式），None 表示現在
+        
+        Returns:
+            dict: {'inserted': 新增數, 'updated': 內容變更數, 'unchanged': 未變更數}
+        """
+        seen_at = seen_at or datetime.now().isoformat(timespec='seconds')
+        existing = self.get_hashes(job_id for job_id, _ in records)
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        
+        rows = []
+        for job_id, job in records:
+            digest = content_hash(job)
+            if job_id not in existing:
+                stats['inserted'] += 1
+            elif existing[job_id] != digest:
+                stats['updated'] += 1
+            else:
+                stats['unchanged'] += 1
+            existing[job_id] = digest
+            rows.append((
+                job_id, keyword, job.get('title'), job.get('company'), job.get('link'),
+                digest, json.dumps(dict(job), ensure_ascii=False, default=str),
+                seen_at, seen_at, seen_at,
+            ))
+        
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO jobs (job_id, keyword, title, company, link, content_hash, record,
+                                  first_seen, last_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    keyword = COALESCE(excluded.keyword, jobs.keyword),
+                    title = CASE WHEN jobs.content_hash != excluded.content_hash
+                                 THEN excluded.title ELSE jobs.title END,
+                    company = CASE WHEN jobs.content_hash != excluded.content_hash
+                                   THEN excluded.company ELSE jobs.company END,
+                    link = CASE WHEN jobs.content_hash != excluded.content_hash
+                                THEN excluded.link ELSE jobs.link END,
+                    record = CASE WHEN jobs.content_hash != excluded.content_hash
+                                  THEN excluded.record ELSE jobs.record END,
+                    updated_at = CASE WHEN jobs.content_hash != excluded.content_hash
+                                      THEN excluded.updated_at ELSE jobs.updated_at END,
+                    content_hash = excluded.content_hash
+            ''', rows)
+        
+        return stats
+    
+    def get_details(self, job_ids):
+        """
+        取得已保存的詳細頁解析結果
+        
+        Args:
+            job_ids (iterable): 職缺 ID
+        
+        Returns:
+            dict: 職缺 ID -> (抓取時的 card_hash, 詳細頁欄位 dict)
+        """
+        job_ids = list(job_ids)
+        details = {}
+        for start in range(0, len(job_ids), SQL_BATCH_SIZE):
+            batch = job_ids[start:start + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(
+                f'SELECT job_id, content_hash, details FROM job_details WHERE job_id IN ({placeholders})',
+                batch
+            )
+            for job_id, digest, encoded in rows:
+                details[job_id] = (digest, json.loads(encoded))
+        return details
+    
+    def save_details(self, records, fetched_at=None):
+        """
+        保存詳細頁解析結果（同一職缺以最新一次為準）
+        
+        Args:
+            records (list): (職缺 ID, card_hash, 詳細頁欄位 dict) 列表
+            fetched_at (str): 抓取時間（ISO 格式），None 表示現在
+        """
+        fetched_at = fetched_at or datetime.now().isoformat(timespec='seconds')
+        rows = [(job_id, digest, json.dumps(details, ensure_ascii=False), fetched_at)
+                for job_id, digest, details in records]
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO job_details (job_id, content_hash, details, fetched_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    details = excluded.details,
+                    fetched_at = excluded.fetched_at
+            ''', rows)
+    
+    def get(self, job_id):
+        """
+        取得單一職缺的保存資料
+        
+        Args:
+            job_id (str): 職缺 ID
+        
+        Returns:
+            dict: 職缺資訊（含 first_seen / last_seen），不存在時返回 None
+        """
+        row = self.conn.execute(
+            'SELECT record, first_seen, last_seen FROM jobs WHERE job_id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = json.loads(row[0])
+        job['first_seen'] = row[1]
+        job['last_seen'] = row[2]
+        return job
+    
+    def count(self):
+        """取得資料庫中的職缺總數"""
+        return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
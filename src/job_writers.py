@@ -0,0 +1,119 @@
+import csv
+import json
+import os
+from datetime import datetime
+
+# 預設輸出目錄（專案根目錄下的 data/）
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# 輸出欄位順序，將要求條件放在前面
+COLUMN_ORDER = [
+    'index', 'title', 'company', 'industry', 'location', 'salary',
+    'education', 'department', 'experience', 'language', 'skills', 'additional',
+    'publish_date', 'relevance_score', 'summary', 'link', 'matched_keywords', 'cluster_id'
+]
+
+
+def build_output_path(keyword, extension='csv', output_dir=None, timestamp=None):
+    """
+    產生包含日期時間的輸出檔名：1111_<關鍵字>_<YYYYmmdd_HHMMSS>.<副檔名>
+    
+    Args:
+        keyword (str): 搜尋關鍵字
+        extension (str): 副檔名
+        output_dir (str): 輸出目錄，None 表示使用 data/
+        timestamp (datetime): 檔名時間，None 表示現在
+    
+    Returns:
+        str: 輸出檔案路徑
+    """
+    output_dir = output_dir or DATA_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = (timestamp or datetime.now()).strftime('%Y%m%d_%H%M%S')
+    return os.path.join(output_dir, f"1111_{keyword.replace(' ', '_')}_{stamp}.{extension}")
+
+
+class CsvJobWriter:
+    """以附加模式逐頁寫入 CSV，欄位順序固定"""
+    
+    def __init__(self, path, columns=None, encoding='utf-8-sig'):
+        """
+        開啟 CSV 檔案（已存在時接續寫入，不重複寫標題列）
+        
+        Args:
+            path (str): 輸出路徑
+            columns (list): 欄位順序，None 表示使用 COLUMN_ORDER
+            encoding (str): 檔案編碼，預設 UTF-8-BOM 方便 Excel 開啟
+        """
+        self.path = path
+        self.columns = list(columns or COLUMN_ORDER)
+        self.count = 0
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'a', newline='', encoding=encoding)
+        self.writer = csv.DictWriter(self.file, fieldnames=self.columns,
+                                     restval='', extrasaction='ignore')
+        if write_header:
+            self.writer.writeheader()
+            self.file.flush()
+    
+    def write(self, jobs):
+        """
+        寫入一頁職缺並立即 flush 到磁碟
+        
+        Args:
+            jobs (list): 職缺資訊列表
+        """
+        self.writer.writerows(jobs)
+        self.file.flush()
+        self.count += len(jobs)
+    
+    def close(self):
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JsonlJobWriter:
+    """以附加模式逐頁寫入 JSON Lines，每行一筆職缺，鍵值順序固定"""
+    
+    def __init__(self, path, columns=None):
+        """
+        開啟 JSONL 檔案
+        
+        Args:
+            path (str): 輸出路徑
+            columns (list): 欄位順序，None 表示使用 COLUMN_ORDER；不在清單中的欄位附加在後面
+        """
+        self.path = path
+        self.columns = list(columns or COLUMN_ORDER)
+        self.count = 0
+        self.file = open(path, 'a', encoding='utf-8')
+    
+    def write(self, jobs):
+        """
+        寫入一頁職缺並立即 flush 到磁碟
+        
+        Args:
+            jobs (list): 職缺資訊列表
+        """
+        lines = []
+        for job in jobs:
+            record = {column: job[column] for column in self.columns if column in job}
+            record.update((key, value) for key, value in job.items() if key not in record)
+            lines.append(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.writelines(lines)
+        self.file.flush()
+        self.count += len(jobs)
+    
+    def close(self):
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
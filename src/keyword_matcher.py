@@ -0,0 +1,80 @@
+from collections import deque
+
+
+class KeywordMatcher:
+    """Aho-Corasick 多關鍵字比對器：建立一次，之後只需走訪文字一次即可找出所有關鍵字"""
+    
+    def __init__(self, keywords, ignore_case=False):
+        """
+        建立比對自動機
+        
+        Args:
+            keywords (iterable): 關鍵字（純文字，不是正規表示式）
+            ignore_case (bool): 是否忽略大小寫
+        """
+        self.ignore_case = ignore_case
+        self.keywords = list(dict.fromkeys(keywords))
+        
+        # goto[state] 為字元 -> 下一個狀態；fail 為失敗轉移；output 為到達該狀態時命中的關鍵字
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [frozenset()]
+        
+        for keyword in self.keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in (keyword.lower() if ignore_case else keyword):
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(frozenset())
+                    self.goto[state][char] = next_state
+                state = next_state
+            self.output[state] = self.output[state] | {keyword}
+        
+        self._build_failure_links()
+    
+    def _build_failure_links(self):
+        """以廣度優先建立失敗轉移，並把後綴狀態的命中關鍵字合併進來"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] | self.output[self.fail[next_state]]
+    
+    def find_all(self, text):
+        """
+        找出文字中出現的所有關鍵字
+        
+        Args:
+            text (str): 要比對的文字
+        
+        Returns:
+            set: 出現過的關鍵字（保留建立時的原始寫法）
+        """
+        if self.ignore_case:
+            text = text.lower()
+        
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        found = set()
+        
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        
+        return found
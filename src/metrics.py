@@ -0,0 +1,269 @@
+import bisect
+import contextlib
+import json
+import math
+import threading
+import time
+
+# 預設的延遲分組（秒）
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 回應大小分組（位元組）
+SIZE_BUCKETS = (1024, 10 * 1024, 50 * 1024, 100 * 1024, 250 * 1024, 500 * 1024, 1024 * 1024, 5 * 1024 * 1024)
+
+# 各直方圖使用的分組，沒有列出的使用 LATENCY_BUCKETS
+HISTOGRAM_BUCKETS = {
+    'response_bytes': SIZE_BUCKETS,
+}
+
+# 指標說明（輸出 Prometheus 格式時作為 HELP）
+METRIC_HELP = {
+    'fetch_seconds': '每次 HTTP 請求的耗時',
+    'response_bytes': '回應內容大小',
+    'http_responses_total': '依狀態碼統計的回應數',
+    'fetch_errors_total': '逾時、連線錯誤與其他請求錯誤次數',
+    'retries_total': '重試次數',
+    'cache_total': '回應快取的使用結果',
+    'parse_page_seconds': '每頁解析耗時',
+    'cards_total': '找到的職缺卡片數',
+    'jobs_total': '解析出的職缺數',
+    'duplicate_cards_total': '因職缺 ID 重複而略過的卡片數',
+    'card_errors_total': '解析失敗的卡片數',
+    'extractor_seconds': '各擷取步驟每張卡片的耗時',
+    'extraction_path_total': '各欄位實際使用的選擇器或規則',
+    'archived_pages_total': '寫入原始頁面封存的頁數',
+}
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    items = list(key) + list(extra or [])
+    if not items:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in items)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + '}'
+
+
+class Histogram:
+    """固定分組的直方圖（記錄次數、總和與各分組的累計次數）"""
+    
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+    
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def merge(self, other):
+        """
+        把另一個分組相同的直方圖加進來
+        
+        Args:
+            other (Histogram): 要合併的直方圖
+        """
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+    
+    def cumulative(self):
+        """
+        各分組上限與小於等於該上限的累計次數
+        
+        Returns:
+            list: (上限, 累計次數) 列表，最後一組上限為 +Inf
+        """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Metrics:
+    """執行緒安全的計數器與直方圖，可匯出為 JSON 或 Prometheus 文字格式"""
+    
+    def __init__(self, prefix='job1111'):
+        """
+        建立指標集合
+        
+        Args:
+            prefix (str): 匯出時加在指標名稱前的前綴
+        """
+        self.prefix = prefix
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+    
+    def inc(self, name, amount=1, **labels):
+        """
+        增加計數器
+        
+        Args:
+            name (str): 指標名稱
+            amount (float): 增加量
+            **labels: 標籤，例如 status='200'
+        """
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def observe(self, name, value, **labels):
+        """
+        記錄一筆直方圖數值
+        
+        Args:
+            name (str): 指標名稱
+            value (float): 數值（秒數、位元組等）
+            **labels: 標籤
+        """
+        key = (name, _label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(HISTOGRAM_BUCKETS.get(name, LATENCY_BUCKETS))
+                self.histograms[key] = histogram
+            histogram.observe(value)
+    
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        """
+        量測區塊耗時並記錄到直方圖
+        
+        Args:
+            name (str): 指標名稱
+            **labels: 標籤
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def reset(self):
+        """清除所有指標"""
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+    
+    def drain(self):
+        """
+        取出目前所有指標並清空（解析行程把每個工作的增量傳回主行程用）
+        
+        Returns:
+            dict: {'counters': {...}, 'histograms': {...}}，可傳給 merge
+        """
+        with self.lock:
+            delta = {'counters': self.counters, 'histograms': self.histograms}
+            self.counters = {}
+            self.histograms = {}
+        return delta
+    
+    def merge(self, delta):
+        """
+        加入 drain 取出的指標（計數器相加、直方圖合併）
+        
+        Args:
+            delta (dict): drain 的返回值
+        """
+        with self.lock:
+            for key, value in delta['counters'].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, histogram in delta['histograms'].items():
+                existing = self.histograms.get(key)
+                if existing is None:
+                    self.histograms[key] = histogram
+                else:
+                    existing.merge(histogram)
+    
+    def snapshot(self):
+        """
+        取得目前所有指標
+        
+        Returns:
+            dict: {'counters': [...], 'histograms': [...]}，每筆包含名稱、標籤與數值
+        """
+        with self.lock:
+            counters = [
+                {'name': name, 'labels': dict(key), 'value': value}
+                for (name, key), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(key),
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'buckets': [[bound if bound != math.inf else '+Inf', count]
+                                for bound, count in histogram.cumulative()],
+                }
+                for (name, key), histogram in sorted(self.histograms.items())
+            ]
+        return {'counters': counters, 'histograms': histograms}
+    
+    def to_json(self, indent=2):
+        """
+        匯出為 JSON 字串
+        
+        Args:
+            indent (int): 縮排
+        
+        Returns:
+            str: JSON 內容
+        """
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=indent)
+    
+    def to_prometheus(self):
+        """
+        匯出為 Prometheus 文字格式
+        
+        Returns:
+            str: 指標內容
+        """
+        lines = []
+        with self.lock:
+            counter_names = sorted({name for name, _ in self.counters})
+            for name in counter_names:
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full_name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {full_name} counter")
+                for (metric, key), value in sorted(self.counters.items()):
+                    if metric == name:
+                        lines.append(f"{full_name}{_format_labels(key)} {value}")
+            
+            histogram_names = sorted({name for name, _ in self.histograms})
+            for name in histogram_names:
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full_name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {full_name} histogram")
+                for (metric, key), histogram in sorted(self.histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, count in histogram.cumulative():
+                        le = '+Inf' if bound == math.inf else repr(float(bound))
+                        lines.append(f"{full_name}_bucket{_format_labels(key, [('le', le)])} {count}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {histogram.sum}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+    
+    def export(self, path):
+        """
+        把指標寫入檔案：副檔名為 .json 時輸出 JSON，否則輸出 Prometheus 文字格式
+        
+        Args:
+            path (str): 輸出路徑
+        """
+        content = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
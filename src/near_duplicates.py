@@ -0,0 +1,343 @@
+import argparse
+import itertools
+import re
+import sys
+import time
+import zlib
+
+import html_backends
+
+# 計算相似度使用的欄位
+DEDUPE_COLUMNS = ['title', 'company', 'summary']
+
+# 字元 shingle 長度
+SHINGLE_SIZE = 3
+
+# MinHash 雜湊函數個數與 LSH 分組：16 組 x 4 列，相似度約 0.5 以上的職缺就會成為候選
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = 4
+MINHASH_SEED = 1111
+
+# 候選職缺的 shingle Jaccard 相似度達到此值才視為近似重複
+SIMILARITY_THRESHOLD = 0.7
+
+# 每批計算 MinHash 的職缺數（限制暫存陣列的大小）
+CHUNK_SIZE = 20000
+
+# 卡片文字開頭的發布日期（例如「10 / 28」），同一職缺重新刊登時會不同
+DATE_PREFIX_RE = re.compile(r'^\s*\d{1,2}\s*/\s*\d{1,2}')
+
+# 比對前移除的字元：標點、空白與數字（日期、應徵人數、編號）
+NOISE_RE = re.compile(r'[\W\d_]+')
+
+
+def normalize_text(*parts):
+    """
+    把標題、公司、摘要合併成比對用的文字：去除開頭日期、標點、空白與數字並轉小寫
+    
+    Args:
+        *parts (str): 欄位內容，None 視為空字串
+    
+    Returns:
+        str: 正規化後的文字
+    """
+    cleaned = []
+    for part in parts:
+        if not isinstance(part, str) or part == 'N/A':
+            continue
+        cleaned.append(NOISE_RE.sub('', DATE_PREFIX_RE.sub('', part)).lower())
+    return ''.join(cleaned)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    取出文字的字元 shingle 雜湊值（CRC32，跨行程結果相同）
+    
+    Args:
+        text (str): 正規化後的文字
+        size (int): shingle 長度
+    
+    Returns:
+        set: shingle 雜湊值，文字為空時為空集合
+    """
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8'))} if text else set()
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+
+def jaccard(left, right):
+    """兩個集合的 Jaccard 相似度"""
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def minhash_signatures(shingle_sets, num_perm=NUM_PERM, seed=MINHASH_SEED):
+    """
+    以向量化運算計算 MinHash 簽章
+    
+    所有 shingle 串成一個陣列，每個雜湊函數（multiply-shift）算一次後以
+    np.minimum.reduceat 依職缺取最小值，不需要逐筆迴圈。
+    
+    Args:
+        shingle_sets (list): 每個職缺的 shingle 雜湊集合
+        num_perm (int): 雜湊函數個數
+        seed (int): 亂數種子，相同種子產生相同的簽章
+    
+    Returns:
+        numpy.ndarray: (職缺數, num_perm) 的 uint32 陣列；沒有 shingle 的職缺全部為最大值
+    """
+    import numpy as np
+    
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    increments = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    
+    lengths = np.fromiter((len(shingle_set) for shingle_set in shingle_sets), dtype=np.int64,
+                          count=len(shingle_sets))
+    values = np.fromiter(itertools.chain.from_iterable(shingle_sets), dtype=np.uint64,
+                         count=int(lengths.sum()))
+    signatures = np.full((len(shingle_sets), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    nonempty = lengths > 0
+    if not nonempty.any():
+        return signatures
+    
+    offsets = (np.cumsum(lengths) - lengths)[nonempty]
+    shift = np.uint64(32)
+    with np.errstate(over='ignore'):
+        for i in range(num_perm):
+            hashed = ((values * multipliers[i] + increments[i]) >> shift).astype(np.uint32)
+            signatures[nonempty, i] = np.minimum.reduceat(hashed, offsets)
+    return signatures
+
+
+def band_keys(signatures, bands=LSH_BANDS, rows=LSH_ROWS):
+    """
+    把簽章切成 bands 組，每組 rows 個值合併成一個 64 位元的桶子編號
+    
+    Args:
+        signatures (numpy.ndarray): MinHash 簽章
+        bands (int): 分組數
+        rows (int): 每組的值個數
+    
+    Returns:
+        numpy.ndarray: (職缺數, bands) 的 uint64 陣列
+    """
+    import numpy as np
+    
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    prime = np.uint64(1099511628211)
+    with np.errstate(over='ignore'):
+        for band in range(bands):
+            block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+            key = np.full(len(signatures), band, dtype=np.uint64)
+            for column in range(rows):
+                key = key * prime ^ block[:, column]
+            keys[:, band] = key
+    return keys
+
+
+def candidate_pairs(keys, valid):
+    """
+    找出至少一組桶子編號相同的職缺配對（同一個桶子內的職缺全部兩兩配對）
+    
+    Args:
+        keys (numpy.ndarray): band_keys 的結果
+        valid (numpy.ndarray): 有 shingle 的職缺（bool 陣列），其餘不參與配對
+    
+    Returns:
+        numpy.ndarray: (配對數, 2) 的列編號陣列，每列前者小於後者
+    """
+    import numpy as np
+    
+    rows = np.flatnonzero(valid)
+    pairs = []
+    for band in range(keys.shape[1]):
+        column = keys[rows, band]
+        order = np.argsort(column, kind='stable')
+        ordered = column[order]
+        # 排序後每個位置之後還有幾個同桶子的職缺
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        sizes = np.diff(np.r_[starts, len(ordered)])
+        positions = np.arange(len(ordered)) - np.repeat(starts, sizes)
+        remaining = np.repeat(sizes, sizes) - positions - 1
+        # 依距離 d 配對第 i 個與第 i + d 個，只保留後面還有 d 個以上同桶子職缺的位置
+        candidates = np.flatnonzero(remaining > 0)
+        distance = 1
+        while len(candidates):
+            pairs.append(np.stack([rows[order[candidates]], rows[order[candidates + distance]]], axis=1))
+            distance += 1
+            candidates = candidates[remaining[candidates] >= distance]
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def find_clusters(texts, threshold=SIMILARITY_THRESHOLD):
+    """
+    以 MinHash + LSH 把近似重複的職缺分成群組
+    
+    只比對 LSH 找出的候選配對（不做全部兩兩比較），再以 shingle 的 Jaccard
+    相似度確認，相連的配對併成同一群（union-find），群組代表之間也必須相似。
+    
+    Args:
+        texts (list): normalize_text 處理過的文字
+        threshold (float): Jaccard 相似度門檻
+    
+    Returns:
+        tuple: (每列所屬群組代表的列編號列表, 統計 dict：candidates / matched)
+    """
+    import numpy as np
+    
+    count = len(texts)
+    # 文字完全相同的職缺直接併入第一次出現的職缺，只有不重複的文字參與 LSH，
+    # 同一個桶子不會因為大量相同的職缺而產生過多配對
+    first_rows = {}
+    duplicates = []
+    for row, text in enumerate(texts):
+        if not text:
+            continue
+        first = first_rows.setdefault(text, row)
+        if first != row:
+            duplicates.append((row, first))
+    
+    keys = np.zeros((count, LSH_BANDS), dtype=np.uint64)
+    valid = np.zeros(count, dtype=bool)
+    for start in range(0, count, CHUNK_SIZE):
+        chunk = texts[start:start + CHUNK_SIZE]
+        shingle_sets = [shingles(text) if first_rows.get(text) == start + offset else set()
+                        for offset, text in enumerate(chunk)]
+        signatures = minhash_signatures(shingle_sets)
+        keys[start:start + len(shingle_sets)] = band_keys(signatures)
+        valid[start:start + len(shingle_sets)] = [bool(shingle_set) for shingle_set in shingle_sets]
+    
+    pairs = candidate_pairs(keys, valid)
+    
+    # 群組代表一律是較早出現（列編號較小）的職缺
+    parent = list(range(count))
+    
+    def find(row):
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+    
+    cache = {}
+    
+    def shingles_of(row):
+        if row not in cache:
+            cache[row] = shingles(texts[row])
+        return cache[row]
+    
+    def similar(left, right):
+        return texts[left] == texts[right] or jaccard(shingles_of(left), shingles_of(right)) >= threshold
+    
+    for row, first in duplicates:
+        parent[row] = first
+    
+    matched = len(duplicates)
+    for left, right in pairs.tolist():
+        left_root, right_root = find(left), find(right)
+        if left_root == right_root or not similar(left, right):
+            continue
+        # 兩群的代表也要相似才合併，避免 A~B、B~C 一路串接把不相干的職缺併在一起
+        if (left_root, right_root) != (left, right) and not similar(left_root, right_root):
+            continue
+        matched += 1
+        parent[max(left_root, right_root)] = min(left_root, right_root)
+    
+    return [find(row) for row in range(count)], {'candidates': len(pairs), 'matched': matched}
+
+
+def add_cluster_column(df, threshold=SIMILARITY_THRESHOLD):
+    """
+    為資料框加上 cluster_id 欄位：同一群近似重複的職缺有相同的 cluster_id
+    
+    cluster_id 為群組中最早出現的職缺 ID（取自 link），沒有連結時為該職缺的列編號。
+    
+    Args:
+        df (pandas.DataFrame): 職缺資料框（需要 title / company / summary，link 可選）
+        threshold (float): Jaccard 相似度門檻
+    
+    Returns:
+        pandas.DataFrame: 加上 cluster_id 的新資料框
+    """
+    columns = [df[column].tolist() if column in df.columns else [None] * len(df)
+               for column in DEDUPE_COLUMNS]
+    texts = [normalize_text(*parts) for parts in zip(*columns)]
+    roots, _ = find_clusters(texts, threshold)
+    
+    links = df['link'].tolist() if 'link' in df.columns else [None] * len(df)
+    representatives = {}
+    cluster_ids = []
+    for root in roots:
+        if root not in representatives:
+            job_id = html_backends.job_id_from_link(links[root] if isinstance(links[root], str) else None)
+            representatives[root] = job_id or str(root)
+        cluster_ids.append(representatives[root])
+    
+    df = df.copy()
+    df['cluster_id'] = cluster_ids
+    return df
+
+
+def assign_clusters(jobs, threshold=SIMILARITY_THRESHOLD):
+    """
+    為職缺列表就地加上 cluster_id 欄位
+    
+    Args:
+        jobs (list): 職缺資訊列表
+        threshold (float): Jaccard 相似度門檻
+    
+    Returns:
+        int: 群組數（不重複的職缺數）
+    """
+    texts = [normalize_text(*(job.get(column) for column in DEDUPE_COLUMNS)) for job in jobs]
+    roots, _ = find_clusters(texts, threshold)
+    for job, root in zip(jobs, roots):
+        job['cluster_id'] = html_backends.job_id_from_link(jobs[root].get('link')) or str(root)
+    return len(set(roots))
+
+
+def main(argv=None):
+    """
+    找出歷史資料中的近似重複職缺
+    
+    Returns:
+        int: 結束代碼
+    """
+    import job_analysis
+    
+    parser = argparse.ArgumentParser(description="以 MinHash / LSH 找出近似重複的職缺")
+    parser.add_argument('source', help="CSV 路徑或 glob，例如 'data/*.csv'")
+    parser.add_argument('--threshold', type=float, default=SIMILARITY_THRESHOLD, help="Jaccard 相似度門檻")
+    parser.add_argument('--output', help="把加上 cluster_id 的資料寫入 CSV")
+    parser.add_argument('--top', type=int, default=5, help="列出最大的幾個群組")
+    args = parser.parse_args(argv)
+    
+    df = job_analysis.load_frame(args.source)
+    if df.empty:
+        print("沒有職缺資料")
+        return 1
+    
+    started = time.perf_counter()
+    df = add_cluster_column(df, args.threshold)
+    elapsed = time.perf_counter() - started
+    clusters = df['cluster_id'].nunique()
+    print(f"{len(df)} 筆職缺，{clusters} 個群組，近似重複 {len(df) - clusters} 筆（{elapsed:.2f} 秒）")
+    
+    sizes = df['cluster_id'].value_counts()
+    for cluster_id, size in sizes[sizes > 1].head(args.top).items():
+        titles = df.loc[df['cluster_id'] == cluster_id, 'title'].astype(str).unique()
+        print(f"   {cluster_id}: {size} 筆 - {' / '.join(titles[:3])}")
+    
+    if args.output:
+        df.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"已儲存到 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
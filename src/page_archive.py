@@ -0,0 +1,523 @@
+import argparse
+import functools
+import gzip
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from job_writers import DATA_DIR
+
+# 預設封存目錄：pages.bin 存放頁面，pages.idx 為固定長度的偏移索引
+DEFAULT_ARCHIVE_DIR = os.path.join(DATA_DIR, 'archive')
+DATA_FILE = 'pages.bin'
+INDEX_FILE = 'pages.idx'
+
+# 索引檔開頭的識別碼（含格式版本）
+INDEX_MAGIC = b'JOBPGIX1'
+
+# 索引項目：資料偏移、中繼資料長度、壓縮後長度、原始長度、抓取時間、狀態碼、壓縮方式
+INDEX_ENTRY = struct.Struct('<QIIIdHBx')
+
+# 壓縮方式
+CODEC_NONE = 0
+CODEC_GZIP = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {'none': CODEC_NONE, 'gzip': CODEC_GZIP, 'zstd': CODEC_ZSTD}
+
+# 壓縮等級
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# 重新解析時每個工作單位的頁數
+REPARSE_CHUNK_SIZE = 16
+
+# 重新解析的預設輸出目錄（與原本的輸出分開，同名檔案會被覆寫）
+DEFAULT_REPARSE_DIR = os.path.join(DATA_DIR, 'reparsed')
+
+
+@functools.lru_cache(maxsize=None)
+def _zstd_module():
+    """取得可用的 zstd 實作：zstandard 套件優先，其次為 pyarrow 內建的 codec，都沒有時為 None（結果會快取）"""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        pass
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow if pyarrow.Codec.is_available('zstd') else None
+
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow_zstd(level):
+    """pyarrow 的 zstd codec（建立成本不低，每個壓縮等級只建立一次）"""
+    return _zstd_module().Codec('zstd', compression_level=level)
+
+
+def default_codec():
+    """有 zstd 時使用 zstd，否則使用 gzip"""
+    return CODEC_ZSTD if _zstd_module() is not None else CODEC_GZIP
+
+
+def compress(data, codec):
+    """
+    壓縮單一頁面
+    
+    Args:
+        data (bytes): 原始內容
+        codec (int): 壓縮方式
+    
+    Returns:
+        bytes: 壓縮後的內容
+    """
+    if codec == CODEC_GZIP:
+        return gzip.compress(data, GZIP_LEVEL, mtime=0)
+    if codec == CODEC_ZSTD:
+        module = _zstd_module()
+        if module is None:
+            raise RuntimeError("未安裝 zstandard 或 pyarrow，無法使用 zstd")
+        if module.__name__ == 'zstandard':
+            return module.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        return _pyarrow_zstd(ZSTD_LEVEL).compress(data, asbytes=True)
+    return bytes(data)
+
+
+def decompress(data, codec, size):
+    """
+    解壓縮單一頁面
+    
+    Args:
+        data (bytes): 壓縮後的內容
+        codec (int): 壓縮方式
+        size (int): 原始長度
+    
+    Returns:
+        bytes: 原始內容
+    """
+    if codec == CODEC_GZIP:
+        return gzip.decompress(data)
+    if codec == CODEC_ZSTD:
+        module = _zstd_module()
+        if module is None:
+            raise RuntimeError("未安裝 zstandard 或 pyarrow，無法讀取 zstd 封存")
+        if module.__name__ == 'zstandard':
+            return module.ZstdDecompressor().decompress(data, max_output_size=size)
+        return _pyarrow_zstd(ZSTD_LEVEL).decompress(data, decompressed_size=size, asbytes=True)
+    return bytes(data)
+
+
+class PageArchive:
+    """
+    只附加的原始頁面封存：每頁個別壓縮後接在 pages.bin 後面，pages.idx 記錄每頁的位置
+    
+    索引是固定長度的項目，以 mmap 讀取，第 i 頁的位置只需一次 unpack_from；
+    中繼資料（網址、關鍵字、頁碼、種類、抓取時間、狀態碼）以 JSON 存在壓縮內容之前，
+    篩選頁面時不需要解壓縮。寫入時先寫資料再寫索引，中途中斷的項目在下次開啟時截掉。
+    """
+    
+    def __init__(self, root=None, codec=None, readonly=False):
+        """
+        開啟封存目錄（不存在時建立）
+        
+        Args:
+            root (str): 封存目錄，None 表示使用 data/archive
+            codec (int | str): 新頁面的壓縮方式（zstd / gzip / none），None 表示有 zstd 時使用 zstd
+            readonly (bool): 唯讀開啟（重新解析的工作行程使用），不修復也不寫入
+        """
+        self.root = root or DEFAULT_ARCHIVE_DIR
+        self.data_path = os.path.join(self.root, DATA_FILE)
+        self.index_path = os.path.join(self.root, INDEX_FILE)
+        self.codec = CODEC_NAMES.get(codec, codec)
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        self._data_map = None
+        self._index_map = None
+        
+        if readonly:
+            self.data_file = open(self.data_path, 'rb')
+            self.index_file = open(self.index_path, 'rb')
+            if self.index_file.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f"不是頁面封存索引: {self.index_path}")
+        else:
+            os.makedirs(self.root, exist_ok=True)
+            self.data_file = open(self.data_path, 'a+b')
+            self.index_file = open(self.index_path, 'a+b')
+            self._recover()
+    
+    def _recover(self):
+        """截掉上次中斷時寫到一半的索引項目與資料"""
+        self.index_file.seek(0, os.SEEK_END)
+        size = self.index_file.tell()
+        if size == 0:
+            self.index_file.write(INDEX_MAGIC)
+            self.index_file.flush()
+            size = len(INDEX_MAGIC)
+        self.index_file.seek(0)
+        if self.index_file.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+            raise ValueError(f"不是頁面封存索引: {self.index_path}")
+        
+        count = (size - len(INDEX_MAGIC)) // INDEX_ENTRY.size
+        data_size = os.path.getsize(self.data_path)
+        end = 0
+        while count:
+            self.index_file.seek(len(INDEX_MAGIC) + (count - 1) * INDEX_ENTRY.size)
+            offset, meta_length, body_length = INDEX_ENTRY.unpack(self.index_file.read(INDEX_ENTRY.size))[:3]
+            end = offset + meta_length + body_length
+            if end <= data_size:
+                break
+            count -= 1
+            end = 0
+        self.index_file.truncate(len(INDEX_MAGIC) + count * INDEX_ENTRY.size)
+        self.data_file.truncate(end)
+        self.index_file.seek(0, os.SEEK_END)
+        self.data_file.seek(0, os.SEEK_END)
+    
+    def __len__(self):
+        size = os.fstat(self.index_file.fileno()).st_size
+        return max(size - len(INDEX_MAGIC), 0) // INDEX_ENTRY.size
+    
+    def append(self, body, url, keyword=None, page=None, status=200, kind='search', fetched_at=None):
+        """
+        封存一個頁面（多執行緒可同時呼叫）
+        
+        Args:
+            body (str): 回應內容
+            url (str): 請求網址
+            keyword (str): 搜尋關鍵字，詳細頁為 None
+            page (int): 搜尋結果頁碼，詳細頁為 None
+            status (int): HTTP 狀態碼
+            kind (str): 頁面種類（search / detail）
+            fetched_at (float): 抓取時間（epoch 秒），None 表示現在
+        
+        Returns:
+            int: 頁面在封存中的編號
+        """
+        if self.readonly:
+            raise ValueError("唯讀開啟的封存不能寫入")
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        meta = json.dumps({
+            'url': url, 'keyword': keyword, 'page': page, 'kind': kind,
+            'status': status, 'fetched_at': fetched_at,
+        }, ensure_ascii=False).encode('utf-8')
+        raw = (body or '').encode('utf-8')
+        codec = default_codec() if self.codec is None else self.codec
+        compressed = compress(raw, codec)
+        
+        with self._lock:
+            offset = self.data_file.tell()
+            self.data_file.write(meta)
+            self.data_file.write(compressed)
+            self.data_file.flush()
+            self.index_file.write(INDEX_ENTRY.pack(offset, len(meta), len(compressed), len(raw),
+                                                   fetched_at, status, codec))
+            self.index_file.flush()
+            return len(self) - 1
+    
+    def _map(self, name, file, needed):
+        """取得涵蓋 needed 位元組的唯讀 mmap，檔案變大時重新對應"""
+        current = getattr(self, name)
+        if current is None or len(current) < needed:
+            if current is not None:
+                current.close()
+            current = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            setattr(self, name, current)
+        return current
+    
+    def entry(self, number):
+        """
+        讀取索引項目
+        
+        Args:
+            number (int): 頁面編號
+        
+        Returns:
+            tuple: (偏移, 中繼資料長度, 壓縮後長度, 原始長度, 抓取時間, 狀態碼, 壓縮方式)
+        """
+        if not 0 <= number < len(self):
+            raise IndexError(number)
+        position = len(INDEX_MAGIC) + number * INDEX_ENTRY.size
+        index_map = self._map('_index_map', self.index_file, position + INDEX_ENTRY.size)
+        return INDEX_ENTRY.unpack_from(index_map, position)
+    
+    def iter_entries(self):
+        """
+        依序走訪所有索引項目（一次讀出整段索引，不逐筆查詢）
+        
+        Yields:
+            tuple: (頁面編號, 索引項目)
+        """
+        count = len(self)
+        if not count:
+            return
+        end = len(INDEX_MAGIC) + count * INDEX_ENTRY.size
+        index_map = self._map('_index_map', self.index_file, end)
+        yield from enumerate(INDEX_ENTRY.iter_unpack(index_map[len(INDEX_MAGIC):end]))
+    
+    def metadata(self, number):
+        """
+        讀取頁面的中繼資料（不解壓縮內容）
+        
+        Args:
+            number (int): 頁面編號
+        
+        Returns:
+            dict: url / keyword / page / kind / status / fetched_at
+        """
+        offset, meta_length = self.entry(number)[:2]
+        data_map = self._map('_data_map', self.data_file, offset + meta_length)
+        return json.loads(data_map[offset:offset + meta_length])
+    
+    def read(self, number):
+        """
+        讀取頁面
+        
+        Args:
+            number (int): 頁面編號
+        
+        Returns:
+            tuple: (中繼資料 dict, 內容 str)
+        """
+        offset, meta_length, body_length, raw_length, _, _, codec = self.entry(number)
+        end = offset + meta_length + body_length
+        data_map = self._map('_data_map', self.data_file, end)
+        meta = json.loads(data_map[offset:offset + meta_length])
+        body = decompress(data_map[offset + meta_length:end], codec, raw_length)
+        return meta, body.decode('utf-8')
+    
+    def select(self, kind=None, keywords=None, since=None, until=None, status=200):
+        """
+        依條件找出頁面編號（抓取時間與狀態碼直接從索引判斷）
+        
+        Args:
+            kind (str): 頁面種類，None 表示全部
+            keywords (list): 只選這些關鍵字，None 表示全部
+            since (float): 抓取時間下限（epoch 秒，含）
+            until (float): 抓取時間上限（epoch 秒，不含）
+            status (int): 狀態碼，None 表示全部
+        
+        Returns:
+            list: 頁面編號（依封存順序）
+        """
+        wanted = set(keywords) if keywords else None
+        numbers = []
+        for number, (_, _, _, _, fetched_at, page_status, _) in self.iter_entries():
+            if status is not None and page_status != status:
+                continue
+            if (since is not None and fetched_at < since) or (until is not None and fetched_at >= until):
+                continue
+            if kind is not None or wanted is not None:
+                meta = self.metadata(number)
+                if kind is not None and meta.get('kind') != kind:
+                    continue
+                if wanted is not None and meta.get('keyword') not in wanted:
+                    continue
+            numbers.append(number)
+        return numbers
+    
+    def stats(self):
+        """
+        封存統計
+        
+        Returns:
+            dict: pages / compressed_bytes / raw_bytes / keywords（關鍵字 -> 頁數）/ kinds
+        """
+        result = {'pages': len(self), 'compressed_bytes': 0, 'raw_bytes': 0, 'keywords': {}, 'kinds': {}}
+        for number, (_, meta_length, body_length, raw_length, _, _, _) in self.iter_entries():
+            result['compressed_bytes'] += meta_length + body_length
+            result['raw_bytes'] += raw_length
+            meta = self.metadata(number)
+            for key, value in (('keywords', meta.get('keyword')), ('kinds', meta.get('kind'))):
+                if value is not None:
+                    result[key][value] = result[key].get(value, 0) + 1
+        return result
+    
+    def close(self):
+        for current in (self._data_map, self._index_map):
+            if current is not None:
+                current.close()
+        self._data_map = self._index_map = None
+        self.data_file.close()
+        self.index_file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_date(value, end=False):
+    """把 YYYY-MM-DD 轉成 epoch 秒；end=True 時為隔天 0 點（不含）"""
+    if not value:
+        return None
+    timestamp = datetime.strptime(value, '%Y-%m-%d').timestamp()
+    return timestamp + 86400 if end else timestamp
+
+
+def chunked(numbers, size=REPARSE_CHUNK_SIZE):
+    """把頁面編號切成固定大小的工作單位"""
+    iterator = iter(numbers)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def reparse(root=None, keywords=None, since=None, until=None, formats=('csv',), output_dir=None,
+            parser='html.parser', workers=None, details=False):
+    """
+    以目前的解析程式重新解析封存的搜尋結果頁，重新產生職缺資料（不連網）
+    
+    工作行程各自以 mmap 讀取封存，主行程只傳遞頁面編號、接收職缺資料。
+    頁面依關鍵字與抓取日期分組，每組輸出一個檔案，檔名時間為該組第一頁的抓取時間
+    （與原本每次爬取的輸出一樣可依日期彙總）；同一組內以職缺 ID 去除重複。
+    
+    Args:
+        root (str): 封存目錄
+        keywords (list): 只重新解析這些關鍵字，None 表示全部
+        since (str): 抓取日期下限 YYYY-MM-DD（含）
+        until (str): 抓取日期上限 YYYY-MM-DD（含）
+        formats (list): 輸出格式（csv / jsonl）
+        output_dir (str): 輸出目錄，None 表示使用 data/reparsed；同名檔案會被覆寫
+        parser (str): HTML 解析後端
+        workers (int): 解析行程數，None 表示使用全部 CPU 核心
+        details (bool): 是否一併重新解析封存的詳細頁，並補到對應的職缺
+    
+    Returns:
+        dict: {'pages': 頁數, 'jobs': 職缺數, 'files': 輸出檔案列表, 'seconds': 耗時}
+    """
+    import html_backends
+    import parse_worker
+    from job_writers import build_output_path
+    
+    started = time.perf_counter()
+    root = root or DEFAULT_ARCHIVE_DIR
+    output_dir = output_dir or DEFAULT_REPARSE_DIR
+    module = parse_worker.load_crawler_module()
+    with PageArchive(root, readonly=True) as archive:
+        pages = archive.select('search', keywords, parse_date(since), parse_date(until, end=True))
+        detail_pages = archive.select('detail', None, parse_date(since), parse_date(until, end=True)) if details else []
+    
+    # (關鍵字, 抓取日期) -> 輸出器、已寫入的職缺 ID、職缺數
+    writers = {}
+    seen = {}
+    counts = {}
+    stats = {'pages': 0, 'jobs': 0, 'files': [], 'seconds': 0.0}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                             initializer=parse_worker.init_worker, initargs=(parser,)) as executor:
+        # 詳細頁先解析，之後依職缺 ID 補到搜尋結果：優先使用同一天抓取的詳細頁，
+        # 沒有時使用最後抓取的
+        job_details = {}
+        latest_details = {}
+        for results in executor.map(parse_worker.parse_archived, itertools.repeat(root),
+                                    chunked(detail_pages), itertools.repeat('detail')):
+            for _, meta, detail in results:
+                job_id = html_backends.job_id_from_link(meta.get('url'))
+                if job_id is not None:
+                    day = datetime.fromtimestamp(meta['fetched_at']).date()
+                    job_details[(job_id, day)] = detail
+                    latest_details[job_id] = detail
+        
+        try:
+            for results in executor.map(parse_worker.parse_archived, itertools.repeat(root),
+                                        chunked(pages), itertools.repeat('search')):
+                for _, meta, jobs in results:
+                    stats['pages'] += 1
+                    keyword = meta.get('keyword') or 'archive'
+                    fetched_at = datetime.fromtimestamp(meta['fetched_at'])
+                    group = (keyword, fetched_at.date())
+                    if group not in writers:
+                        writers[group] = []
+                        for fmt in formats:
+                            path = build_output_path(keyword, fmt, output_dir, timestamp=fetched_at)
+                            if os.path.exists(path):
+                                os.remove(path)
+                            writers[group].append(module.OUTPUT_FORMATS[fmt](path))
+                        seen[group] = set()
+                        counts[group] = 0
+                    page_jobs = []
+                    for job in jobs:
+                        job_id = html_backends.job_id_from_link(job.get('link'))
+                        if job_id is not None:
+                            if job_id in seen[group]:
+                                continue
+                            seen[group].add(job_id)
+                            job.update(job_details.get((job_id, group[1])) or latest_details.get(job_id, {}))
+                        counts[group] += 1
+                        job['index'] = counts[group]
+                        page_jobs.append(job)
+                    for writer in writers[group]:
+                        writer.write(page_jobs)
+                    stats['jobs'] += len(page_jobs)
+        finally:
+            for group_writers in writers.values():
+                for writer in group_writers:
+                    writer.close()
+                    stats['files'].append(writer.path)
+    
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def main(argv=None):
+    """
+    頁面封存的命令列工具：info 顯示統計，reparse 重新解析
+    
+    Returns:
+        int: 結束代碼
+    """
+    parser = argparse.ArgumentParser(description="原始頁面封存：統計與離線重新解析")
+    parser.add_argument('--archive', help="封存目錄，預設 data/archive")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    subparsers.add_parser('info', help="顯示封存的頁數、大小與關鍵字")
+    
+    reparse_parser = subparsers.add_parser('reparse', help="以目前的解析程式重新產生職缺資料")
+    reparse_parser.add_argument('-k', '--keyword', action='append', help="只處理這些關鍵字（可重複指定）")
+    reparse_parser.add_argument('--since', help="抓取日期下限 YYYY-MM-DD")
+    reparse_parser.add_argument('--until', help="抓取日期上限 YYYY-MM-DD")
+    reparse_parser.add_argument('-f', '--format', nargs='+', default=['csv'], choices=['csv', 'jsonl'],
+                                dest='formats', help="輸出格式")
+    reparse_parser.add_argument('-o', '--output-dir', help="輸出目錄，預設 data/reparsed（同名檔案會被覆寫）")
+    reparse_parser.add_argument('--parser', default='html.parser', help="HTML 解析後端")
+    reparse_parser.add_argument('-w', '--workers', type=int, help="解析行程數，預設為 CPU 核心數")
+    reparse_parser.add_argument('--details', action='store_true', help="一併重新解析封存的詳細頁")
+    args = parser.parse_args(argv)
+    
+    if not os.path.exists(os.path.join(args.archive or DEFAULT_ARCHIVE_DIR, INDEX_FILE)):
+        print("找不到頁面封存")
+        return 1
+    
+    if args.command == 'info':
+        with PageArchive(args.archive, readonly=True) as archive:
+            stats = archive.stats()
+        ratio = stats['raw_bytes'] / stats['compressed_bytes'] if stats['compressed_bytes'] else 0
+        print(f"{stats['pages']} 頁，原始 {stats['raw_bytes'] / 1024 ** 2:.1f} MB，"
+              f"封存 {stats['compressed_bytes'] / 1024 ** 2:.1f} MB（壓縮比 {ratio:.1f}）")
+        for kind, count in stats['kinds'].items():
+            print(f"   {kind}: {count} 頁")
+        for keyword, count in sorted(stats['keywords'].items(), key=lambda item: -item[1]):
+            print(f"   {keyword}: {count} 頁")
+        return 0
+    
+    stats = reparse(args.archive, args.keyword, args.since, args.until, args.formats,
+                    args.output_dir, args.parser, args.workers, args.details)
+    print(f"重新解析 {stats['pages']} 頁，{stats['jobs']} 個職缺（{stats['seconds']:.1f} 秒，"
+          f"{stats['pages'] / stats['seconds'] if stats['seconds'] else 0:.1f} 頁/秒）")
+    for path in stats['files']:
+        print(f"   {path}")
+    return 0 if stats['jobs'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
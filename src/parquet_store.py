@@ -0,0 +1,167 @@
+import logging
+import os
+import uuid
+from datetime import date, datetime
+
+from job_writers import COLUMN_ORDER, DATA_DIR
+from salary import add_salary_columns
+
+logger = logging.getLogger('job1111.parquet_store')
+
+# 預設 Parquet 資料集目錄
+PARQUET_DIR = os.path.join(DATA_DIR, 'parquet')
+
+# 重複度高的文字欄位，以 dictionary encoding 儲存
+CATEGORICAL_COLUMNS = [
+    'company', 'industry', 'location', 'salary',
+    'education', 'department', 'experience', 'language',
+]
+
+# 數值欄位與型別
+NUMERIC_COLUMNS = {
+    'index': 'int32',
+    'relevance_score': 'int32',
+}
+
+# 分割欄位：關鍵字 / 爬取日期
+PARTITION_COLUMNS = ['keyword', 'crawl_date']
+
+
+def jobs_to_frame(jobs, keyword, crawl_date=None):
+    """
+    把職缺資料轉成型別明確的 DataFrame（類別欄位為 category、數值欄位為整數，
+    並加上正規化後的薪資欄位）
+    
+    Args:
+        jobs (list | pandas.DataFrame): 職缺資訊列表或資料框
+        keyword (str): 搜尋關鍵字
+        crawl_date (date | str): 爬取日期，None 表示今天
+    
+    Returns:
+        pandas.DataFrame: 整理後的資料框
+    """
+    import pandas as pd
+    
+    df = jobs.copy() if isinstance(jobs, pd.DataFrame) else pd.DataFrame(jobs)
+    
+    columns = [col for col in COLUMN_ORDER if col in df.columns]
+    columns += [col for col in df.columns if col not in columns and col not in PARTITION_COLUMNS]
+    df = df[columns]
+    
+    for column, dtype in NUMERIC_COLUMNS.items():
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype(dtype)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('string').astype('category')
+    
+    # 薪資文字轉成 salary_min / salary_max（月薪）、salary_period、is_negotiable
+    df = add_salary_columns(df)
+    
+    if isinstance(crawl_date, (date, datetime)):
+        crawl_date = crawl_date.strftime('%Y-%m-%d')
+    df['keyword'] = keyword
+    df['crawl_date'] = crawl_date or datetime.now().strftime('%Y-%m-%d')
+    return df
+
+
+def write_parquet(jobs, keyword, root=None, crawl_date=None):
+    """
+    以附加方式寫入 Parquet 資料集，依關鍵字與爬取日期分割目錄
+    
+    每次寫入都產生新的檔案，不會覆蓋同一分割中先前的資料。
+    
+    Args:
+        jobs (list | pandas.DataFrame): 職缺資訊列表或資料框
+        keyword (str): 搜尋關鍵字
+        root (str): 資料集根目錄，None 表示使用 data/parquet
+        crawl_date (date | str): 爬取日期，None 表示今天
+    
+    Returns:
+        str: 資料集根目錄，未安裝 pyarrow 時返回 None
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.warning("未安裝 pyarrow，無法輸出 Parquet")
+        return None
+    
+    root = root or PARQUET_DIR
+    df = jobs_to_frame(jobs, keyword, crawl_date)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    
+    dictionary_columns = [col for col in CATEGORICAL_COLUMNS if col in df.columns]
+    pq.write_to_dataset(
+        table,
+        root_path=root,
+        partition_cols=PARTITION_COLUMNS,
+        basename_template=f"part-{datetime.now():%H%M%S}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+        use_dictionary=dictionary_columns,
+        compression='zstd',
+    )
+    return root
+
+
+def unified_schema(dataset):
+    """
+    合併資料集中所有檔案的欄位
+    
+    pyarrow 預設只以找到的第一個檔案推斷 schema，之後才出現的欄位（matched_keywords、
+    cluster_id、score_*、詳細頁欄位）讀取時會被略過；這裡合併每個檔案的 schema，
+    只在部分檔案出現的欄位在其他檔案中為缺值。
+    
+    Args:
+        dataset (pyarrow.dataset.Dataset): 以 hive 分割探索的資料集
+    
+    Returns:
+        pyarrow.Schema: 合併後的 schema（含分割欄位），資料集沒有檔案時為 None
+    """
+    import pyarrow as pa
+    
+    schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    if not schemas:
+        return None
+    # 全為缺值的欄位寫入時型別為 null，與其他檔案的型別合併時以寬鬆規則提升
+    schema = pa.unify_schemas(schemas, promote_options='permissive')
+    for column in PARTITION_COLUMNS:
+        if column in dataset.schema.names and column not in schema.names:
+            schema = schema.append(dataset.schema.field(column))
+    return schema
+
+
+def load_parquet(root=None, keywords=None, start_date=None, end_date=None, columns=None):
+    """
+    讀取 Parquet 資料集，只掃描符合條件的分割
+    
+    Args:
+        root (str): 資料集根目錄，None 表示使用 data/parquet
+        keywords (list): 只讀取這些關鍵字，None 表示全部
+        start_date (str): 起始爬取日期（含），格式 YYYY-MM-DD
+        end_date (str): 結束爬取日期（含），格式 YYYY-MM-DD
+        columns (list): 只讀取這些欄位，None 表示全部
+    
+    Returns:
+        pandas.DataFrame: 職缺資料框（類別欄位維持 category 型別）
+    """
+    import pyarrow.dataset as ds
+    
+    dataset = ds.dataset(root or PARQUET_DIR, format='parquet', partitioning='hive')
+    schema = unified_schema(dataset)
+    if schema is not None:
+        dataset = ds.dataset(root or PARQUET_DIR, schema=schema, format='parquet', partitioning='hive')
+    
+    condition = None
+    filters = []
+    if keywords:
+        filters.append(ds.field('keyword').isin(list(keywords)))
+    if start_date:
+        filters.append(ds.field('crawl_date') >= start_date)
+    if end_date:
+        filters.append(ds.field('crawl_date') <= end_date)
+    for expression in filters:
+        condition = expression if condition is None else condition & expression
+    
+    table = dataset.to_table(columns=columns, filter=condition)
+    return table.to_pandas()
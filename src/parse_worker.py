@@ -0,0 +1,88 @@
+import importlib.util
+import os
+import sys
+
+# 主程式檔名以數字開頭無法直接 import，子行程改用檔案路徑載入
+CRAWLER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '1111Crawler.py')
+CRAWLER_MODULE_NAME = 'job_1111_crawler'
+
+# 每個解析行程各自持有一個爬蟲實例，只用來解析、不發出請求
+_crawler = None
+
+# 重新解析時每個行程各自開啟的頁面封存（目錄 -> PageArchive）
+_archives = {}
+
+
+def load_crawler_module():
+    """
+    載入 1111Crawler.py 模組（同一行程只載入一次）
+    
+    Returns:
+        module: 爬蟲模組
+    """
+    module = sys.modules.get(CRAWLER_MODULE_NAME)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(CRAWLER_MODULE_NAME, CRAWLER_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[CRAWLER_MODULE_NAME] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def init_worker(parser='html.parser', embedded_json=True):
+    """
+    解析行程的初始化函式（ProcessPoolExecutor initializer）
+    
+    Args:
+        parser (str): HTML 解析後端
+        embedded_json (bool): 頁面內嵌職缺 JSON 時是否直接解析 JSON
+    """
+    global _crawler
+    _crawler = load_crawler_module().Job1111Crawler(parser=parser, embedded_json=embedded_json)
+
+
+def warm_up():
+    """確認解析行程已啟動並完成初始化"""
+    return os.getpid()
+
+
+def parse_page(html_content):
+    """
+    在解析行程中把一頁 HTML 轉成職缺資料
+    
+    Args:
+        html_content (str): 搜尋結果頁 HTML
+    
+    Returns:
+        tuple: (職缺資訊列表, 頁面上的卡片數, 這一頁的解析指標增量)，
+            指標增量留在子行程不會被主行程看到，需以 Metrics.merge 合併
+    """
+    jobs, card_count = _crawler.parse_page(html_content)
+    return jobs, card_count, _crawler.metrics.drain()
+
+
+def parse_archived(root, numbers, kind='search'):
+    """
+    在解析行程中直接從頁面封存讀取並解析頁面（主行程只傳遞頁面編號）
+    
+    Args:
+        root (str): 封存目錄
+        numbers (list): 頁面編號
+        kind (str): search 以 parse_page 解析，detail 以 parse_detail 解析
+    
+    Returns:
+        list: (頁面編號, 中繼資料, 職缺資訊列表或詳細頁欄位) 列表
+    """
+    from page_archive import PageArchive
+    
+    archive = _archives.get(root)
+    if archive is None:
+        archive = _archives[root] = PageArchive(root, readonly=True)
+    results = []
+    for number in numbers:
+        meta, body = archive.read(number)
+        if kind == 'detail':
+            results.append((number, meta, _crawler.parse_detail(body)))
+        else:
+            results.append((number, meta, _crawler.parse_page(body)[0]))
+    return results
@@ -0,0 +1,138 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """執行緒安全的 token bucket 限速器（每秒請求數 + 突發量）"""
+    
+    def __init__(self, rate=1.0, burst=1):
+        """
+        初始化限速器
+        
+        Args:
+            rate (float): 每秒補充的 token 數（即每秒請求數）
+            burst (int): 桶子容量，允許短時間內連續發出的請求數
+        """
+        if rate <= 0:
+            raise ValueError("rate 必須大於 0")
+        if burst < 1:
+            raise ValueError("burst 至少為 1")
+        
+        self.rate = float(rate)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self, now):
+        """依經過時間補充 token（呼叫時須持有 lock）"""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+    
+    def set_rate(self, rate):
+        """
+        調整每秒補充的 token 數（已累積的 token 先依舊速率結算）
+        
+        Args:
+            rate (float): 新的每秒請求數
+        """
+        if rate <= 0:
+            raise ValueError("rate 必須大於 0")
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+    
+    def try_acquire(self, tokens=1):
+        """
+        嘗試取得 token，不等待
+        
+        Args:
+            tokens (int): 需要的 token 數
+        
+        Returns:
+            bool: 是否成功取得
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+    
+    def acquire(self, tokens=1):
+        """
+        取得 token，不足時阻塞等待
+        
+        Args:
+            tokens (int): 需要的 token 數
+        
+        Returns:
+            float: 實際等待的秒數
+        
+        Raises:
+            ValueError: tokens 超過桶子容量（永遠無法取得）
+        """
+        if tokens > self.burst:
+            raise ValueError(f"tokens ({tokens}) 超過桶子容量 burst ({self.burst})")
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                # 計算補滿所需 token 的時間，在 lock 外等待
+                wait = (tokens - self.tokens) / self.rate
+            
+            time.sleep(wait)
+            waited += wait
+
+
+class HostRateLimiter:
+    """依主機名稱分配共用的 TokenBucket"""
+    
+    def __init__(self, rate=1.0, burst=1):
+        """
+        初始化各主機限速器
+        
+        Args:
+            rate (float): 每台主機每秒請求數
+            burst (int): 每台主機的突發量
+        """
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+    
+    def bucket_for(self, host):
+        """
+        取得（或建立）指定主機的 TokenBucket
+        
+        Args:
+            host (str): 主機名稱，例如 www.1111.com.tw
+        
+        Returns:
+            TokenBucket: 該主機共用的限速器
+        """
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self.buckets[host] = bucket
+            return bucket
+    
+    def acquire(self, host, tokens=1):
+        """
+        為指定主機取得 token，不足時阻塞等待
+        
+        Args:
+            host (str): 主機名稱
+            tokens (int): 需要的 token 數
+        
+        Returns:
+            float: 實際等待的秒數
+        """
+        return self.bucket_for(host).acquire(tokens)
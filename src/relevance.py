@@ -0,0 +1,344 @@
+import argparse
+import json
+import sys
+import time
+
+from job_index import title_tokens
+
+# 內建的關鍵字設定檔：名稱 -> 關鍵字列表或 {關鍵字: 權重}
+DEFAULT_PROFILES = {
+    'data_engineering': [
+        '資料', 'data', '數據', '分析', 'analytics',
+        'etl', 'sql', 'python', 'spark', 'hadoop',
+        'big data', '大數據', 'warehouse', '倉儲',
+        'pipeline', '管道', 'kafka', 'airflow',
+        'mongodb', 'mysql', 'postgresql', 'redis',
+        'aws', 'azure', 'gcp', 'cloud', '雲端',
+    ],
+    'data_science': [
+        '資料科學', 'data scientist', '機器學習', 'machine learning', '深度學習',
+        'deep learning', 'ai', '人工智慧', '統計', '模型', '演算法', 'python',
+        'tensorflow', 'pytorch', 'nlp', '影像', '預測',
+    ],
+    'backend': [
+        '後端', 'backend', 'api', 'java', 'golang', 'python', 'node.js', 'c#',
+        '資料庫', 'sql', 'docker', 'kubernetes', '微服務', 'linux', '伺服器',
+    ],
+    'frontend': [
+        '前端', 'frontend', 'javascript', 'typescript', 'react', 'vue', 'angular',
+        'html', 'css', '網頁', 'ui', 'ux',
+    ],
+}
+
+# 以本次搜尋關鍵字作為設定檔的保留名稱
+KEYWORD_PROFILE = 'keyword'
+
+# 評分方法
+SCORING_METHODS = ('bm25', 'tfidf')
+
+# 參與評分的欄位與權重（標題的詞計兩次）
+FIELD_WEIGHTS = {
+    'title': 2,
+    'summary': 1,
+    'skills': 1,
+    'industry': 1,
+    'department': 1,
+    'additional': 1,
+}
+
+# BM25 參數
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 評分欄位的前綴：score_<設定檔名稱>
+SCORE_PREFIX = 'score_'
+
+
+def profile_terms(spec):
+    """
+    把設定檔的關鍵字切成詞，合併成查詢向量
+    
+    多字關鍵字（例如「big data」、「大數據」）會拆成與職缺相同的詞，權重平均分給各個詞。
+    
+    Args:
+        spec (list | dict): 關鍵字列表，或 {關鍵字: 權重}
+    
+    Returns:
+        dict: 詞 -> 權重
+    """
+    if not isinstance(spec, dict):
+        spec = {keyword: 1.0 for keyword in spec}
+    terms = {}
+    for keyword, weight in spec.items():
+        tokens = title_tokens(keyword)
+        for token in tokens:
+            terms[token] = terms.get(token, 0.0) + float(weight) / len(tokens)
+    return terms
+
+
+def load_profiles(path=None, keywords=None):
+    """
+    取得所有可用的設定檔：內建設定檔、JSON 檔中的設定檔（同名時覆蓋內建），以及搜尋關鍵字
+    
+    Args:
+        path (str): JSON 檔路徑，格式為 {"名稱": ["關鍵字", ...] 或 {"關鍵字": 權重}}
+        keywords (list): 本次搜尋關鍵字，作為名稱為 keyword 的設定檔
+    
+    Returns:
+        dict: 名稱 -> 關鍵字列表或 {關鍵字: 權重}
+    """
+    profiles = dict(DEFAULT_PROFILES)
+    if path:
+        with open(path, encoding='utf-8') as f:
+            profiles.update(json.load(f))
+    if keywords:
+        profiles[KEYWORD_PROFILE] = list(keywords)
+    return profiles
+
+
+def document_tokens(job):
+    """
+    取出職缺評分用的詞（依 FIELD_WEIGHTS 重複）
+    
+    Args:
+        job (dict): 職缺資訊
+    
+    Returns:
+        list: 詞列表
+    """
+    tokens = []
+    for field, weight in FIELD_WEIGHTS.items():
+        value = job.get(field)
+        if isinstance(value, str) and value != 'N/A':
+            tokens.extend(title_tokens(value) * weight)
+    return tokens
+
+
+class TermMatrix:
+    """
+    職缺 x 詞的稀疏詞頻矩陣（以列排序的 COO 格式存成 numpy 陣列）
+    
+    整批職缺共用詞彙表與文件頻率，評分時所有職缺、所有設定檔一次以陣列運算完成。
+    """
+    
+    def __init__(self, documents):
+        """
+        建立詞頻矩陣
+        
+        Args:
+            documents (iterable): 每個職缺的詞列表
+        """
+        import numpy as np
+        
+        vocabulary = {}
+        rows = []
+        columns = []
+        count = 0
+        for row, tokens in enumerate(documents):
+            count += 1
+            for token in tokens:
+                columns.append(vocabulary.setdefault(token, len(vocabulary)))
+            rows.extend([row] * len(tokens))
+        
+        self.vocabulary = vocabulary
+        self.size = count
+        
+        # (列, 詞) 合併成一個鍵後計數，得到每個非零元素的詞頻
+        width = max(len(vocabulary), 1)
+        keys = np.asarray(rows, dtype=np.int64) * width + np.asarray(columns, dtype=np.int64)
+        keys, tf = np.unique(keys, return_counts=True)
+        self.rows = keys // width
+        self.columns = keys % width
+        self.tf = tf.astype(np.float64)
+        
+        self.lengths = np.bincount(self.rows, weights=self.tf, minlength=count)
+        self.df = np.bincount(self.columns, minlength=len(vocabulary))
+    
+    @classmethod
+    def from_jobs(cls, jobs):
+        """由職缺列表建立詞頻矩陣"""
+        return cls(document_tokens(job) for job in jobs)
+    
+    def query_matrix(self, profiles):
+        """
+        把設定檔轉成 (詞數, 設定檔數) 的查詢矩陣，不在詞彙表中的詞忽略
+        
+        Args:
+            profiles (dict): 名稱 -> 關鍵字列表或 {關鍵字: 權重}
+        
+        Returns:
+            numpy.ndarray: 查詢矩陣
+        """
+        import numpy as np
+        
+        query = np.zeros((len(self.vocabulary), len(profiles)))
+        for column, spec in enumerate(profiles.values()):
+            for term, weight in profile_terms(spec).items():
+                index = self.vocabulary.get(term)
+                if index is not None:
+                    query[index, column] += weight
+        return query
+    
+    def idf(self, method='bm25'):
+        """
+        各詞的 IDF
+        
+        Args:
+            method (str): bm25 使用 Robertson-Sparck Jones 公式，tfidf 使用平滑的 log((1+N)/(1+df))+1
+        
+        Returns:
+            numpy.ndarray: 每個詞的 IDF
+        """
+        import numpy as np
+        
+        if method == 'bm25':
+            return np.log1p((self.size - self.df + 0.5) / (self.df + 0.5))
+        return np.log((1 + self.size) / (1 + self.df)) + 1
+    
+    def score(self, profiles, method='bm25', k1=BM25_K1, b=BM25_B):
+        """
+        計算每個職缺對每個設定檔的相關度
+        
+        bm25：sum(查詢權重 * IDF * tf * (k1 + 1) / (tf + k1 * (1 - b + b * 長度 / 平均長度)))
+        tfidf：(1 + log tf) * IDF 的職缺向量與查詢向量的餘弦相似度（0 ~ 1）
+        
+        Args:
+            profiles (dict): 名稱 -> 關鍵字列表或 {關鍵字: 權重}
+            method (str): bm25 或 tfidf
+            k1 (float): BM25 詞頻飽和參數
+            b (float): BM25 長度正規化參數
+        
+        Returns:
+            dict: 名稱 -> 每個職缺分數的 numpy 陣列
+        """
+        import numpy as np
+        
+        if method not in SCORING_METHODS:
+            raise ValueError(f"不支援的評分方法: {method}")
+        
+        names = list(profiles)
+        scores = np.zeros((self.size, len(names)))
+        if not self.size or not names or not len(self.vocabulary):
+            return {name: scores[:, i] for i, name in enumerate(names)}
+        
+        idf = self.idf(method)
+        query = self.query_matrix(profiles)
+        if method == 'bm25':
+            average = self.lengths.mean() or 1.0
+            norms = k1 * (1 - b + b * self.lengths / average)
+            weights = idf[self.columns] * self.tf * (k1 + 1) / (self.tf + norms[self.rows])
+        else:
+            weights = (1 + np.log(self.tf)) * idf[self.columns]
+            query = query * idf[:, None]
+            query_norms = np.sqrt((query ** 2).sum(axis=0))
+            query = query / np.where(query_norms > 0, query_norms, 1)
+        
+        # 只保留至少一個設定檔用到的詞，再依列加總（矩陣乘法）
+        used = query.any(axis=1)[self.columns]
+        rows = self.rows[used]
+        if len(rows):
+            contributions = weights[used, None] * query[self.columns[used]]
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            scores[rows[starts]] = np.add.reduceat(contributions, starts, axis=0)
+        
+        if method == 'tfidf':
+            doc_norms = np.sqrt(np.bincount(self.rows, weights=weights ** 2, minlength=self.size))
+            scores /= np.where(doc_norms > 0, doc_norms, 1)[:, None]
+        return {name: scores[:, i] for i, name in enumerate(names)}
+
+
+def score_jobs(jobs, profiles, method='bm25'):
+    """
+    為職缺列表就地加上 score_<設定檔> 欄位
+    
+    Args:
+        jobs (list): 職缺資訊列表
+        profiles (dict): 名稱 -> 關鍵字列表或 {關鍵字: 權重}
+        method (str): bm25 或 tfidf
+    
+    Returns:
+        list: 新增的欄位名稱
+    """
+    scores = TermMatrix.from_jobs(jobs).score(profiles, method)
+    columns = []
+    for name, values in scores.items():
+        column = SCORE_PREFIX + name
+        for job, value in zip(jobs, values.round(4).tolist()):
+            job[column] = value
+        columns.append(column)
+    return columns
+
+
+def add_score_columns(df, profiles, method='bm25'):
+    """
+    為資料框加上 score_<設定檔> 欄位
+    
+    Args:
+        df (pandas.DataFrame): 職缺資料框
+        profiles (dict): 名稱 -> 關鍵字列表或 {關鍵字: 權重}
+        method (str): bm25 或 tfidf
+    
+    Returns:
+        pandas.DataFrame: 加上評分欄位的新資料框
+    """
+    fields = [field for field in FIELD_WEIGHTS if field in df.columns]
+    records = df[fields].to_dict('records')
+    scores = TermMatrix.from_jobs(records).score(profiles, method)
+    
+    df = df.copy()
+    for name, values in scores.items():
+        df[SCORE_PREFIX + name] = values.round(4)
+    return df
+
+
+def main(argv=None):
+    """
+    以關鍵字設定檔為歷史資料評分並列出最相關的職缺
+    
+    Returns:
+        int: 結束代碼
+    """
+    import job_analysis
+    
+    parser = argparse.ArgumentParser(description="以 BM25 / TF-IDF 計算職缺與關鍵字設定檔的相關度")
+    parser.add_argument('source', help="CSV 路徑或 glob，例如 'data/*.csv'")
+    parser.add_argument('profiles', nargs='*',
+                        help=f"設定檔名稱，預設全部內建設定檔；內建：{', '.join(DEFAULT_PROFILES)}")
+    parser.add_argument('-k', '--keyword', action='append', default=[],
+                        help=f"以這些關鍵字建立名稱為 {KEYWORD_PROFILE} 的設定檔（可重複指定）")
+    parser.add_argument('--profiles-file', help="自訂設定檔 JSON")
+    parser.add_argument('--method', default='bm25', choices=SCORING_METHODS, help="評分方法")
+    parser.add_argument('--top', type=int, default=5, help="每個設定檔列出前幾名")
+    parser.add_argument('--output', help="把加上評分欄位的資料寫入 CSV")
+    args = parser.parse_args(argv)
+    
+    available = load_profiles(args.profiles_file, args.keyword)
+    names = args.profiles or ([KEYWORD_PROFILE] if args.keyword else list(available))
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        parser.error(f"未知的設定檔: {', '.join(unknown)}")
+    
+    df = job_analysis.load_frame(args.source)
+    if df.empty:
+        print("沒有職缺資料")
+        return 1
+    
+    started = time.perf_counter()
+    df = add_score_columns(df, {name: available[name] for name in names}, args.method)
+    elapsed = time.perf_counter() - started
+    print(f"{len(df)} 筆職缺，{len(names)} 個設定檔（{args.method}，{elapsed:.2f} 秒）")
+    
+    for name in names:
+        column = SCORE_PREFIX + name
+        print(f"\n{name}:")
+        for _, row in df.nlargest(args.top, column).iterrows():
+            print(f"   {row[column]:.3f}  {row.get('title')} - {row.get('company')}")
+    
+    if args.output:
+        df.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"\n已儲存到 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import re
+
+# 薪資字串：可選的計薪方式 + 金額（可含千分位、萬）+ 可選的範圍上限
+SALARY_RE = re.compile(
+    r'(?P<period>月薪|年薪|日薪|時薪)?\s*'
+    r'(?P<low>\d[\d,]*(?:\.\d+)?)\s*(?P<low_unit>萬)?'
+    r'(?:\s*[-~～至]\s*(?P<high>\d[\d,]*(?:\.\d+)?)\s*(?P<high_unit>萬)?)?'
+)
+
+# 計薪方式代碼；沒有標示時視為月薪（例如「面議（經常性薪資達4萬元」）
+SALARY_PERIODS = {
+    '月薪': 'month',
+    '年薪': 'year',
+    '日薪': 'day',
+    '時薪': 'hour',
+}
+DEFAULT_PERIOD = 'month'
+
+# 換算成月薪的倍數：年薪以 12 個月、日薪以 22 天、時薪以 176 小時（22 天 x 8 小時）計算
+MONTHLY_FACTORS = {
+    'month': 1.0,
+    'year': 1 / 12,
+    'day': 22.0,
+    'hour': 176.0,
+}
+
+# 只有下限、沒有上限的薪資（面議保障底薪、「以上」）
+OPEN_ENDED_RE = r'面議|以上'
+
+# 正規化後新增的欄位
+SALARY_COLUMNS = ['salary_min', 'salary_max', 'salary_period', 'is_negotiable']
+
+
+def _to_amount(numbers, units):
+    """
+    把金額字串轉成數值（去除千分位，「萬」乘以 10000）
+    
+    Args:
+        numbers (pandas.Series): 金額字串
+        units (pandas.Series): 單位（萬 或缺值）
+    
+    Returns:
+        pandas.Series: 金額（float，缺值為 NaN）
+    """
+    import pandas as pd
+    
+    amounts = pd.to_numeric(numbers.str.replace(',', '', regex=False), errors='coerce')
+    return amounts.where(units.isna(), amounts * 10000).astype('float64')
+
+
+def _normalize_unique(text):
+    """
+    解析不重複的薪資文字
+    
+    Args:
+        text (pandas.Series): 薪資文字（string 型別）
+    
+    Returns:
+        pandas.DataFrame: 正規化後的薪資欄位
+    """
+    import pandas as pd
+    
+    parts = text.str.extract(SALARY_RE)
+    
+    has_amount = parts['low'].notna()
+    period = parts['period'].map(SALARY_PERIODS).astype('object')
+    period = period.where(period.notna() | ~has_amount, DEFAULT_PERIOD)
+    factor = period.map(MONTHLY_FACTORS).astype('float64')
+    
+    low = _to_amount(parts['low'], parts['low_unit'])
+    high = _to_amount(parts['high'], parts['high_unit'])
+    open_ended = text.str.contains(OPEN_ENDED_RE, regex=True).fillna(False).astype(bool)
+    high = high.where(high.notna() | open_ended, low)
+    
+    return pd.DataFrame({
+        'salary_min': (low * factor).round(),
+        'salary_max': (high * factor).round(),
+        'salary_period': period,
+        'is_negotiable': text.str.contains('面議', regex=False).fillna(False).astype(bool),
+    })
+
+
+def normalize_salary(salaries):
+    """
+    以向量化字串擷取把薪資文字轉成數值欄位
+    
+    金額統一換算為月薪；salary_period 保留原始的計薪方式。
+    固定薪資的上下限相同；面議或「以上」只有下限，salary_max 為 NaN。
+    薪資文字重複度很高，只解析不重複的值，再依代碼展開回每一列。
+    
+    Args:
+        salaries (pandas.Series | list): 薪資文字
+    
+    Returns:
+        pandas.DataFrame: salary_min / salary_max（float）、salary_period（category）、
+            is_negotiable（bool），索引與輸入相同
+    """
+    import pandas as pd
+    
+    salaries = pd.Series(salaries)
+    codes, uniques = pd.factorize(salaries)
+    unique = _normalize_unique(pd.Series(uniques).astype('string'))
+    
+    # 缺值的代碼為 -1，對應到額外補上的一列空白結果
+    unique.loc[len(unique)] = [float('nan'), float('nan'), None, False]
+    codes = codes.copy()
+    codes[codes < 0] = len(unique) - 1
+    normalized = unique.iloc[codes].reset_index(drop=True)
+    normalized.index = salaries.index
+    
+    normalized['salary_period'] = pd.Categorical(normalized['salary_period'],
+                                                 categories=list(MONTHLY_FACTORS))
+    normalized['is_negotiable'] = normalized['is_negotiable'].astype(bool)
+    return normalized
+
+
+def add_salary_columns(df, column='salary'):
+    """
+    在資料框加上正規化後的薪資欄位
+    
+    Args:
+        df (pandas.DataFrame): 職缺資料框
+        column (str): 薪資文字欄位名稱
+    
+    Returns:
+        pandas.DataFrame: 加上 SALARY_COLUMNS 的新資料框；沒有薪資欄位時原樣返回
+    """
+    if column not in df.columns:
+        return df
+    normalized = normalize_salary(df[column])
+    df = df.drop(columns=[col for col in SALARY_COLUMNS if col in df.columns])
+    return df.join(normalized)
@@ -0,0 +1,212 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# 值得重試的狀態碼：限流與暫時性的伺服器錯誤
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 代表網站要求放慢速度的狀態碼，會觸發降速
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """
+    解析 Retry-After 標頭（秒數或 HTTP 日期）
+    
+    Args:
+        value (str): 標頭內容
+    
+    Returns:
+        float: 需要等待的秒數，無法解析時返回 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """有上限的重試策略：指數退避加上隨機抖動，並遵守 Retry-After"""
+    
+    def __init__(self, max_retries=3, base_delay=1.0, max_delay=30.0, max_retry_after=120.0):
+        """
+        初始化重試策略
+        
+        Args:
+            max_retries (int): 最多重試次數（不含第一次請求）
+            base_delay (float): 第一次重試的退避上限秒數，之後每次加倍
+            max_delay (float): 退避秒數上限
+            max_retry_after (float): 可接受的 Retry-After 秒數，超過時不再重試
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+    
+    def backoff(self, attempt, retry_after=None):
+        """
+        計算第 attempt 次重試前要等待的秒數
+        
+        採用 full jitter：在 0 到 min(max_delay, base_delay * 2^attempt) 之間隨機取值，
+        避免多個執行緒同時重試；伺服器有給 Retry-After 時至少等待該秒數。
+        
+        Args:
+            attempt (int): 第幾次重試（從 0 開始）
+            retry_after (float): Retry-After 秒數
+        
+        Returns:
+            float: 等待秒數，Retry-After 超過上限時返回 None 表示不要重試
+        """
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """連續失敗達門檻時暫停所有請求，冷卻後先放行一個試探請求"""
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold=5, reset_timeout=60.0):
+        """
+        初始化斷路器
+        
+        Args:
+            failure_threshold (int): 連續失敗幾次後開啟斷路器
+            reset_timeout (float): 開啟後經過幾秒才放行試探請求
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        """
+        目前是否可以發出請求
+        
+        Returns:
+            bool: 可以發出請求時為 True
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+            # 半開狀態只放行一個試探請求
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+            return True
+    
+    @property
+    def is_open(self):
+        """斷路器是否處於開啟（暫停請求）狀態"""
+        return self.state == self.OPEN
+    
+    def record_success(self):
+        """請求成功：關閉斷路器並清除失敗計數"""
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+    
+    def record_failure(self):
+        """請求失敗：累計失敗次數，達門檻或試探失敗時開啟斷路器"""
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.trial_in_flight = False
+    
+    def retry_in(self):
+        """
+        距離可以再次試探還有幾秒
+        
+        Returns:
+            float: 秒數，斷路器未開啟時為 0
+        """
+        with self.lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class AimdController:
+    """
+    依回應狀況調整 TokenBucket 的請求速率（AIMD：加法增加、乘法減少）
+    
+    回應正常且延遲低於目標時每次增加固定速率；遇到 429 / 503、逾時或延遲過高時
+    把速率乘上減少係數。同一波並行請求同時被限流時只降速一次。
+    """
+    
+    def __init__(self, bucket, min_rate=0.2, max_rate=None, increase=0.05, decrease=0.5,
+                 target_latency=3.0, cooldown=1.0):
+        """
+        初始化速率控制器
+        
+        Args:
+            bucket (TokenBucket): 要調整的限速器
+            min_rate (float): 速率下限（每秒請求數）
+            max_rate (float): 速率上限，None 表示使用限速器目前的速率
+            increase (float): 每次成功請求增加的速率
+            decrease (float): 降速時乘上的係數
+            target_latency (float): 延遲超過此秒數視為網站負載過高
+            cooldown (float): 兩次降速之間至少間隔的秒數
+        """
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate or bucket.rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.last_decrease = 0.0
+        self.lock = threading.Lock()
+    
+    @property
+    def rate(self):
+        return self.bucket.rate
+    
+    def on_success(self, latency):
+        """
+        回報一次成功請求
+        
+        Args:
+            latency (float): 請求耗時秒數
+        """
+        if latency > self.target_latency:
+            self.on_throttle()
+            return
+        with self.lock:
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.increase))
+    
+    def on_throttle(self):
+        """回報一次限流（429 / 503、逾時或延遲過高），速率乘上減少係數"""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_decrease < self.cooldown:
+                return
+            self.last_decrease = now
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate * self.decrease))
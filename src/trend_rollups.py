@@ -0,0 +1,462 @@
+import argparse
+import bisect
+import glob
+import itertools
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from html_backends import job_id_from_link
+from job_analysis import INVALID_VALUES
+from job_index import (CONDITIONS_COLUMN, education_terms, normalize_location, normalize_skill, read_jobs,
+                       resolve_location, skill_terms)
+from job_store import SQL_BATCH_SIZE, content_hash
+from job_writers import DATA_DIR
+
+# 預設彙總資料庫路徑
+DEFAULT_ROLLUP_PATH = os.path.join(DATA_DIR, 'trends.db')
+
+# 爬蟲輸出檔名：1111_<關鍵字>_<YYYYmmdd_HHMMSS>.csv / .jsonl（舊檔案可能沒有時間）
+OUTPUT_NAME_RE = re.compile(r'^1111_(?P<keyword>.+?)(?:_(?P<stamp>\d{8}_\d{6}))?\.(?:csv|jsonl)$')
+
+# 多關鍵字批次爬取的檔名關鍵字，實際關鍵字記錄在每筆的 matched_keywords（以「 | 」分隔）
+BATCH_NAME = 'batch'
+KEYWORD_SEPARATOR = ' | '
+
+# 不分關鍵字的彙總（同一職缺被多個關鍵字搜尋到時只計一次）
+ALL_KEYWORDS = '*'
+
+# 每天的職缺總數，作為計算占比的分母
+TOTAL_DIMENSION = 'total'
+
+# 彙總的維度；組合維度的值以「|」連接（例如 skill+location = 'kafka|新竹市'）
+DIMENSIONS = ('skill', 'location', 'industry', 'education', 'salary_band')
+COMBINED_DIMENSIONS = (('skill', 'location'),)
+VALUE_SEPARATOR = '|'
+
+# 薪資級距（以換算後的月薪下限分級）；面議且沒有金額時為「面議」
+SALARY_BAND_LIMITS = [30000, 40000, 50000, 70000, 100000]
+SALARY_BAND_LABELS = ['3萬以下', '3-4萬', '4-5萬', '5-7萬', '7-10萬', '10萬以上']
+NEGOTIABLE_BAND = '面議'
+
+# 時間序列的彙總粒度（週以星期一為起點）
+PERIOD_EXPRESSIONS = {
+    'day': 'day',
+    'week': "date(day, '-6 days', 'weekday 1')",
+    'month': 'substr(day, 1, 7)',
+}
+
+
+def parse_output_name(path):
+    """
+    從輸出檔名取出關鍵字與爬取日期
+    
+    Args:
+        path (str): 爬蟲輸出的 CSV / JSONL 路徑
+    
+    Returns:
+        tuple: (關鍵字, YYYY-MM-DD)；檔名沒有時間時以檔案修改日期代替，檔名不符時關鍵字為 None
+    """
+    match = OUTPUT_NAME_RE.match(os.path.basename(path))
+    if match and match.group('stamp'):
+        day = datetime.strptime(match.group('stamp'), '%Y%m%d_%H%M%S').date().isoformat()
+    else:
+        day = datetime.fromtimestamp(os.path.getmtime(path)).date().isoformat()
+    keyword = match.group('keyword').strip('"\'').replace('_', ' ') if match else None
+    return keyword, day
+
+
+def salary_bands(salaries):
+    """
+    把薪資文字分到薪資級距
+    
+    Args:
+        salaries (list): 薪資文字
+    
+    Returns:
+        list: 級距名稱，沒有薪資資訊時為 None
+    """
+    from salary import normalize_salary
+    
+    if not salaries:
+        return []
+    normalized = normalize_salary(salaries)
+    bands = []
+    for low, negotiable in zip(normalized['salary_min'].tolist(), normalized['is_negotiable'].tolist()):
+        if low == low:
+            bands.append(SALARY_BAND_LABELS[bisect.bisect_right(SALARY_BAND_LIMITS, low)])
+        else:
+            bands.append(NEGOTIABLE_BAND if negotiable else None)
+    return bands
+
+
+def job_dimensions(job, salary_band=None):
+    """
+    取出職缺在各維度的值
+    
+    Args:
+        job (dict): 職缺資訊
+        salary_band (str): salary_bands 的結果
+    
+    Returns:
+        dict: 維度 -> 值的集合（含 total 與組合維度）
+    """
+    conditions = job.get(CONDITIONS_COLUMN) or ''
+    location = normalize_location(job.get('location'))
+    industry = (job.get('industry') or '').strip()
+    values = {
+        TOTAL_DIMENSION: {''},
+        'skill': skill_terms(job.get('skills')),
+        'location': {location} if location not in INVALID_VALUES else set(),
+        'industry': {industry} if industry not in INVALID_VALUES else set(),
+        'education': education_terms(job.get('education') or conditions),
+        'salary_band': {salary_band} if salary_band else set(),
+    }
+    for dimensions in COMBINED_DIMENSIONS:
+        combined = {()}
+        for dimension in dimensions:
+            combined = {prefix + (value,) for prefix in combined for value in values[dimension]}
+        values['+'.join(dimensions)] = {VALUE_SEPARATOR.join(parts) for parts in combined}
+    return values
+
+
+def job_keywords(job, default):
+    """職缺所屬的關鍵字：批次爬取的 matched_keywords，否則為檔名上的關鍵字"""
+    matched = job.get('matched_keywords')
+    if isinstance(matched, list):
+        return [keyword for keyword in matched if keyword]
+    if isinstance(matched, str) and matched.strip():
+        return [keyword.strip() for keyword in matched.split(KEYWORD_SEPARATOR.strip()) if keyword.strip()]
+    return [default] if default else []
+
+
+class TrendStore:
+    """
+    以 SQLite 保存的每日職缺彙總
+    
+    rollups 以 (維度, 值, 關鍵字, 日期) 記錄當天出現的不重複職缺數，時間序列查詢只讀這張表，
+    不需要重新掃描歷史檔案。daily_jobs 記錄每天各關鍵字已計入的職缺 ID，同一天重複爬取、
+    CSV 與 JSONL 同時輸出或檔案重新處理時都不會重複計數；已處理的檔案以大小與修改時間略過。
+    """
+    
+    def __init__(self, path=None):
+        """
+        開啟（或建立）彙總資料庫
+        
+        Args:
+            path (str): 資料庫路徑，None 表示使用 data/trends.db
+        """
+        self.path = path or DEFAULT_ROLLUP_PATH
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS rollups (
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                day TEXT NOT NULL,
+                postings INTEGER NOT NULL,
+                PRIMARY KEY (dimension, value, keyword, day)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS daily_jobs (
+                day TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                PRIMARY KEY (day, keyword, job_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                day TEXT NOT NULL,
+                keyword TEXT,
+                rows INTEGER NOT NULL,
+                processed_at TEXT NOT NULL
+            );
+        ''')
+        self.conn.commit()
+    
+    def _known_ids(self, day, keyword, job_ids):
+        """取得某天某關鍵字已計入的職缺 ID"""
+        known = set()
+        job_ids = list(job_ids)
+        for start in range(0, len(job_ids), SQL_BATCH_SIZE):
+            batch = job_ids[start:start + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            known.update(row[0] for row in self.conn.execute(
+                f'SELECT job_id FROM daily_jobs WHERE day = ? AND keyword = ? AND job_id IN ({placeholders})',
+                (day, keyword, *batch)
+            ))
+        return known
+    
+    def _add_jobs(self, jobs, day, keyword=None):
+        """把職缺計入彙總（呼叫時須在交易中）"""
+        jobs = list(jobs)
+        bands = salary_bands([job.get('salary') for job in jobs])
+        
+        # 關鍵字 -> {職缺 ID: 各維度的值}，同一份輸入中重複的職缺只保留第一筆
+        grouped = defaultdict(dict)
+        for job, band in zip(jobs, bands):
+            job_id = job_id_from_link(job.get('link')) or content_hash(job)
+            dimensions = None
+            for name in job_keywords(job, keyword) + [ALL_KEYWORDS]:
+                if job_id not in grouped[name]:
+                    dimensions = dimensions or job_dimensions(job, band)
+                    grouped[name][job_id] = dimensions
+        
+        counts = Counter()
+        stats = {'new': 0, 'seen': 0}
+        for name, postings in grouped.items():
+            known = self._known_ids(day, name, postings)
+            new_ids = [job_id for job_id in postings if job_id not in known]
+            self.conn.executemany('INSERT INTO daily_jobs (day, keyword, job_id) VALUES (?, ?, ?)',
+                                  [(day, name, job_id) for job_id in new_ids])
+            for job_id in new_ids:
+                for dimension, values in postings[job_id].items():
+                    for value in values:
+                        counts[(dimension, value, name, day)] += 1
+            if name == ALL_KEYWORDS:
+                stats['new'] += len(new_ids)
+                stats['seen'] += len(known)
+        
+        self.conn.executemany('''
+            INSERT INTO rollups (dimension, value, keyword, day, postings) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (dimension, value, keyword, day) DO UPDATE SET postings = postings + excluded.postings
+        ''', [(*key, count) for key, count in counts.items()])
+        return stats
+    
+    def add_jobs(self, jobs, day=None, keyword=None):
+        """
+        把一次爬取的職缺計入當天的彙總
+        
+        Args:
+            jobs (iterable): 職缺資訊 dict
+            day (str): 日期 YYYY-MM-DD，None 表示今天
+            keyword (str): 搜尋關鍵字；職缺有 matched_keywords 時以其為準
+        
+        Returns:
+            dict: {'new': 新計入的職缺數, 'seen': 當天已計入過的職缺數}
+        """
+        day = day or datetime.now().date().isoformat()
+        with self.conn:
+            return self._add_jobs(jobs, day, keyword)
+    
+    def add_files(self, paths):
+        """
+        彙總爬蟲輸出的 CSV / JSONL 檔案，只處理上次之後新增或有變更的檔案
+        
+        每個檔案在同一個交易中計入彙總並記錄為已處理，中途中斷不會重複計數。
+        
+        Args:
+            paths (iterable): 檔案路徑或 glob 樣式
+        
+        Returns:
+            dict: {'files': 處理的檔案數, 'rows': 讀取的筆數, 'new': 新計入的職缺數, 'seen': 已計入過的職缺數}
+        """
+        totals = {'files': 0, 'rows': 0, 'new': 0, 'seen': 0}
+        for pattern in paths:
+            for path in sorted(glob.glob(pattern)):
+                if not os.path.isfile(path):
+                    continue
+                stat = os.stat(path)
+                source = os.path.abspath(path)
+                row = self.conn.execute('SELECT size, mtime FROM sources WHERE path = ?', (source,)).fetchone()
+                if row == (stat.st_size, stat.st_mtime):
+                    continue
+                
+                keyword, day = parse_output_name(path)
+                jobs = list(read_jobs(path))
+                with self.conn:
+                    stats = self._add_jobs(jobs, day, None if keyword == BATCH_NAME else keyword)
+                    self.conn.execute(
+                        'INSERT OR REPLACE INTO sources (path, size, mtime, day, keyword, rows, processed_at) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (source, stat.st_size, stat.st_mtime, day, keyword, len(jobs),
+                         datetime.now().isoformat(timespec='seconds'))
+                    )
+                totals['files'] += 1
+                totals['rows'] += len(jobs)
+                totals['new'] += stats['new']
+                totals['seen'] += stats['seen']
+        return totals
+    
+    def keywords(self):
+        """列出彙總中的關鍵字（不含不分關鍵字的彙總）"""
+        return [row[0] for row in self.conn.execute(
+            'SELECT DISTINCT keyword FROM rollups WHERE dimension = ? AND value = ? AND keyword != ? ORDER BY keyword',
+            (TOTAL_DIMENSION, '', ALL_KEYWORDS)
+        )]
+    
+    def _filter_key(self, filters):
+        """
+        把 {維度: 值} 轉成 rollups 的 (dimension, values)，值以建立彙總時相同的方式正規化
+        
+        省略市 / 縣的縣市名稱對應到所有同名縣市（例如 新竹 -> 新竹市、新竹縣），
+        查詢時加總這些值。
+        """
+        filters = {dimension: value for dimension, value in (filters or {}).items() if value}
+        if not filters:
+            return TOTAL_DIMENSION, ['']
+        normalized = {}
+        for dimension, value in filters.items():
+            if dimension == 'skill':
+                normalized[dimension] = [normalize_skill(value)]
+            elif dimension == 'location':
+                normalized[dimension] = resolve_location(value)
+            else:
+                normalized[dimension] = [value]
+        if len(normalized) == 1:
+            (dimension, values), = normalized.items()
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"不支援的維度: {dimension}")
+            return dimension, values
+        for dimensions in COMBINED_DIMENSIONS:
+            if set(dimensions) == set(normalized):
+                values = [VALUE_SEPARATOR.join(combination)
+                          for combination in itertools.product(*(normalized[name] for name in dimensions))]
+                return '+'.join(dimensions), values
+        raise ValueError(f"不支援的維度組合: {' + '.join(normalized)}")
+    
+    def series(self, filters=None, keyword=None, since=None, until=None, period='day'):
+        """
+        查詢時間序列（只讀彙總表）
+        
+        Args:
+            filters (dict): 維度 -> 值，例如 {'skill': 'Kafka', 'location': '新竹市'}；None 表示所有職缺，
+                縣市省略市 / 縣時（例如 '新竹'）加總所有同名縣市
+            keyword (str): 搜尋關鍵字，None 表示不分關鍵字
+            since (str): 日期下限 YYYY-MM-DD（含）
+            until (str): 日期上限 YYYY-MM-DD（含）
+            period (str): 'day'、'week' 或 'month'
+        
+        Returns:
+            list: [{'period', 'postings', 'total', 'share'}]，依時間排序；
+                total 為同一期間的職缺總數，沒有符合的職缺時 postings 為 0
+        
+        Raises:
+            ValueError: 不支援的維度（組合）或未知的縣市
+        """
+        dimension, values = self._filter_key(filters)
+        expression = PERIOD_EXPRESSIONS[period]
+        
+        def query(dimension, values):
+            placeholders = ','.join('?' * len(values))
+            return dict(self.conn.execute(f'''
+                SELECT {expression} AS period, SUM(postings) FROM rollups
+                WHERE dimension = ? AND value IN ({placeholders}) AND keyword = ? AND day >= ? AND day <= ?
+                GROUP BY period ORDER BY period
+            ''', (dimension, *values, keyword or ALL_KEYWORDS, since or '', until or '9999-12-31')))
+        
+        totals = query(TOTAL_DIMENSION, [''])
+        matched = query(dimension, values)
+        return [
+            {'period': key, 'postings': matched.get(key, 0), 'total': total,
+             'share': matched.get(key, 0) / total if total else 0.0}
+            for key, total in totals.items()
+        ]
+    
+    def top(self, dimension, keyword=None, since=None, until=None, limit=20):
+        """
+        查詢某個維度在期間內最常出現的值
+        
+        Args:
+            dimension (str): DIMENSIONS 之一
+            keyword (str): 搜尋關鍵字，None 表示不分關鍵字
+            since (str): 日期下限 YYYY-MM-DD（含）
+            until (str): 日期上限 YYYY-MM-DD（含）
+            limit (int): 筆數
+        
+        Returns:
+            list: [(值, 期間內各日職缺數的合計)]
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"不支援的維度: {dimension}")
+        return self.conn.execute('''
+            SELECT value, SUM(postings) AS total FROM rollups
+            WHERE dimension = ? AND keyword = ? AND day >= ? AND day <= ?
+            GROUP BY value ORDER BY total DESC, value LIMIT ?
+        ''', (dimension, keyword or ALL_KEYWORDS, since or '', until or '9999-12-31', limit)).fetchall()
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iso_date(value):
+    """argparse 用：檢查 YYYY-MM-DD 格式"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式應為 YYYY-MM-DD: {value}") from None
+
+
+def main(argv=None):
+    """
+    更新每日彙總或查詢趨勢
+    
+    Returns:
+        int: 結束代碼
+    """
+    parser = argparse.ArgumentParser(description="職缺每日彙總：增量更新與趨勢查詢")
+    parser.add_argument('--db', help="彙總資料庫路徑，預設 data/trends.db")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    build = commands.add_parser('build', help="彙總爬蟲輸出的 CSV / JSONL（只處理新的或有變更的檔案）")
+    build.add_argument('paths', nargs='*', default=[os.path.join(DATA_DIR, '1111_*.csv'),
+                                                    os.path.join(DATA_DIR, '1111_*.jsonl')])
+    
+    series = commands.add_parser('series', help="時間序列：職缺數與占比")
+    series.add_argument('-k', '--keyword', help="搜尋關鍵字，預設不分關鍵字")
+    for dimension in DIMENSIONS:
+        series.add_argument(f"--{dimension.replace('_', '-')}", dest=dimension)
+    series.add_argument('--period', default='day', choices=list(PERIOD_EXPRESSIONS))
+    series.add_argument('--since', type=iso_date, help="日期下限 YYYY-MM-DD")
+    series.add_argument('--until', type=iso_date, help="日期上限 YYYY-MM-DD")
+    
+    top = commands.add_parser('top', help="期間內最常出現的技能、地點、產業、學歷或薪資級距")
+    top.add_argument('dimension', choices=DIMENSIONS)
+    top.add_argument('-k', '--keyword', help="搜尋關鍵字，預設不分關鍵字")
+    top.add_argument('--since', type=iso_date, help="日期下限 YYYY-MM-DD")
+    top.add_argument('--until', type=iso_date, help="日期上限 YYYY-MM-DD")
+    top.add_argument('-n', '--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    with TrendStore(args.db) as store:
+        if args.command == 'build':
+            started = time.perf_counter()
+            stats = store.add_files(args.paths)
+            print(f"處理 {stats['files']} 個檔案、{stats['rows']} 筆：新計入 {stats['new']} 個職缺、"
+                  f"當天已計入 {stats['seen']} 個（{time.perf_counter() - started:.1f} 秒）")
+            return 0
+        
+        if args.command == 'top':
+            for value, count in store.top(args.dimension, args.keyword, args.since, args.until, args.limit):
+                print(f"   {value}: {count}")
+            return 0
+        
+        filters = {dimension: getattr(args, dimension) for dimension in DIMENSIONS}
+        try:
+            rows = store.series(filters, args.keyword, args.since, args.until, args.period)
+        except ValueError as e:
+            print(e)
+            return 2
+        for row in rows:
+            print(f"   {row['period']}  {row['postings']:6d} / {row['total']:6d}  ({row['share'] * 100:5.1f}%)")
+        if not rows:
+            print("期間內沒有彙總資料")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+pytest.importorskip('pyarrow')
+
+import parquet_store
+
+
+def make_job(index, **extra):
+    job = {
+        'index': index,
+        'title': f'資料工程師 {index}',
+        'company': '範例股份有限公司',
+        'location': '台北市',
+        'salary': '月薪 50,000元',
+        'link': f'https://www.1111.com.tw/job/{index}',
+    }
+    job.update(extra)
+    return job
+
+
+def test_columns_from_later_partitions_are_kept(tmp_path):
+    root = str(tmp_path / 'parquet')
+    parquet_store.write_parquet([make_job(1)], '資料工程師', root, '2026-10-01')
+    parquet_store.write_parquet(
+        [make_job(2, matched_keywords='資料工程師 | ETL', cluster_id=7, score_keyword=1.5)],
+        'ETL', root, '2026-10-02',
+    )
+    
+    df = parquet_store.load_parquet(root).sort_values('index').reset_index(drop=True)
+    
+    assert list(df['index']) == [1, 2]
+    for column in ('matched_keywords', 'cluster_id', 'score_keyword'):
+        assert column in df.columns
+    assert df['matched_keywords'].isna()[0]
+    assert df.loc[1, 'matched_keywords'] == '資料工程師 | ETL'
+    assert df.loc[1, 'cluster_id'] == 7
+    assert df.loc[1, 'score_keyword'] == 1.5
+    assert set(df['keyword']) == {'資料工程師', 'ETL'}
+
+
+def test_partition_filters_with_mismatched_columns(tmp_path):
+    root = str(tmp_path / 'parquet')
+    parquet_store.write_parquet([make_job(1)], '資料工程師', root, '2026-10-01')
+    parquet_store.write_parquet([make_job(2, cluster_id=3)], '資料工程師', root, '2026-10-02')
+    
+    df = parquet_store.load_parquet(root, keywords=['資料工程師'], start_date='2026-10-02',
+                                    columns=['index', 'cluster_id'])
+    
+    assert list(df['index']) == [2]
+    assert list(df['cluster_id']) == [3]
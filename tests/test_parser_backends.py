@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+pytest.importorskip('bs4')
+
+import benchmark
+import parse_worker
+
+# 後端 -> 需要安裝的套件
+BACKEND_MODULES = {
+    'lxml': 'lxml',
+    'selectolax': 'selectolax.lexbor',
+}
+
+
+def saved_pages():
+    """.job-card 與 .job-list-item 兩種卡片版型的合成頁面"""
+    pages = []
+    for name, html_content in benchmark.synthetic_pages([20, 200]):
+        pages.append((name, html_content))
+        pages.append((f"{name}-list-item", html_content.replace('class="job-card"', 'class="job-list-item"')))
+    return pages
+
+
+@pytest.fixture(scope='module')
+def crawler_module():
+    return parse_worker.load_crawler_module()
+
+
+@pytest.mark.parametrize('backend', sorted(BACKEND_MODULES))
+def test_backends_return_identical_jobs(crawler_module, backend):
+    pytest.importorskip(BACKEND_MODULES[backend])
+    reference = crawler_module.Job1111Crawler(parser='html.parser', embedded_json=False)
+    crawler = crawler_module.Job1111Crawler(parser=backend, embedded_json=False)
+    for name, html_content in saved_pages():
+        expected, expected_cards = reference.parse_page(html_content)
+        jobs, cards = crawler.parse_page(html_content)
+        assert expected_cards > 0, name
+        assert cards == expected_cards, name
+        assert [dict(job) for job in jobs] == [dict(job) for job in expected], name